@@ -1 +1,15 @@
-# Register your models here.
+from django.contrib import admin
+from .models import SyncRun, SyncState
+
+
+@admin.register(SyncState)
+class SyncStateAdmin(admin.ModelAdmin):
+    list_display = ['dataset', 'league_id', 'season', 'last_success_at']
+    list_filter = ['league_id', 'season']
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = ['started_at', 'season', 'status', 'full', 'duration']
+    list_filter = ['status', 'season']
+    readonly_fields = ['timings', 'counts', 'errors']
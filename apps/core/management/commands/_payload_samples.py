@@ -0,0 +1,69 @@
+"""
+Representative upstream payloads shared by the payload measurement commands
+"""
+
+from contextlib import contextmanager
+
+from django.core.management.base import CommandError
+
+from apps.core.services.rate_limiter import PRIORITY_LOW
+from apps.core.services.stand_in import StandInServer
+
+
+def add_source_arguments(parser, season_help="Season year (default: current season)"):
+    parser.add_argument("--season", type=int, help=season_help)
+    parser.add_argument(
+        "--stand-in",
+        action="store_true",
+        help="Use a local stand-in server instead of API_FOOTBALL_BASE_URL",
+    )
+    parser.add_argument(
+        "--fixtures",
+        default="",
+        help="With --stand-in, replay recorded responses from this directory",
+    )
+
+
+@contextmanager
+def payload_source(service, options):
+    """Point the service at a stand-in server for the duration, if asked to."""
+    server = None
+    base_url = service.base_url
+    if options["stand_in"]:
+        server = StandInServer(fixtures_dir=options["fixtures"] or None).start()
+        service.base_url = server.url
+    elif not service.api_key:
+        raise CommandError("No API key configured; use --stand-in to run offline")
+
+    try:
+        yield
+    finally:
+        service.base_url = base_url
+        if server:
+            server.stop()
+
+
+def fetch_unprojected(service, endpoint, params):
+    """Full upstream payload, bypassing the cache."""
+    return service._fetch(endpoint, params, None, priority=PRIORITY_LOW, project=False)
+
+
+def sample_requests(service, season):
+    """One representative request per endpoint the pages read the most."""
+    league = {"league": service.league_id, "season": season}
+    teams = fetch_unprojected(service, "teams", league)["response"] or []
+    team_ids = [team["team"]["id"] for team in teams[:2]]
+    if len(team_ids) < 2:
+        raise CommandError("Need at least two teams in the league to build sample requests")
+
+    return [
+        ("leagues", {"id": service.league_id, "season": season}),
+        ("standings", league),
+        ("fixtures", league),
+        ("fixtures/headtohead", {"h2h": f"{team_ids[0]}-{team_ids[1]}", "last": 10}),
+        ("players", {**league, "page": 1}),
+        ("players/topscorers", league),
+        ("players/topassists", league),
+        ("teams/statistics", {**league, "team": team_ids[0]}),
+        ("coachs", {"team": team_ids[0]}),
+    ]
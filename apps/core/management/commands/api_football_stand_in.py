@@ -0,0 +1,83 @@
+"""
+Management command to run the API-Football stand-in server
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.services.api_football import api_football_service
+from apps.core.services.stand_in import StandInServer
+
+
+class Command(BaseCommand):
+    help = "Serve recorded or synthetic API-Football responses locally (set API_FOOTBALL_BASE_URL to its URL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+        parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+        parser.add_argument(
+            "--fixtures",
+            default="",
+            help="Directory of recorded responses to replay (and to record into with --capture)",
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds added to every response (default: 0)"
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=0.0, help="Maximum random seconds added on top of --latency"
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Share of requests (0-1) answered with --error-status (default: 0)",
+        )
+        parser.add_argument(
+            "--error-status", type=int, default=500, help="HTTP status of injected errors (default: 500)"
+        )
+        parser.add_argument(
+            "--capture",
+            action="store_true",
+            help="Forward unrecorded requests to the real API and record the responses",
+        )
+        parser.add_argument(
+            "--upstream",
+            default="https://v3.football.api-sports.io",
+            help="API to capture from (default: https://v3.football.api-sports.io)",
+        )
+        parser.add_argument("--seed", type=int, help="Seed for latency jitter and error injection")
+
+    def handle(self, *args, **options):
+        if options["capture"] and not options["fixtures"]:
+            raise CommandError("--capture needs --fixtures to record into")
+        if options["capture"] and not api_football_service.api_key:
+            raise CommandError("--capture needs an API key (API_FOOTBALL_KEY or RAPIDAPI_KEY)")
+        if not 0 <= options["error_rate"] <= 1:
+            raise CommandError("--error-rate must be between 0 and 1")
+
+        server = StandInServer(
+            fixtures_dir=options["fixtures"] or None,
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            capture_url=options["upstream"] if options["capture"] else None,
+            capture_headers=api_football_service._get_headers() if options["capture"] else None,
+            seed=options["seed"],
+        )
+
+        mode = "capturing" if options["capture"] else "replaying" if options["fixtures"] else "synthetic"
+        self.stdout.write(self.style.SUCCESS(f"API-Football stand-in ({mode}) listening on {server.url}"))
+        self.stdout.write(f"Set API_FOOTBALL_BASE_URL={server.url} to use it")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+            stats = server.stats
+            self.stdout.write(
+                f"{stats['requests']} requests: {stats['replayed']} replayed, {stats['captured']} captured, "
+                f"{stats['synthetic']} synthetic, {stats['errors']} injected errors"
+            )
@@ -0,0 +1,72 @@
+"""
+Management command to benchmark the pooled API-Football transport
+"""
+
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+
+from apps.core.services.http_transport import PooledTransport
+from apps.core.services.stand_in import StandInServer
+
+
+class Command(BaseCommand):
+    help = "Compare per-call connections against the pooled keep-alive transport"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per run (default: 200)"
+        )
+        parser.add_argument(
+            "--url",
+            default="",
+            help="Benchmark against this URL instead of a local stand-in server",
+        )
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        server = None
+
+        if options["url"]:
+            url = options["url"]
+        else:
+            server = StandInServer().start()
+            url = f"{server.url}/standings"
+
+        try:
+            self.stdout.write(f"Benchmarking {count} requests against {url}")
+
+            start = time.perf_counter()
+            for _ in range(count):
+                requests.get(url, params={"league": 113, "season": 2025}, timeout=10)
+            unpooled = time.perf_counter() - start
+            unpooled_connections = len(server.connections) if server else count
+
+            if server:
+                server.connections.clear()
+
+            transport = PooledTransport()
+            start = time.perf_counter()
+            for _ in range(count):
+                transport.get(url, params={"league": 113, "season": 2025}, timeout=10)
+            pooled = time.perf_counter() - start
+            stats = transport.stats()
+            transport.close()
+        finally:
+            if server:
+                server.stop()
+
+        self.stdout.write(
+            f"requests.get:     {unpooled:.3f}s, {unpooled_connections} connections"
+        )
+        self.stdout.write(
+            f"PooledTransport:  {pooled:.3f}s, {stats['connections_opened']} connections, "
+            f"{stats['connections_reused']} reused"
+        )
+        saved = unpooled_connections - stats["connections_opened"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Handshakes saved: {saved} ({(unpooled - pooled) * 1000 / count:.2f} ms per request)"
+            )
+        )
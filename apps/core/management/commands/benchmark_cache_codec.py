@@ -0,0 +1,103 @@
+"""
+Management command to benchmark the cache codecs on real payload shapes
+"""
+
+import pickle
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.api_football import APIFootballError, api_football_service
+from apps.core.services.cache_codec import COMPRESSORS, NO_COMPRESSION, SERIALIZERS, CacheCodec, decode
+from apps.core.services.league_roster import build_league_roster
+from apps.core.services.projection import project_response
+
+from ._payload_samples import add_source_arguments, fetch_unprojected, payload_source, sample_requests
+
+
+class Command(BaseCommand):
+    help = "Compare encode/decode time and size of every available cache codec on representative payloads"
+
+    def add_arguments(self, parser):
+        add_source_arguments(parser)
+        parser.add_argument(
+            "--iterations", type=int, default=20, help="Encode/decode rounds per payload (default: 20)"
+        )
+
+    def handle(self, *args, **options):
+        service = api_football_service
+        season = options["season"] or service.current_season
+        with payload_source(service, options):
+            payloads = self._payloads(service, season)
+
+        codecs = [
+            CacheCodec(serializer, compression, threshold=0)
+            for serializer in SERIALIZERS
+            for compression in [NO_COMPRESSION, *COMPRESSORS]
+        ]
+        self.stdout.write(
+            f"{len(payloads)} payloads, {options['iterations']} iterations; "
+            f"serializers: {', '.join(SERIALIZERS)}; compressors: {', '.join(COMPRESSORS)}"
+        )
+
+        largest = max(payloads, key=lambda name: len(pickle.dumps(payloads[name], pickle.HIGHEST_PROTOCOL)))
+        self._table("All payloads", payloads, codecs, options["iterations"])
+        self._table(f"Largest payload ({largest})", {largest: payloads[largest]}, codecs, options["iterations"])
+
+    def _payloads(self, service, season):
+        """Payloads as the client caches them: projected responses and the league roster."""
+        payloads = {}
+        for endpoint, params in sample_requests(service, season):
+            try:
+                payloads[endpoint] = project_response(endpoint, fetch_unprojected(service, endpoint, params))
+            except APIFootballError as e:
+                self.stdout.write(self.style.WARNING(f"Skipping {endpoint}: {e}"))
+
+        players, complete = service._load_league_players(season)
+        if players:
+            payloads["league/roster"] = build_league_roster(players, season, complete)
+        return payloads
+
+    def _table(self, title, payloads, codecs, iterations):
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(f"{'codec':<16} {'bytes':>11} {'ratio':>6} {'encode ms':>10} {'decode ms':>10}")
+
+        # Baseline: the backend pickling the payload itself
+        rows = [("pickle (backend)", *self._measure(
+            payloads,
+            lambda data: ("", pickle.dumps(data, pickle.HIGHEST_PROTOCOL)),
+            lambda tag, blob: pickle.loads(blob),
+            iterations,
+        ))]
+        for codec in codecs:
+            name = codec.serializer if codec.compression == NO_COMPRESSION else f"{codec.serializer}+{codec.compression}"
+            rows.append((name, *self._measure(payloads, codec.encode, decode, iterations)))
+
+        baseline = rows[0][1]
+        for name, size, encode_ms, decode_ms in rows:
+            self.stdout.write(
+                f"{name:<16} {size:>11,} {size / baseline:>6.2f} {encode_ms:>10.3f} {decode_ms:>10.3f}"
+            )
+
+    @staticmethod
+    def _measure(payloads, encode, decode_blob, iterations):
+        """Total encoded size and mean encode/decode milliseconds over all payloads."""
+        size = 0
+        encode_time = 0.0
+        decode_time = 0.0
+        for data in payloads.values():
+            tag, blob = encode(data)
+            size += len(blob)
+            decode_blob(tag, blob)
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                encode(data)
+            encode_time += (time.perf_counter() - start) / iterations
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                decode_blob(tag, blob)
+            decode_time += (time.perf_counter() - start) / iterations
+        return size, encode_time * 1000, decode_time * 1000
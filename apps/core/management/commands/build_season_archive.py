@@ -0,0 +1,101 @@
+"""
+Management command to archive a completed season to disk
+"""
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.services.api_football import APIFootballError, api_football_service
+from apps.core.services.rate_limiter import PRIORITY_LOW
+from apps.core.services.season_archive import (
+    ARCHIVED_ENDPOINTS,
+    SeasonArchive,
+    archive_filename,
+    archive_params,
+    write_archive,
+)
+from apps.core.services.ttl_policy import FINISHED_STATUSES
+
+from ._payload_samples import add_source_arguments, payload_source
+
+
+class Command(BaseCommand):
+    help = "Fetch a completed season once and write it to the on-disk archive the client serves it from"
+
+    def add_arguments(self, parser):
+        add_source_arguments(parser, season_help="Completed season year to archive")
+        parser.add_argument(
+            "--output",
+            default="",
+            help="Directory to write the archive to (default: API_FOOTBALL_ARCHIVE_DIR)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Archive the season even if it isn't over, or overwrite an existing archive",
+        )
+
+    def handle(self, *args, **options):
+        service = api_football_service
+        season = options["season"]
+        if not season:
+            raise CommandError("--season is required")
+        if season >= service.current_season and not options["force"]:
+            raise CommandError(f"Season {season} is not completed (current season is {service.current_season})")
+
+        directory = options["output"] or (service.archive.directory if service.archive else "")
+        if not directory:
+            raise CommandError("No archive directory; pass --output or enable API_FOOTBALL_ARCHIVE")
+        path = os.path.join(directory, archive_filename(service.league_id, season))
+        if os.path.exists(path) and not options["force"]:
+            raise CommandError(f"{path} already exists; archives are immutable, use --force to rebuild")
+
+        started = time.monotonic()
+        with payload_source(service, options):
+            # Fixtures first: no point fetching the rest of a season that isn't over
+            sections = self._fetch(service, season, ["fixtures"])
+            self._check_completed(sections, season, options["force"])
+            sections.update(self._fetch(service, season, [
+                endpoint for endpoint in ARCHIVED_ENDPOINTS if endpoint != "fixtures"
+            ]))
+
+        size = write_archive(path, service.league_id, season, sections)
+        archive = SeasonArchive(path)
+        for endpoint, entry in archive.sections.items():
+            results = len(sections[endpoint].get("response") or [])
+            self.stdout.write(f"  {endpoint:<20} {results:>5} results {entry['length']:>10,} bytes")
+        archive.close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {service.league_id}-{season} to {path} ({size:,} bytes) in {time.monotonic() - started:.2f}s"
+            )
+        )
+
+    def _fetch(self, service, season, endpoints):
+        """Projected upstream response of each endpoint for the season, bypassing the cache."""
+        sections = {}
+        for endpoint in endpoints:
+            params = archive_params(endpoint, service.league_id, season)
+            try:
+                sections[endpoint] = service._fetch(endpoint, params, None, priority=PRIORITY_LOW)
+            except APIFootballError as e:
+                raise CommandError(f"Could not fetch {endpoint} for {season}: {e}")
+        return sections
+
+    def _check_completed(self, sections, season, force):
+        fixtures = sections["fixtures"].get("response") or []
+        unfinished = [
+            fixture for fixture in fixtures
+            if fixture.get("fixture", {}).get("status", {}).get("short") not in FINISHED_STATUSES
+        ]
+        if not fixtures:
+            message = f"No fixtures returned for {season}"
+        elif unfinished:
+            message = f"{len(unfinished)} of {len(fixtures)} fixtures in {season} are not finished"
+        else:
+            return
+        if not force:
+            raise CommandError(f"{message}; refusing to archive (use --force to archive anyway)")
+        self.stdout.write(self.style.WARNING(f"{message}; archiving anyway"))
@@ -0,0 +1,62 @@
+"""
+Management command to report cached payload sizes before and after projection
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.api_football import APIFootballError, api_football_service
+from apps.core.services.projection import PROJECTIONS, payload_size, project_response
+
+from ._payload_samples import add_source_arguments, fetch_unprojected, payload_source, sample_requests
+
+
+class Command(BaseCommand):
+    help = "Fetch one representative request per projected endpoint and report its size before and after projection"
+
+    def add_arguments(self, parser):
+        add_source_arguments(parser)
+
+    def handle(self, *args, **options):
+        service = api_football_service
+        with payload_source(service, options):
+            self._report(service, options["season"] or service.current_season)
+
+    def _report(self, service, season):
+        requests = sample_requests(service, season)
+        unmeasured = sorted(set(PROJECTIONS) - {endpoint for endpoint, _ in requests})
+
+        self.stdout.write(
+            f"{'endpoint':<22} {'pickle before':>13} {'after':>9} {'json before':>12} {'after':>9} {'saved':>6}"
+        )
+        totals = {"before": 0, "after": 0, "json_before": 0, "json_after": 0}
+        for endpoint, params in requests:
+            try:
+                data = fetch_unprojected(service, endpoint, params)
+            except APIFootballError as e:
+                self.stdout.write(self.style.WARNING(f"{endpoint:<22} failed: {e}"))
+                continue
+
+            before = payload_size(data)
+            after = payload_size(project_response(endpoint, data))
+            totals["before"] += before["pickle"]
+            totals["after"] += after["pickle"]
+            totals["json_before"] += before["json"]
+            totals["json_after"] += after["json"]
+            self.stdout.write(
+                f"{endpoint:<22} {before['pickle']:>13,} {after['pickle']:>9,} "
+                f"{before['json']:>12,} {after['json']:>9,} {self._saved(before['pickle'], after['pickle']):>6}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'total':<22} {totals['before']:>13,} {totals['after']:>9,} "
+                f"{totals['json_before']:>12,} {totals['json_after']:>9,} "
+                f"{self._saved(totals['before'], totals['after']):>6}"
+            )
+        )
+        if unmeasured:
+            self.stdout.write(f"Not measured: {', '.join(unmeasured)}")
+
+    @staticmethod
+    def _saved(before, after):
+        return f"{(before - after) * 100 / before:.0f}%" if before else "-"
@@ -0,0 +1,65 @@
+"""
+Management command to sync API-Football data into the local models
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.services.football_sync import STAGES, FootballSync
+
+
+class Command(BaseCommand):
+    help = "Sync teams, standings, squads, fixtures and player stats from API-Football"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", type=int, help="Season year (default: current season)")
+        parser.add_argument(
+            "--stages",
+            default=",".join(STAGES),
+            help=f"Comma-separated stages to run (default: {','.join(STAGES)})",
+        )
+        parser.add_argument(
+            "--full", action="store_true", help="Ignore stage intervals and re-fetch every fixture"
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            metavar="SECONDS",
+            help="Keep running, starting a new sync every SECONDS seconds",
+        )
+
+    def handle(self, *args, **options):
+        stages = [stage.strip() for stage in options["stages"].split(",") if stage.strip()]
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise CommandError(f"Unknown stages: {', '.join(unknown)}")
+
+        full = options["full"]
+        while True:
+            started = time.monotonic()
+            run = FootballSync(season=options["season"], full=full).run(stages)
+            self._report(run)
+
+            if not options["loop"]:
+                break
+            # Only the first iteration of a loop is forced
+            full = False
+            time.sleep(max(options["loop"] - (time.monotonic() - started), 0))
+
+        if run.status == "failed":
+            raise CommandError("Sync failed")
+
+    def _report(self, run):
+        for stage in STAGES:
+            if stage not in run.counts and stage not in run.errors:
+                continue
+            if stage in run.errors:
+                self.stdout.write(self.style.ERROR(f"  {stage:<13} failed: {run.errors[stage]}"))
+            elif run.counts[stage] == "skipped":
+                self.stdout.write(f"  {stage:<13} skipped (not due)")
+            else:
+                self.stdout.write(f"  {stage:<13} {run.counts[stage]:>5} rows  {run.timings[stage]:.2f}s")
+
+        style = self.style.SUCCESS if run.status == "success" else self.style.WARNING
+        self.stdout.write(style(f"Sync {run.season} {run.status} in {run.duration:.2f}s"))
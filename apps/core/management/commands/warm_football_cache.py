@@ -0,0 +1,199 @@
+"""
+Management command to pre-populate the cache with what the football pages read
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.services.api_football import api_football_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch every request the home, standings, fixtures, teams, players, leaders and team pages make, "
+        "so the first visitors after a deploy or cache flush are served from the cache"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--season", type=int, help="Season year (default: current season)")
+        parser.add_argument(
+            "--concurrency", type=int, default=4, help="Requests warmed side by side (default: 4)"
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            metavar="SECONDS",
+            help="Keep running, starting a new pass every SECONDS seconds",
+        )
+        parser.add_argument(
+            "--refresh-ahead",
+            type=int,
+            metavar="SECONDS",
+            help=(
+                "Re-fetch entries that go stale within SECONDS seconds "
+                "(default: the --loop interval, so no entry goes stale between passes)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        service = api_football_service
+        if not service.api_key:
+            raise CommandError("No API key configured")
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        season = options["season"] or service.current_season
+        refresh_ahead = options["refresh_ahead"]
+        if refresh_ahead is None:
+            refresh_ahead = options["loop"] or 0
+
+        while True:
+            started = time.monotonic()
+            self._warm(service, season, options["concurrency"], refresh_ahead)
+
+            if not options["loop"]:
+                break
+            time.sleep(max(options["loop"] - (time.monotonic() - started), 0))
+
+    def _warm(self, service, season, concurrency, refresh_ahead):
+        quota = service.get_quota_stats()
+        self.stdout.write(
+            f"Warming season {season}: upstream budget {quota['day_remaining']}/{quota['day_limit']} today, "
+            f"{quota['minute_remaining']}/{quota['minute_limit']} this minute"
+        )
+        started = time.monotonic()
+        totals = {"ok": 0, "failed": 0, "deferred": 0, "upstream": 0, "refreshed": 0}
+        # Entries refreshed once this pass aren't refreshed again by later reads
+        refreshed_keys = set()
+
+        # Team pages need the team list first
+        teams_result = self._run(service, refresh_ahead, refreshed_keys, service.get_teams, (season,), {})
+        if teams_result["status"] == "deferred":
+            self._report(1, 1, "teams", teams_result, totals)
+            self._summary(totals, started)
+            return
+
+        tasks = self._tasks(service, season, teams_result["value"] or [])
+        total = len(tasks) + 1
+        self._report(1, total, "teams", teams_result, totals)
+        stop = threading.Event()
+
+        def run(task):
+            name, fn, args, kwargs = task
+            if stop.is_set():
+                return name, {"status": "deferred", "elapsed": 0.0, "upstream": 0, "refreshed": 0}
+            result = self._run(service, refresh_ahead, refreshed_keys, fn, args, kwargs)
+            if result["status"] == "deferred":
+                # The budget left is for visitors and live data; stop asking
+                stop.set()
+            return name, result
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="warm-football-cache") as executor:
+            futures = [executor.submit(run, task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), start=2):
+                name, result = future.result()
+                self._report(done, total, name, result, totals)
+
+        if stop.is_set():
+            self.stdout.write(self.style.WARNING("Upstream quota reserved or circuit open; deferred the rest"))
+        self._summary(totals, started)
+
+    def _tasks(self, service, season, teams):
+        """(name, function, args, kwargs) for every request the pages make, without duplicates."""
+        tasks = [
+            # Home, standings and teams pages
+            ("standings", service.get_standings, (season,), {}),
+            ("league info", service.get_league_info, (season,), {}),
+            ("top scorers", service.get_top_scorers, (season,), {}),
+            ("top assists", service.get_top_assists, (season,), {}),
+            ("live fixtures", service.get_live_fixtures, (), {}),
+            # Home, fixtures and live pages
+            ("fixtures", service.get_fixtures, (season,), {}),
+            ("last 5 results", service.get_fixtures, (season,), {"status": "FT", "last": 5}),
+            ("last 10 results", service.get_fixtures, (season,), {"status": "FT", "last": 10}),
+            ("next 5 fixtures", service.get_fixtures, (season,), {"status": "NS", "next": 5}),
+            ("next 10 fixtures", service.get_fixtures, (season,), {"status": "NS", "next": 10}),
+        ]
+
+        for team_data in teams:
+            team = team_data.get("team", {})
+            team_id = team.get("id")
+            if not team_id:
+                continue
+            label = team.get("name") or team_id
+            venue_id = (team_data.get("venue") or {}).get("id")
+            if venue_id:
+                tasks.append((f"{label} venue", service.get_venue_details, (venue_id,), {}))
+            tasks += [
+                (f"{label} statistics", service.get_team_statistics, (team_id, season), {}),
+                (f"{label} formations", service.get_team_lineups, (team_id, season), {}),
+                (f"{label} fixtures", service.get_fixtures, (season,), {"team_id": team_id}),
+                (f"{label} last 5", service.get_fixtures, (season,), {"team_id": team_id, "last": 5}),
+                (f"{label} next 5", service.get_fixtures, (season,), {"team_id": team_id, "next": 5}),
+                (f"{label} squad", service.get_team_squad, (team_id, season), {}),
+                (f"{label} coaches", service.get_team_coaches, (team_id, season), {}),
+            ]
+
+        # Players page and leaders lists; built from the squads and fixtures above, so they go last
+        tasks.append(("league roster", service.get_league_roster, (season,), {}))
+        tasks.append(("leaderboards", service.get_leaderboards, (season,), {}))
+        return tasks
+
+    @staticmethod
+    def _run(service, refresh_ahead, refreshed_keys, fn, args, kwargs):
+        """Call one service method as the warmer and classify the outcome."""
+        started = time.monotonic()
+        value = None
+        error = None
+        with service.warming(refresh_ahead=refresh_ahead, refreshed_keys=refreshed_keys) as counters:
+            try:
+                value = fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+
+        if counters.get("deferred") or counters.get("rejected"):
+            status = "deferred"
+        elif error is not None or counters.get("failed"):
+            status = "failed"
+        else:
+            status = "ok"
+        return {
+            "status": status,
+            "value": value,
+            "error": error,
+            "elapsed": time.monotonic() - started,
+            "upstream": counters.get("upstream"),
+            "refreshed": counters.get("refreshed"),
+        }
+
+    def _report(self, done, total, name, result, totals):
+        totals[result["status"]] += 1
+        totals["upstream"] += result["upstream"]
+        totals["refreshed"] += result["refreshed"]
+
+        notes = []
+        if result["upstream"]:
+            notes.append(f"{result['upstream']} upstream")
+        if result["refreshed"]:
+            notes.append(f"{result['refreshed']} refreshed")
+        if result.get("error") is not None:
+            notes.append(str(result["error"]))
+        line = f"[{done:>{len(str(total))}}/{total}] {name:<32} {result['status']:<8} {result['elapsed']:.2f}s"
+        if notes:
+            line += f"  {', '.join(notes)}"
+
+        style = {"ok": self.style.SUCCESS, "failed": self.style.ERROR}.get(result["status"], self.style.WARNING)
+        self.stdout.write(style(line))
+
+    def _summary(self, totals, started):
+        style = self.style.SUCCESS if not totals["failed"] and not totals["deferred"] else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"Warmed {totals['ok']} requests in {time.monotonic() - started:.2f}s: "
+                f"{totals['upstream']} upstream calls, {totals['refreshed']} refreshed ahead, "
+                f"{totals['failed']} failed, {totals['deferred']} deferred"
+            )
+        )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('running', 'Running'), ('success', 'Success'), ('partial', 'Partial'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('full', models.BooleanField(default=False)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('timings', models.JSONField(blank=True, default=dict, help_text='Seconds per stage')),
+                ('counts', models.JSONField(blank=True, default=dict, help_text='Rows written per stage')),
+                ('errors', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=30)),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('cursor', models.JSONField(blank=True, default=dict, help_text='Where the next incremental run resumes')),
+            ],
+            options={
+                'unique_together': {('dataset', 'league_id', 'season')},
+            },
+        ),
+    ]
@@ -1,3 +1,6 @@
+from django.db import models
+
+
 class TranslatableContent:
     """Mixin to provide translatable content fields."""
 
@@ -27,3 +30,45 @@ class TranslatableContent:
             return getattr(self, field_name)
 
         return ""
+
+
+class SyncState(models.Model):
+    """Progress of one dataset of the API-Football sync pipeline"""
+    dataset = models.CharField(max_length=30)
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    cursor = models.JSONField(default=dict, blank=True, help_text="Where the next incremental run resumes")
+
+    class Meta:
+        unique_together = ('dataset', 'league_id', 'season')
+
+    def __str__(self):
+        return f"{self.dataset} {self.league_id}/{self.season}"
+
+
+class SyncRun(models.Model):
+    """One run of the API-Football sync pipeline, with per-stage timings"""
+    STATUSES = [
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('partial', 'Partial'),
+        ('failed', 'Failed'),
+    ]
+
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUSES, default='running')
+    full = models.BooleanField(default=False)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    timings = models.JSONField(default=dict, blank=True, help_text="Seconds per stage")
+    counts = models.JSONField(default=dict, blank=True, help_text="Rows written per stage")
+    errors = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Sync {self.season} at {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
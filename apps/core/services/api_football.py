@@ -6,21 +6,74 @@ This service handles all communication with the API-Football service
 league data including standings, fixtures, teams, and player statistics.
 """
 
+import contextvars
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from django.conf import settings
 from django.core.cache import cache
+from django.db import close_old_connections
 from decouple import config
 
+from .cache_entry import (
+    NEGATIVE_EMPTY,
+    NEGATIVE_ERROR,
+    entry_data_version,
+    entry_expires_in,
+    entry_negative,
+    entry_timeout,
+    read_entry,
+    unwrap_entry,
+    wrap_entry,
+)
+from .cache_keys import make_cache_key
+from .circuit_breaker import CircuitBreaker
+from .data_version import DataVersion, DataVersions, VersionedMemo, VersionSet, content_digest
+from .fanout import FanOut
+from .http_transport import PooledTransport
+from .leaderboards import LEADERBOARDS_FORMAT, LeaderboardMemo, build_leaderboards, leaderboard
+from .league_roster import ROSTER_FORMAT, build_league_roster, roster_slug_index, roster_slug_record
+from .local_store import LocalFootballStore
+from .local_tier import LocalTier
+from .metrics import CounterSet, HistogramSet
+from .player_index import PlayerIndex, PlayerIndexMemo, build_player_index
+from .projection import PROJECTIONS, project_response
+from .rate_limiter import PRIORITY_LIVE, PRIORITY_LOW, PRIORITY_NORMAL, QuotaGovernor
+from .season_archive import SeasonArchiveStore
+from .single_flight import SingleFlight
+from .telemetry import accounted, count_for_page, current_page
+from .ttl_policy import FINISHED_STATUSES, IN_PLAY_STATUSES, default_ttl_policy
+
 logger = logging.getLogger(__name__)
 
+# Set by APIFootballService.warming() for the calls made by the cache warmer
+_warming: contextvars.ContextVar = contextvars.ContextVar('api_football_warming', default=None)
+
+# Set by APIFootballService.tracking_versions() to the VersionSet of the block
+_tracking: contextvars.ContextVar = contextvars.ContextVar('api_football_tracking', default=None)
+
 
 class APIFootballError(Exception):
     """Custom exception for API Football service errors."""
     pass
 
 
+class QuotaExceededError(APIFootballError):
+    """Raised when a request is deferred to protect the upstream quota."""
+    pass
+
+
+class CircuitOpenError(APIFootballError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+    pass
+
+
 class APIFootballService:
     """
     Service class for interacting with the API Football API.
@@ -29,8 +82,40 @@ class APIFootballService:
     for all Allsvenskan data requests.
     """
 
-    def __init__(self):
-        self.base_url = "https://v3.football.api-sports.io"
+    # Seconds a stale entry may still be served while it is refreshed in the
+    # background (stale-while-revalidate). Endpoints not listed here block on
+    # the upstream call as soon as their TTL passes. Override or extend with
+    # the API_FOOTBALL_STALE_GRACE setting.
+    stale_grace = {
+        'leagues': 86400,
+        'standings': 3600,
+        'fixtures': 900,
+        'teams': 86400,
+        'teams/statistics': 3600,
+        'players/topscorers': 3600,
+        'players/topassists': 3600,
+        'players/squads': 86400,
+        'coachs': 86400,
+        'venues': 86400,
+        'league/roster': 86400,
+        'league/leaderboards': 86400,
+    }
+
+    # Process-wide state, one set per process however many clients share it
+    PROCESS_STATE = (
+        'transport', 'single_flight', '_refresh_executor', '_refreshing', '_refreshing_lock', 'quota',
+        'breaker', 'local_store', 'local_tier', 'archive', 'data_versions', 'leaderboard_memo',
+        'player_slug_memo', 'player_index_memo',
+    )
+
+    def __init__(self, shared: Optional['APIFootballService'] = None):
+        """
+        Args:
+            shared: Client whose process-wide state (transport, quota,
+                circuit breaker, local tiers, memos) to use instead of
+                building another set, e.g. the sync client for the async one
+        """
+        self.base_url = config('API_FOOTBALL_BASE_URL', default='https://v3.football.api-sports.io').rstrip('/')
         # Try multiple possible environment variable names for flexibility
         self.api_key = (
             config('API_FOOTBALL_KEY', default='') or
@@ -45,10 +130,126 @@ class APIFootballService:
             config('ALLSVENSKAN_LEAGUE_ID', default=113, cast=int)
         )
         self.current_season = 2025
+        self.timeout = config('API_FOOTBALL_TIMEOUT', default=30, cast=float)
+
+        self.ttl_policy = default_ttl_policy
+        self.stale_grace = {
+            **self.stale_grace,
+            **getattr(settings, 'API_FOOTBALL_STALE_GRACE', {}),
+        }
+
+        # Short-lived negative entries so empty results and 4xx errors don't re-query upstream
+        self.negative_ttl = config('API_FOOTBALL_NEGATIVE_TTL', default=600, cast=int)
+        self.error_ttl = config('API_FOOTBALL_ERROR_TTL', default=60, cast=int)
+        self.cache_stats = CounterSet()
+        self.latency = HistogramSet()
+
+        self._local_store_warned = False
+        if shared is None:
+            self._init_process_state()
+        else:
+            self._share_process_state(shared)
+
+        # Cache only the fields the site reads (see projection)
+        self.projections = (
+            PROJECTIONS if config('API_FOOTBALL_PROJECT_PAYLOADS', default=True, cast=bool) else {}
+        )
+
+        # The multi-id fixtures query accepts at most 20 IDs
+        self.fixture_batch_size = config('API_FOOTBALL_FIXTURE_BATCH_SIZE', default=20, cast=int)
 
         if not self.api_key:
             logger.warning("API_FOOTBALL_KEY or RAPIDAPI_KEY not configured. API requests will fail.")
 
+    def _init_process_state(self) -> None:
+        """Build the upstream transport, budget, breaker and in-process tiers."""
+        # Long-lived pooled transport so upstream calls reuse keep-alive connections
+        self.transport = PooledTransport(
+            pool_connections=config('API_FOOTBALL_POOL_CONNECTIONS', default=4, cast=int),
+            pool_maxsize=config('API_FOOTBALL_POOL_MAXSIZE', default=10, cast=int),
+            keep_alive=config('API_FOOTBALL_KEEP_ALIVE', default=True, cast=bool),
+        )
+
+        # Only one caller per cache key fetches upstream; others wait for its result
+        self.single_flight = SingleFlight(
+            lock_timeout=config('API_FOOTBALL_LOCK_TIMEOUT', default=35, cast=int),
+            wait_timeout=config('API_FOOTBALL_LOCK_WAIT', default=10, cast=float),
+        )
+
+        # Background refreshes of stale entries
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=config('API_FOOTBALL_REFRESH_WORKERS', default=2, cast=int),
+            thread_name_prefix='api-football-refresh',
+        )
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+        # Shared upstream budget; live requests keep a reserve the rest can't touch
+        self.quota = QuotaGovernor(
+            per_minute=config('API_FOOTBALL_QUOTA_PER_MINUTE', default=300, cast=int),
+            per_day=config('API_FOOTBALL_QUOTA_PER_DAY', default=7500, cast=int),
+            live_reserve=config('API_FOOTBALL_QUOTA_LIVE_RESERVE', default=0.1, cast=float),
+            low_priority_floor=config('API_FOOTBALL_QUOTA_LOW_PRIORITY_FLOOR', default=0.25, cast=float),
+        )
+
+        # Fail fast while an endpoint keeps failing or timing out
+        self.breaker = CircuitBreaker(
+            failure_threshold=config('API_FOOTBALL_BREAKER_FAILURES', default=5, cast=int),
+            recovery_timeout=config('API_FOOTBALL_BREAKER_RECOVERY', default=30, cast=float),
+            slow_call_threshold=config('API_FOOTBALL_SLOW_CALL', default=10, cast=float),
+            on_state_change=lambda endpoint, old_state, new_state: self.cache_stats.incr(
+                f'breaker_{new_state}', endpoint
+            ),
+        )
+
+        # Serve synced datasets from the local database (see football_sync)
+        self.local_store = (
+            LocalFootballStore(
+                self.league_id,
+                state_ttl=config('API_FOOTBALL_LOCAL_STATE_TTL', default=10, cast=float),
+            )
+            if config('API_FOOTBALL_READ_LOCAL', default=True, cast=bool) else None
+        )
+
+        # Hot entries are served from process memory in front of the shared cache
+        self.local_tier = (
+            LocalTier(
+                max_entries=config('API_FOOTBALL_LOCAL_CACHE_ENTRIES', default=256, cast=int),
+                max_bytes=config('API_FOOTBALL_LOCAL_CACHE_BYTES', default=32 * 1024 * 1024, cast=int),
+                ttl=config('API_FOOTBALL_LOCAL_CACHE_TTL', default=30, cast=float),
+                check_interval=config('API_FOOTBALL_LOCAL_CACHE_CHECK', default=1, cast=float),
+            )
+            if config('API_FOOTBALL_LOCAL_CACHE', default=True, cast=bool) else None
+        )
+
+        # Completed seasons are read from their on-disk archive (see season_archive)
+        self.archive = (
+            SeasonArchiveStore(
+                config('API_FOOTBALL_ARCHIVE_DIR', default=os.path.join(settings.BASE_DIR, 'data', 'season_archive')),
+                self.league_id,
+            )
+            if config('API_FOOTBALL_ARCHIVE', default=True, cast=bool) else None
+        )
+
+        # Content digest and version per cached dataset (see data_version)
+        self.data_versions = (
+            DataVersions() if config('API_FOOTBALL_DATA_VERSIONS', default=True, cast=bool) else None
+        )
+
+        # Last decoded leaderboards, served while their version holds (see leaderboards)
+        self.leaderboard_memo = LeaderboardMemo()
+
+        # Decoded slug index of the player pages, served while the roster's version holds
+        self.player_slug_memo = VersionedMemo()
+
+        # Faceted index of the players page, rebuilt when the roster or leaderboards change (see player_index)
+        self.player_index_memo = PlayerIndexMemo()
+
+    def _share_process_state(self, shared: 'APIFootballService') -> None:
+        """Use another client's transport, budget, breaker and in-process tiers."""
+        for name in self.PROCESS_STATE:
+            setattr(self, name, getattr(shared, name))
+
     def _get_headers(self) -> Dict[str, str]:
         """Get required headers for API requests."""
         return {
@@ -57,13 +258,303 @@ class APIFootballService:
             'Content-Type': 'application/json'
         }
 
-    def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def get_transport_stats(self) -> Dict[str, int]:
+        """Get connection reuse statistics for the pooled upstream transport."""
+        return self.transport.stats()
+
+    def get_quota_stats(self) -> Dict[str, Any]:
+        """Get the remaining per-minute and per-day upstream quota."""
+        return self.quota.stats()
+
+    def get_breaker_states(self) -> Dict[str, str]:
+        """Get the circuit breaker state of every endpoint called so far."""
+        return self.breaker.states()
+
+    def get_cache_tier_stats(self) -> Dict[str, Any]:
+        """
+        Get hit ratios of the in-process and shared cache tiers.
+
+        Returns:
+            Dict with hits, misses and hit ratio for the 'local' and 'shared'
+            tiers (the local tier also reports its occupancy), and the same
+            per endpoint under 'endpoints'
+        """
+        def tier(hits: int, misses: int) -> Dict[str, Any]:
+            lookups = hits + misses
+            return {'hits': hits, 'misses': misses, 'hit_ratio': hits / lookups if lookups else None}
+
+        counts = self.cache_stats.snapshot()
+        endpoints = {}
+        for (name, endpoint), _ in counts.items():
+            if endpoint and name in ('local_hit', 'shared_hit', 'shared_miss'):
+                endpoints[endpoint] = {
+                    'local': tier(counts.get(('local_hit', endpoint), 0), counts.get(('local_miss', endpoint), 0)),
+                    'shared': tier(counts.get(('shared_hit', endpoint), 0), counts.get(('shared_miss', endpoint), 0)),
+                }
+
+        local = tier(self.cache_stats.get('local_hit'), self.cache_stats.get('local_miss'))
+        if self.local_tier is not None:
+            local.update(self.local_tier.stats())
+        return {
+            'local': local,
+            'shared': tier(self.cache_stats.get('shared_hit'), self.cache_stats.get('shared_miss')),
+            'endpoints': endpoints,
+        }
+
+    def _read_tiered(self, cache_key: str, endpoint: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry through the in-process tier, then the shared cache.
+
+        Returns:
+            The decoded entry (see cache_entry.read_entry), or None on a miss
+        """
+        tier = self.local_tier
+        if tier is None:
+            value = cache.get(cache_key)
+            self.cache_stats.incr('shared_hit' if value else 'shared_miss', endpoint)
+            return read_entry(value)
+
+        if tier.needs_check():
+            tier.check_versions()
+        value = tier.get(cache_key)
+        if value is not None:
+            self.cache_stats.incr('local_hit', endpoint)
+            return self._decode_local(cache_key, value)
+
+        # The entry and its version stamp in one round trip
+        self.cache_stats.incr('local_miss', endpoint)
+        version_key = tier.version_key(cache_key)
+        values = cache.get_many([cache_key, version_key])
+        return self._keep_local(cache_key, endpoint, values.get(cache_key), values.get(version_key))
+
+    def _keep_local(self, cache_key: str, endpoint: str, value: Any, version: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Decode an entry read from the shared cache and keep it in the local tier."""
+        self.cache_stats.incr('shared_hit' if value else 'shared_miss', endpoint)
+        entry = read_entry(value)
+        if entry:
+            self.local_tier.put(cache_key, value, version)
+        return entry
+
+    def _decode_local(self, cache_key: str, value: Any) -> Optional[Dict[str, Any]]:
+        entry = read_entry(value)
+        if entry is None:
+            self.local_tier.invalidate(cache_key)
+        return entry
+
+    def _written(self, cache_key: str, timeout: int) -> None:
+        """Invalidate other workers' local copies of an entry just written to the shared cache."""
+        if self.local_tier is not None:
+            self.local_tier.bump(cache_key, timeout)
+
+    def get_data_version(self, endpoint: str, params: Dict[str, Any] = None) -> Optional[DataVersion]:
+        """
+        Get the content version of a cached request.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters, as the getter sends them
+
+        Returns:
+            The version, or None if the dataset hasn't been cached (or
+            data versions are disabled)
+        """
+        if self.data_versions is None:
+            return None
+        return self.data_versions.get(make_cache_key(endpoint, params))
+
+    @contextmanager
+    def tracking_versions(self) -> Iterator[VersionSet]:
+        """
+        Record the content version of every dataset read inside the block.
+
+        Applies to FanOut tasks started inside the block too.
+
+        Yields:
+            VersionSet whose fingerprint changes whenever any dataset read
+            in the block changes, e.g. for an ETag
+        """
+        versions = VersionSet()
+        token = _tracking.set(versions)
+        try:
+            yield versions
+        finally:
+            _tracking.reset(token)
+
+    def _track_version(self, cache_key: str, entry: Optional[Dict[str, Any]] = None) -> None:
+        """Record the version of a dataset read inside tracking_versions(), from its entry if stamped."""
+        versions = _tracking.get()
+        if versions is None:
+            return
+        version = entry_data_version(entry)
+        if version is None and self.data_versions is not None:
+            version = self.data_versions.get(cache_key)
+        versions.add(cache_key, version)
+
+    @staticmethod
+    def _track_unversioned(source: str) -> None:
+        """Record a read that has no content version inside tracking_versions()."""
+        versions = _tracking.get()
+        if versions is not None:
+            versions.add(source, None)
+
+    def _stamp_version(self, cache_key: str, entry: Dict[str, Any]) -> None:
+        """Stamp an entry about to be written with its dataset's content version."""
+        if self.data_versions is not None and entry.get('digest'):
+            version = self.data_versions.stamp(cache_key, entry['digest'])
+            if version is not None:
+                entry['data_version'] = version.version
+
+    def _content_digest(self, data: Any) -> Optional[str]:
+        """Digest of a payload about to be cached, when data versions are enabled."""
+        return content_digest(data) if self.data_versions is not None else None
+
+    def _read_archive(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a request for a completed season from its on-disk archive.
+
+        Returns:
+            The archived response, or None when the request isn't for an
+            archived past season
+        """
+        if self.archive is None or not params or 'season' not in params:
+            return None
+        try:
+            if int(params['season']) >= self.current_season:
+                return None
+        except (TypeError, ValueError):
+            return None
+
+        archived = self.archive.lookup(endpoint, params)
+        if archived is None:
+            return None
+        data, version = archived
+        self._count_lookup('archive_hit', endpoint)
+        versions = _tracking.get()
+        if versions is not None:
+            versions.add(make_cache_key(endpoint, params), version)
+        return data
+
+    def _read_local(self, read: Callable[[LocalFootballStore], Optional[Any]]) -> Optional[Any]:
+        """
+        Answer a query from the locally synced data.
+
+        Returns:
+            The result of ``read``, or None when local data is disabled,
+            not synced, stale or unavailable
+        """
+        if self.local_store is None:
+            return None
+        try:
+            result = read(self.local_store)
+        except Exception as e:
+            # Typically migrations that haven't been applied yet; say so once per outage
+            log = logger.debug if self._local_store_warned else logger.warning
+            log(f"Local data unavailable, using the API: {e}")
+            self._local_store_warned = True
+            return None
+        self._local_store_warned = False
+        if result is not None:
+            # Synced rows carry no content version
+            self._track_unversioned('local_store')
+        return result
+
+    def _request_priority(self, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Classify a foreground request for the quota governor."""
+        if _warming.get() is not None:
+            return PRIORITY_LOW
+        if params and params.get('live'):
+            return PRIORITY_LIVE
+        return PRIORITY_NORMAL
+
+    @contextmanager
+    def warming(self, refresh_ahead: float = 0, refreshed_keys: Optional[set] = None) -> Iterator[CounterSet]:
+        """
+        Make the calls inside the block as the cache warmer.
+
+        Warming calls take low priority from the upstream budget, so they
+        never eat into what visitors and live data need. Entries that go
+        stale within ``refresh_ahead`` seconds are fetched again instead of
+        being served, so a warmer running on a loop replaces entries before
+        visitors find them stale. Applies to FanOut tasks started inside the
+        block too.
+
+        Args:
+            refresh_ahead: Seconds before their soft expiry that entries are refreshed
+            refreshed_keys: Cache keys already refreshed ahead; each key is
+                refreshed once at most, even when its TTL is shorter than
+                ``refresh_ahead``. Share one set between the blocks of a run.
+
+        Yields:
+            Counters of the block's calls by endpoint: upstream requests made
+            ('upstream'), entries refreshed ahead ('refreshed'), requests
+            deferred by the quota ('deferred') or an open circuit breaker
+            ('rejected'), and upstream failures ('failed')
+        """
+        counters = CounterSet()
+        token = _warming.set({
+            'refresh_ahead': refresh_ahead,
+            'refreshed_keys': set() if refreshed_keys is None else refreshed_keys,
+            'counters': counters,
+        })
+        try:
+            yield counters
+        finally:
+            _warming.reset(token)
+
+    def _count_lookup(self, name: str, endpoint: str, amount: int = 1) -> None:
+        """Count how a lookup was answered, overall and for the request being handled."""
+        self.cache_stats.incr(name, endpoint, amount)
+        count_for_page(name, endpoint, amount)
+
+    def _count_warming(self, name: str, endpoint: str) -> None:
+        """Count an event in the counters of the enclosing warming() block, if any."""
+        warming = _warming.get()
+        if warming is not None:
+            warming['counters'].incr(name, endpoint)
+
+    def _refresh_due(self, cache_key: str, entry: Dict[str, Any]) -> bool:
+        """Whether the warmer should replace a fresh entry now."""
+        warming = _warming.get()
+        return bool(warming and warming['refresh_ahead'] > 0
+                    and entry_expires_in(entry) < warming['refresh_ahead']
+                    and cache_key not in warming['refreshed_keys'])
+
+    def _refresh_ahead(self, endpoint: str, cache_key: str, fetch: Callable[[], Any], cached: Any) -> Any:
+        """
+        Replace a fresh entry that is about to go stale, for the cache warmer.
+
+        Returns:
+            The new payload, or the cached one when the refresh fails
+        """
+        warming = _warming.get()
+        warming['refreshed_keys'].add(cache_key)
+        try:
+            data = self.single_flight.do(
+                cache_key, fetch,
+                check=lambda: self._get_cached(cache_key, fresh_for=warming['refresh_ahead']),
+            )
+        except (QuotaExceededError, CircuitOpenError) as e:
+            self.cache_stats.incr('refresh_deferred', endpoint)
+            logger.info(f"Refresh ahead deferred for {endpoint}: {e}")
+            return cached
+        except APIFootballError as e:
+            logger.warning(f"Refresh ahead failed for {endpoint}: {e}")
+            return cached
+        self.cache_stats.incr('warm_refresh', endpoint)
+        warming['counters'].incr('refreshed', endpoint)
+        return data
+
+    @accounted
+    def _make_request(self, endpoint: str, params: Dict[str, Any] = None,
+                      use_cache: bool = True) -> Dict[str, Any]:
         """
         Make a request to the API Football service.
 
         Args:
             endpoint: API endpoint path
             params: Query parameters
+            use_cache: Read and store the response in the cache; callers that
+                cache the response in another shape pass False
 
         Returns:
             Parsed JSON response
@@ -71,51 +562,314 @@ class APIFootballService:
         Raises:
             APIFootballError: If request fails or returns error
         """
+        # Completed seasons need neither the cache nor the upstream
+        archived = self._read_archive(endpoint, params)
+        if archived is not None:
+            return archived
+
         if not self.api_key:
             raise APIFootballError("API key not configured")
 
-        url = f"{self.base_url}/{endpoint}"
-        headers = self._get_headers()
+        if not use_cache:
+            self._track_unversioned(endpoint)
+            return self._fetch(endpoint, params, None)
+
+        # Deterministic key so every worker process shares the same cache entry
+        cache_key = make_cache_key(endpoint, params)
+
+        # Try to get from cache first
+        entry = self._read_tiered(cache_key, endpoint)
+        if entry:
+            cached_data, is_stale = unwrap_entry(entry)
+            if entry_negative(entry):
+                self._count_lookup('negative_hit', endpoint)
+                logger.debug(f"Negative cache hit for {endpoint}")
+                data = self._from_negative_entry(entry)
+                self._track_version(cache_key, entry)
+                return data
+
+            if not is_stale:
+                if self._refresh_due(cache_key, entry):
+                    data = self._refresh_ahead(
+                        endpoint, cache_key, lambda: self._fetch(endpoint, params, cache_key), cached_data,
+                    )
+                    self._track_version(cache_key)
+                    return data
+                self._count_lookup('hit', endpoint)
+                logger.debug(f"Cache hit for {endpoint}")
+                self._track_version(cache_key, entry)
+                return cached_data
+
+            # Past the soft expiry: serve the stale payload and refresh it behind the request
+            self._count_lookup('stale_hit', endpoint)
+            logger.debug(f"Serving stale {endpoint} while refreshing in background")
+            self._schedule_refresh(endpoint, params, cache_key)
+            self._track_version(cache_key, entry)
+            return cached_data
 
-        # Create cache key from endpoint and params
-        cache_key = f"api_football_{endpoint}_{hash(str(sorted((params or {}).items())))}"
+        # Coalesce concurrent misses so only one caller hits the upstream API
+        self._count_lookup('miss', endpoint)
+        data = self.single_flight.do(
+            cache_key,
+            lambda: self._fetch(endpoint, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        self._track_version(cache_key)
+        return data
 
-        # Try to get from cache first (5 minute cache for most data)
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.debug(f"Cache hit for {endpoint}")
-            return cached_data
+    def _get_cached(self, cache_key: str, fresh_only: bool = False,
+                    fresh_for: float = 0) -> Optional[Dict[str, Any]]:
+        """
+        Read a payload from the cache.
 
-        try:
-            logger.info(f"Making API request to {endpoint} with params: {params}")
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+        Args:
+            cache_key: Cache key to read
+            fresh_only: Ignore entries past their soft expiry
+            fresh_for: Ignore entries that go stale within this many seconds
 
-            data = response.json()
+        Returns:
+            Cached payload, or None when missing (or stale with fresh_only)
 
-            # Check API response status
-            if not data.get('response'):
-                error_msg = data.get('errors', {})
-                logger.error(f"API returned no data: {error_msg}")
-                raise APIFootballError(f"No data returned from API: {error_msg}")
+        Raises:
+            APIFootballError: If the key holds a negative error entry
+        """
+        entry = read_entry(cache.get(cache_key))
+        if not entry:
+            return None
+        if entry_negative(entry):
+            return self._from_negative_entry(entry)
+        data, is_stale = unwrap_entry(entry)
+        if fresh_only and is_stale:
+            return None
+        if fresh_for and entry_expires_in(entry) < fresh_for:
+            return None
+        return data
+
+    def _from_negative_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Replay a negative entry: the empty payload, or the cached upstream error."""
+        data, _ = unwrap_entry(entry)
+        if entry_negative(entry) == NEGATIVE_ERROR:
+            raise APIFootballError(f"Upstream error (cached): {data.get('status')} {data.get('errors')}")
+        return data
+
+    def _schedule_refresh(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str,
+                          fetch: Callable[[], Any] = None) -> None:
+        """
+        Refresh a stale cache entry in the background, at most once per key at a time.
 
-            # Cache successful responses
-            cache_timeout = 300 if 'live' in endpoint else 1800  # 5 min for live, 30 min for others
-            cache.set(cache_key, data, cache_timeout)
+        ``fetch`` rebuilds and stores the entry; it defaults to fetching
+        ``endpoint`` from the upstream API.
+        """
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
 
-            logger.info(f"Successfully fetched data from {endpoint}")
-            return data
+        try:
+            self._refresh_executor.submit(self._refresh, endpoint, params, cache_key, fetch)
+        except RuntimeError as e:
+            logger.warning(f"Could not schedule background refresh for {endpoint}: {e}")
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+
+    def _refresh(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str,
+                 fetch: Callable[[], Any] = None) -> None:
+        """Background refresh of a stale entry, coordinated with other workers."""
+        try:
+            self.single_flight.do(
+                cache_key,
+                fetch or (lambda: self._fetch(endpoint, params, cache_key, priority=PRIORITY_LOW)),
+                check=lambda: self._get_cached(cache_key, fresh_only=True),
+            )
+        except (QuotaExceededError, CircuitOpenError) as e:
+            self.cache_stats.incr('refresh_deferred', endpoint)
+            logger.info(f"Background refresh deferred for {endpoint}: {e}")
+        except Exception as e:
+            # The stale entry stays in place until its hard expiry
+            logger.warning(f"Background refresh failed for {endpoint}: {e}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+            # Rebuilds may read the local store; no request closes this thread's connection
+            close_old_connections()
+
+    def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: Optional[str],
+               priority: str = None, project: bool = True) -> Dict[str, Any]:
+        """
+        Fetch a response from the upstream API and store it in the cache.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            cache_key: Cache key to store the response under (None to skip caching)
+            priority: Quota priority (classified from the request by default)
+            project: Trim the response to the fields the site reads; callers
+                that need the full upstream payload pass False
+
+        Returns:
+            Parsed JSON response
 
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            QuotaExceededError: If the quota governor defers the request
+            APIFootballError: If request fails or returns error
+        """
+        url = f"{self.base_url}/{endpoint}"
+        headers = self._get_headers()
+        self._admit(endpoint, priority or self._request_priority(endpoint, params))
+
+        started = time.monotonic()
+        try:
+            logger.info(f"Making API request to {endpoint} with params: {params}")
+            response = self.transport.get(url, headers=headers, params=params, timeout=self.timeout)
         except requests.exceptions.Timeout:
+            self.breaker.record_failure(endpoint)
+            self.cache_stats.incr('error_timeout', endpoint)
+            self._count_warming('failed', endpoint)
             logger.error(f"Request timeout for {endpoint}")
             raise APIFootballError("Request timeout")
         except requests.exceptions.RequestException as e:
+            self.breaker.record_failure(endpoint)
+            self.cache_stats.incr('error_connection', endpoint)
+            self._count_warming('failed', endpoint)
             logger.error(f"Request failed for {endpoint}: {str(e)}")
             raise APIFootballError(f"Request failed: {str(e)}")
+
+        self._record_outcome(
+            endpoint, response.status_code, response.headers, time.monotonic() - started, len(response.content)
+        )
+
+        def store(entry, timeout):
+            if cache_key is not None:
+                self._stamp_version(cache_key, entry)
+                cache.set(cache_key, entry, timeout)
+                self._written(cache_key, timeout)
+
+        return self._handle_response(
+            endpoint, params, response.status_code, response.reason, response.json, store=store, project=project,
+        )
+
+    def _admit(self, endpoint: str, priority: str) -> None:
+        """
+        Check the circuit breaker and take one request from the upstream budget.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            QuotaExceededError: If the budget left is reserved for higher priorities
+        """
+        if not self.breaker.allow(endpoint):
+            self.cache_stats.incr('breaker_rejected', endpoint)
+            self._count_warming('rejected', endpoint)
+            raise CircuitOpenError(f"Circuit open for {endpoint}, not calling upstream")
+
+        if not self.quota.acquire(priority):
+            self.breaker.release(endpoint)
+            self.cache_stats.incr('quota_deferred', endpoint)
+            self._count_warming('deferred', endpoint)
+            raise QuotaExceededError(f"Upstream quota reserved, {priority} request to {endpoint} deferred")
+        self.cache_stats.incr('upstream', endpoint)
+        self.cache_stats.incr('page_upstream', current_page())
+        count_for_page('upstream', endpoint)
+        self._count_warming('upstream', endpoint)
+
+    def _record_outcome(self, endpoint: str, status_code: int, headers: Dict[str, str], elapsed: float,
+                        size: int = 0) -> None:
+        """Feed an upstream response to the quota governor, the circuit breaker and the telemetry."""
+        self.latency.observe('upstream', endpoint, elapsed)
+        self.cache_stats.incr('upstream_bytes', endpoint, size)
+        self.quota.record_headers(headers)
+        if status_code == 429:
+            self.quota.record_throttled()
+            self.cache_stats.incr('error_throttled', endpoint)
+        elif status_code >= 500:
+            self.cache_stats.incr('error_server', endpoint)
+        elif status_code >= 400:
+            self.cache_stats.incr('error_client', endpoint)
+        if status_code == 429 or status_code >= 500:
+            self._count_warming('failed', endpoint)
+
+        # Server errors trip the breaker; client errors and throttling are our own doing
+        if status_code >= 500:
+            self.breaker.record_failure(endpoint)
+        else:
+            self.breaker.record_success(endpoint, elapsed)
+
+    def _handle_response(self, endpoint: str, params: Optional[Dict[str, Any]],
+                         status_code: int, reason: str, parse_json: Callable[[], Any],
+                         store: Callable[[Dict[str, Any], int], None], project: bool = True) -> Dict[str, Any]:
+        """
+        Apply the caching and error rules to an upstream response.
+
+        Shared by the sync and async clients; all cache writes go through
+        ``store`` so this method does no I/O of its own.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            status_code: HTTP status code of the response
+            reason: HTTP reason phrase of the response
+            parse_json: Callable returning the decoded JSON body
+            store: Callable taking (entry, timeout) that writes the cache entry
+            project: Project the response with ``self.projections``
+
+        Returns:
+            Parsed JSON response (projected unless ``project`` is False)
+
+        Raises:
+            APIFootballError: If the response is an error or has no data
+        """
+        if status_code >= 400:
+            # Client errors won't change on retry; remember them briefly (rate limiting excepted)
+            if status_code < 500 and status_code != 429 and self.error_ttl > 0:
+                error = {'status': status_code, 'errors': reason}
+                store(wrap_entry(error, self.error_ttl, negative=NEGATIVE_ERROR), self.error_ttl)
+                self.cache_stats.incr(f'negative_store_{NEGATIVE_ERROR}', endpoint)
+            logger.error(f"Request failed for {endpoint}: {status_code} {reason}")
+            raise APIFootballError(f"Request failed: {status_code} {reason}")
+
+        try:
+            data = parse_json()
         except ValueError as e:
+            self.cache_stats.incr('error_invalid_json', endpoint)
             logger.error(f"Invalid JSON response for {endpoint}: {str(e)}")
             raise APIFootballError("Invalid response format")
 
+        if project:
+            data = project_response(endpoint, data, self.projections)
+
+        # Check API response status
+        if not data.get('response'):
+            error_msg = data.get('errors', {})
+            if error_msg:
+                self.cache_stats.incr('error_api', endpoint)
+                logger.error(f"API returned no data: {error_msg}")
+                raise APIFootballError(f"No data returned from API: {error_msg}")
+
+            # A valid but empty result (no coaches, no search hits, no match in play, ...),
+            # kept no longer than the policy keeps a result of the same request
+            decision = self.ttl_policy.resolve(
+                endpoint, params, data, context={'current_season': self.current_season}
+            )
+            ttl = min(self.negative_ttl, decision.ttl)
+            logger.info(f"API returned an empty result for {endpoint}, caching for {ttl}s (rule: {decision.rule})")
+            if ttl > 0:
+                store(wrap_entry(data, ttl, negative=NEGATIVE_EMPTY, digest=self._content_digest(data)), ttl)
+                self.cache_stats.incr(f'negative_store_{NEGATIVE_EMPTY}', endpoint)
+            return data
+
+        # Cache successful responses for as long as the TTL policy allows
+        decision = self.ttl_policy.resolve(
+            endpoint, params, data, context={'current_season': self.current_season}
+        )
+        grace = decision.stale_grace
+        if grace is None:
+            grace = self.stale_grace.get(endpoint, 0)
+        store(wrap_entry(data, decision.ttl, grace, digest=self._content_digest(data)),
+              entry_timeout(decision.ttl, grace))
+
+        logger.info(f"Successfully fetched data from {endpoint} (TTL {decision.ttl}s, rule: {decision.rule})")
+        return data
+
     def get_league_info(self, season: int = None) -> Dict[str, Any]:
         """
         Get Allsvenskan league information.
@@ -157,6 +911,10 @@ class APIFootballService:
             'season': season
         }
 
+        local = self._read_local(lambda store: store.get_standings(season))
+        if local is not None:
+            return local
+
         try:
             data = self._make_request('standings', params)
             if data['response'] and data['response'][0]['league']['standings']:
@@ -196,6 +954,10 @@ class APIFootballService:
         if next:
             params['next'] = next
 
+        local = self._read_local(lambda store: store.get_fixtures(season, status, team_id, last, next))
+        if local is not None:
+            return local
+
         try:
             data = self._make_request('fixtures', params)
             return data['response'] if data['response'] else []
@@ -238,6 +1000,10 @@ class APIFootballService:
             'season': season
         }
 
+        local = self._read_local(lambda store: store.get_teams(season))
+        if local is not None:
+            return local
+
         try:
             data = self._make_request('teams', params)
             return data['response'] if data['response'] else []
@@ -262,6 +1028,10 @@ class APIFootballService:
             'season': season
         }
 
+        local = self._read_local(lambda store: store.get_top_scorers(season, limit))
+        if local is not None:
+            return local
+
         try:
             data = self._make_request('players/topscorers', params)
             scorers = data['response'] if data['response'] else []
@@ -287,6 +1057,10 @@ class APIFootballService:
             'season': season
         }
 
+        local = self._read_local(lambda store: store.get_top_assists(season, limit))
+        if local is not None:
+            return local
+
         try:
             data = self._make_request('players/topassists', params)
             assists = data['response'] if data['response'] else []
@@ -326,6 +1100,10 @@ class APIFootballService:
         """
         Get most used lineups/formations for a specific team.
 
+        Lineups come from batched fixture details, so a season's worth of
+        fixtures costs a couple of upstream requests the first time and none
+        once the finished fixtures are cached.
+
         Args:
             team_id: Team ID
             season: Season year (defaults to current season)
@@ -335,25 +1113,127 @@ class APIFootballService:
         """
         season = season or self.current_season
 
-        # Get recent fixtures to analyze formations
+        # Only fixtures that have kicked off can have lineups
         fixtures = self.get_fixtures(team_id=team_id, season=season)
-        formations = {}
+        details = self.get_fixture_details(self._played_fixture_ids(fixtures))
 
-        for fixture in fixtures:
+        return self._formation_usage(self._count_formations(details.values(), team_id))
+
+    def get_fixture_details(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get fixture details, including lineups, for many fixtures.
+
+        Fixtures missing from the cache are fetched with the multi-id
+        ``fixtures?ids=`` query, up to ``fixture_batch_size`` per request.
+        Each fixture is cached individually: permanently once finished,
+        briefly while it can still change.
+
+        Args:
+            fixture_ids: Fixture IDs
+
+        Returns:
+            Dict mapping fixture ID to its detailed fixture data
+        """
+        keys = self._fixture_detail_keys(fixture_ids)
+        if not keys:
+            return {}
+        # Fixture details are cached one by one, without content versions
+        self._track_unversioned('fixture_details')
+
+        details, missing = self._split_cached_details(keys, cache.get_many(list(keys.values())))
+
+        for batch in self._fixture_batches(missing):
             try:
-                # Get detailed fixture data with lineups
-                fixture_id = fixture.get('fixture', {}).get('id')
-                if fixture_id:
-                    lineup_data = self._get_fixture_lineups(fixture_id, team_id)
-                    if lineup_data:
-                        formation = lineup_data.get('formation')
-                        if formation:
-                            formations[formation] = formations.get(formation, 0) + 1
-            except Exception as e:
-                logger.debug(f"Failed to get lineup for fixture {fixture_id}: {e}")
+                data = self._make_request('fixtures', {'ids': '-'.join(str(fixture_id) for fixture_id in batch)},
+                                          use_cache=False)
+            except APIFootballError as e:
+                logger.error(f"Failed to get fixture details for {batch}: {e}")
                 continue
 
-        # Convert to sorted list
+            fetched, entries = self._fixture_detail_entries(keys, data.get('response') or [])
+            details.update(fetched)
+            for timeout, batch_entries in entries.items():
+                cache.set_many(batch_entries, timeout)
+
+        return details
+
+    def _fixture_detail_keys(self, fixture_ids: List[int]) -> Dict[int, str]:
+        """Map each distinct fixture ID to its per-fixture detail cache key."""
+        keys = {}
+        for fixture_id in fixture_ids:
+            if fixture_id and fixture_id not in keys:
+                keys[fixture_id] = make_cache_key('fixtures/detail', {'id': fixture_id})
+        return keys
+
+    def _split_cached_details(self, keys: Dict[int, str], cached: Dict[str, Any]):
+        """Split fixture IDs into fresh cached details and IDs that need fetching."""
+        details = {}
+        missing = []
+        for fixture_id, key in keys.items():
+            entry = read_entry(cached.get(key))
+            if entry:
+                data, is_stale = unwrap_entry(entry)
+                if not is_stale:
+                    details[fixture_id] = data
+                    continue
+            missing.append(fixture_id)
+
+        self._count_lookup('hit', 'fixtures/detail', len(details))
+        self._count_lookup('miss', 'fixtures/detail', len(missing))
+        return details, missing
+
+    def _fixture_batches(self, fixture_ids: List[int]) -> List[List[int]]:
+        """Split fixture IDs into upstream-sized batches."""
+        size = self.fixture_batch_size
+        return [fixture_ids[i:i + size] for i in range(0, len(fixture_ids), size)]
+
+    def _fixture_detail_entries(self, keys: Dict[int, str], fixtures: List[Dict[str, Any]]):
+        """
+        Build per-fixture cache entries from a batched response.
+
+        Returns:
+            Tuple of (details by fixture ID, {timeout: {cache_key: entry}})
+        """
+        details = {}
+        entries = {}
+        for fixture in fixtures:
+            fixture_id = fixture.get('fixture', {}).get('id')
+            if fixture_id not in keys:
+                continue
+            details[fixture_id] = fixture
+            decision = self.ttl_policy.resolve(
+                'fixtures', {'id': fixture_id}, {'response': [fixture]},
+                context={'current_season': self.current_season},
+            )
+            entries.setdefault(decision.ttl, {})[keys[fixture_id]] = wrap_entry(fixture, decision.ttl)
+        return details, entries
+
+    @staticmethod
+    def _played_fixture_ids(fixtures: List[Dict[str, Any]]) -> List[int]:
+        """Get the IDs of fixtures that are finished or in play."""
+        played = FINISHED_STATUSES | IN_PLAY_STATUSES
+        return [
+            fixture['fixture']['id'] for fixture in fixtures
+            if fixture.get('fixture', {}).get('id')
+            and fixture['fixture'].get('status', {}).get('short') in played
+        ]
+
+    @staticmethod
+    def _count_formations(details: Iterable[Dict[str, Any]], team_id: int) -> Dict[str, int]:
+        """Count how often a team used each formation across fixture details."""
+        formations = {}
+        for fixture in details:
+            for lineup in fixture.get('lineups') or []:
+                if lineup.get('team', {}).get('id') == team_id:
+                    formation = lineup.get('formation')
+                    if formation:
+                        formations[formation] = formations.get(formation, 0) + 1
+                    break
+        return formations
+
+    @staticmethod
+    def _formation_usage(formations: Dict[str, int]) -> List[Dict[str, Any]]:
+        """Convert formation counts to a list sorted by most played."""
         formation_list = []
         for formation, count in sorted(formations.items(), key=lambda x: x[1], reverse=True):
             formation_list.append({
@@ -363,36 +1243,6 @@ class APIFootballService:
 
         return formation_list
 
-    def _get_fixture_lineups(self, fixture_id: int, team_id: int = None) -> Dict[str, Any]:
-        """
-        Get lineups for a specific fixture.
-
-        Args:
-            fixture_id: Fixture ID
-            team_id: Optional team ID to filter lineup
-
-        Returns:
-            Lineup data for the team
-        """
-        params = {
-            'fixture': fixture_id
-        }
-
-        try:
-            data = self._make_request('fixtures/lineups', params)
-            if data['response']:
-                if team_id:
-                    # Find lineup for specific team
-                    for lineup in data['response']:
-                        if lineup.get('team', {}).get('id') == team_id:
-                            return lineup
-                else:
-                    return data['response'][0] if data['response'] else {}
-            return {}
-        except APIFootballError as e:
-            logger.debug(f"Failed to get fixture lineups: {e}")
-            return {}
-
     def get_h2h_matches(self, team1_id: int, team2_id: int, last: int = 10) -> List[Dict[str, Any]]:
         """
         Get head-to-head matches between two teams.
@@ -475,26 +1325,35 @@ class APIFootballService:
         Returns:
             List of all team squad players
         """
-        season = season or self.current_season
-        params = {
-            'team': team_id
-        }
-
         try:
-            data = self._make_request('players/squads', params)
-            if data['response'] and len(data['response']) > 0:
-                return data['response'][0].get('players', [])
-            return []
+            return self._load_team_squad(team_id, season or self.current_season)
         except APIFootballError as e:
             logger.error(f"Failed to get team squad: {e}")
             return []
 
+    def _load_team_squad(self, team_id: int, season: int) -> List[Dict[str, Any]]:
+        """
+        Load a team's squad players.
+
+        Raises:
+            APIFootballError: If the squad could not be loaded
+        """
+        local = self._read_local(lambda store: store.get_team_squad(team_id, season))
+        if local is not None:
+            return local
+
+        data = self._make_request('players/squads', {'team': team_id})
+        if data['response'] and len(data['response']) > 0:
+            return data['response'][0].get('players', [])
+        return []
+
     def get_all_league_players(self, season: int = None) -> List[Dict[str, Any]]:
         """
         Get all players from all teams in the Allsvenskan league.
 
-        This method fetches all teams first, then gets the squad for each team,
-        and combines player data with their statistics.
+        This method fetches all teams first, then loads every team's squad
+        concurrently and combines player data with their team information.
+        Views should prefer get_league_roster, which caches the merged result.
 
         Args:
             season: Season year (defaults to current season)
@@ -502,7 +1361,17 @@ class APIFootballService:
         Returns:
             List of all players with their team and statistical information
         """
-        season = season or self.current_season
+        players, _ = self._load_league_players(season or self.current_season)
+        return players
+
+    def _load_league_players(self, season: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Load and format every squad of the league.
+
+        Returns:
+            Tuple of (players, complete), where complete is False when any
+            squad could not be loaded
+        """
         all_players = []
 
         try:
@@ -510,62 +1379,491 @@ class APIFootballService:
             teams = self.get_teams(season)
             logger.info(f"Found {len(teams)} teams in Allsvenskan")
 
-            for team_data in teams:
-                team_info = team_data.get('team', {})
-                team_id = team_info.get('id')
-
-                if not team_id:
+            team_infos = [
+                team_data.get('team', {}) for team_data in teams
+                if team_data.get('team', {}).get('id')
+            ]
+
+            # Squads are independent of each other, so fetch them side by side; a failed
+            # squad fails its task, which marks the roster incomplete
+            fanout = FanOut(deadline=self.timeout)
+            for team_info in team_infos:
+                fanout.add(str(team_info['id']), self._load_team_squad, team_info['id'], season)
+            squads = fanout.run()
+
+            for team_info in team_infos:
+                name = str(team_info['id'])
+                if not squads.ok(name):
+                    logger.warning(f"Failed to get squad for team {team_info.get('name', 'Unknown')}")
                     continue
 
-                try:
-                    # Get squad for this team
-                    squad_players = self.get_team_squad(team_id, season)
-                    logger.info(f"Found {len(squad_players)} players for {team_info.get('name')}")
-
-                    # For each player, get their statistics and format the data
-                    for player in squad_players:
-                        player_id = player.get('id')
-                        if not player_id:
-                            continue
-
-                        # For efficiency, we'll add players with basic info and get stats later if needed
-                        # This reduces the number of API calls significantly
-                        formatted_player = {
-                            'player': {
-                                'id': player.get('id'),
-                                'name': player.get('name'),
-                                'firstname': player.get('firstname'),
-                                'lastname': player.get('lastname'),
-                                'age': player.get('age'),
-                                'birth': player.get('birth', {}),
-                                'nationality': player.get('nationality'),
-                                'height': player.get('height'),
-                                'weight': player.get('weight'),
-                                'photo': player.get('photo')
-                            },
-                            'statistics': [{
-                                'team': team_info,
-                                'league': {'id': self.league_id, 'name': 'Allsvenskan'},
-                                'games': {'position': player.get('position')},
-                                'goals': {'total': 0, 'assists': 0},
-                                'cards': {'yellow': 0, 'red': 0}
-                            }]
-                        }
-                        all_players.append(formatted_player)
-
-                except Exception as e:
-                    logger.warning(f"Failed to get squad for team {team_info.get('name', 'Unknown')}: {e}")
-                    continue
+                squad_players = squads[name]
+                logger.info(f"Found {len(squad_players)} players for {team_info.get('name')}")
+                for player in squad_players:
+                    if player.get('id'):
+                        all_players.append(self._format_league_player(player, team_info))
 
             logger.info(f"Successfully collected {len(all_players)} total players from all teams")
-            return all_players
+            complete = bool(team_infos) and all(squads.ok(str(team_info['id'])) for team_info in team_infos)
+            return all_players, complete
 
         except APIFootballError as e:
             logger.error(f"Failed to get all league players: {e}")
-            return []
+            return [], False
         except Exception as e:
             logger.error(f"Unexpected error getting all league players: {e}")
+            return [], False
+
+    def get_league_roster(self, season: int = None) -> Dict[str, Any]:
+        """
+        Get the materialized roster of every player in the league.
+
+        The roster is built from all squads once per refresh and cached as a
+        single entry, so player pages read a prebuilt structure instead of
+        merging every squad on each request. A stale roster is served while
+        it is rebuilt in the background.
+
+        Args:
+            season: Season year (defaults to current season)
+
+        Returns:
+            Roster dict (see league_roster.build_league_roster)
+        """
+        season = season or self.current_season
+        params = {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}
+        cache_key = make_cache_key('league/roster', params)
+
+        entry = self._read_tiered(cache_key, 'league/roster')
+        if entry:
+            roster, is_stale = unwrap_entry(entry)
+            if not is_stale:
+                if self._refresh_due(cache_key, entry):
+                    roster = self._refresh_ahead(
+                        'league/roster', cache_key,
+                        lambda: self._build_league_roster(season, params, cache_key), roster,
+                    )
+                    self._track_version(cache_key)
+                    return roster
+                self._count_lookup('hit', 'league/roster')
+                self._track_version(cache_key, entry)
+                return roster
+
+            self._count_lookup('stale_hit', 'league/roster')
+            self._schedule_refresh(
+                'league/roster', params, cache_key,
+                fetch=lambda: self._build_league_roster(season, params, cache_key),
+            )
+            self._track_version(cache_key, entry)
+            return roster
+
+        self._count_lookup('miss', 'league/roster')
+        roster = self.single_flight.do(
+            cache_key,
+            lambda: self._build_league_roster(season, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        self._track_version(cache_key)
+        return roster
+
+    def _roster_lifetime(self, params: Dict[str, Any], complete: bool) -> Tuple[int, int]:
+        """Fresh TTL and stale grace of a league roster and its slug index."""
+        decision = self.ttl_policy.resolve(
+            'league/roster', params, context={'current_season': self.current_season}
+        )
+        ttl = decision.ttl if complete else self.error_ttl
+        grace = decision.stale_grace
+        if grace is None:
+            grace = self.stale_grace.get('league/roster', 0)
+        return ttl, grace
+
+    def _build_league_roster(self, season: int, params: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Build the league roster and store it in the cache."""
+        players, complete = self._load_league_players(season)
+        roster = build_league_roster(players, season, complete=complete)
+        if not players:
+            # Nothing to materialize; let the next request try again
+            return roster
+
+        ttl, grace = self._roster_lifetime(params, complete)
+        entry = wrap_entry(roster, ttl, grace, digest=roster['version'])
+        self._stamp_version(cache_key, entry)
+        cache.set(cache_key, entry, entry_timeout(ttl, grace))
+        self._written(cache_key, entry_timeout(ttl, grace))
+        self._store_player_slugs(season, roster, ttl, grace)
+        logger.info(
+            f"Built league roster for {season}: {len(players)} players, version {roster['version']}"
+            f"{'' if complete else ' (incomplete)'}"
+        )
+        return roster
+
+    def get_league_player_stats(self, season: int = None) -> List[Dict[str, Any]]:
+        """
+        Get the league statistics of every player in Allsvenskan.
+
+        Reads every page of the players endpoint; the first page gives the
+        page count, the rest are fetched side by side.
+
+        Args:
+            season: Season year (defaults to current season)
+
+        Returns:
+            List of players with their statistics, in the shape of the
+            topscorers endpoint
+        """
+        players, _ = self._load_league_player_stats(season or self.current_season)
+        return players
+
+    def _load_league_player_stats(self, season: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Load every page of the league's player statistics.
+
+        Returns:
+            Tuple of (players, complete), where complete is False when any
+            page could not be loaded
+        """
+        local = self._read_local(lambda store: store.get_league_player_stats(season))
+        if local is not None:
+            return local, True
+
+        params = {'league': self.league_id, 'season': season}
+        try:
+            first = self._make_request('players', {**params, 'page': 1})
+        except APIFootballError as e:
+            logger.error(f"Failed to get league player statistics: {e}")
+            return [], False
+
+        players = list(first.get('response') or [])
+        total_pages = (first.get('paging') or {}).get('total') or 1
+        fanout = FanOut(deadline=self.timeout)
+        for page in range(2, total_pages + 1):
+            fanout.add(str(page), self._make_request, 'players', {**params, 'page': page})
+        pages = fanout.run()
+
+        complete = True
+        for page in range(2, total_pages + 1):
+            if not pages.ok(str(page)):
+                logger.warning(f"Failed to get page {page} of the league player statistics")
+                complete = False
+                continue
+            players.extend(pages[str(page)].get('response') or [])
+        return players, complete
+
+    def _load_leaderboard_fixtures(self, season: int) -> List[Dict[str, Any]]:
+        """Get the season's fixtures, with lineups for those that have been played."""
+        fixtures = self.get_fixtures(season)
+        details = self.get_fixture_details(self._played_fixture_ids(fixtures))
+        return [details.get(fixture.get('fixture', {}).get('id'), fixture) for fixture in fixtures]
+
+    def get_leaderboards(self, season: int = None, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get every precomputed player leaderboard of the league.
+
+        The leaderboards are computed from the league's player statistics
+        and fixtures once per refresh and cached as a single entry; each
+        process also keeps the decoded leaderboards while their content
+        version is unchanged. A stale entry is served while it is rebuilt
+        in the background.
+
+        Building them reads every page of the players endpoint and the
+        played fixtures, about 30 upstream calls, so pages pass
+        ``wait=False`` to build them in the background instead of inside
+        the request when none are cached.
+
+        Args:
+            season: Season year (defaults to current season)
+            wait: Build the leaderboards in this call when none are cached
+
+        Returns:
+            Leaderboards dict (see leaderboards.build_leaderboards); read
+            boards with get_leaderboard. None when none are cached and
+            ``wait`` is False
+        """
+        season = season or self.current_season
+        params = {'league': self.league_id, 'season': season, 'format': LEADERBOARDS_FORMAT}
+        cache_key = make_cache_key('league/leaderboards', params)
+
+        # The warmer needs the entry itself, to refresh it ahead of expiry
+        if self.data_versions is not None and _warming.get() is None:
+            version = self.data_versions.get(cache_key)
+            kept = self.leaderboard_memo.get(cache_key, version.digest if version else None)
+            if kept is not None:
+                self._count_lookup('hit', 'league/leaderboards')
+                self._track_version(cache_key)
+                return kept
+
+        entry = self._read_tiered(cache_key, 'league/leaderboards')
+        if entry:
+            leaderboards, is_stale = unwrap_entry(entry)
+            if not is_stale:
+                if self._refresh_due(cache_key, entry):
+                    leaderboards = self._refresh_ahead(
+                        'league/leaderboards', cache_key,
+                        lambda: self._build_leaderboards(season, params, cache_key), leaderboards,
+                    )
+                    self._track_version(cache_key)
+                    return leaderboards
+                self._count_lookup('hit', 'league/leaderboards')
+                self.leaderboard_memo.put(cache_key, entry.get('digest'), entry['soft_expires'], leaderboards)
+                self._track_version(cache_key, entry)
+                return leaderboards
+
+            self._count_lookup('stale_hit', 'league/leaderboards')
+            self._schedule_refresh(
+                'league/leaderboards', params, cache_key,
+                fetch=lambda: self._build_leaderboards(season, params, cache_key),
+            )
+            self._track_version(cache_key, entry)
+            return leaderboards
+
+        self._count_lookup('miss', 'league/leaderboards')
+        if not wait:
+            self._schedule_refresh(
+                'league/leaderboards', params, cache_key,
+                fetch=lambda: self._build_leaderboards(season, params, cache_key),
+            )
+            return None
+        leaderboards = self.single_flight.do(
+            cache_key,
+            lambda: self._build_leaderboards(season, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        self._track_version(cache_key)
+        return leaderboards
+
+    def _build_leaderboards(self, season: int, params: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Compute the leaderboards and store them in the cache."""
+        player_stats, complete = self._load_league_player_stats(season)
+        fixtures = self._load_leaderboard_fixtures(season) if player_stats else []
+        leaderboards = build_leaderboards(player_stats, fixtures, self.league_id, season, complete=complete)
+        if not player_stats:
+            # Nothing to rank; let the next request try again
+            return leaderboards
+        self._store_leaderboards(params, cache_key, leaderboards)
+        return leaderboards
+
+    def _leaderboards_entry(self, params: Dict[str, Any], leaderboards: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Wrap built leaderboards in a cache entry; returns (entry, timeout)."""
+        decision = self.ttl_policy.resolve(
+            'league/leaderboards', params, context={'current_season': self.current_season}
+        )
+        ttl = decision.ttl if leaderboards['complete'] else self.error_ttl
+        grace = decision.stale_grace
+        if grace is None:
+            grace = self.stale_grace.get('league/leaderboards', 0)
+        return wrap_entry(leaderboards, ttl, grace, digest=leaderboards['version']), entry_timeout(ttl, grace)
+
+    def _store_leaderboards(self, params: Dict[str, Any], cache_key: str, leaderboards: Dict[str, Any]) -> None:
+        """Write built leaderboards to the cache and keep them in this process."""
+        entry, timeout = self._leaderboards_entry(params, leaderboards)
+        self._stamp_version(cache_key, entry)
+        cache.set(cache_key, entry, timeout)
+        self._written(cache_key, timeout)
+        self.leaderboard_memo.put(cache_key, leaderboards['version'], entry['soft_expires'], leaderboards)
+        logger.info(
+            f"Built leaderboards for {params['season']}: {len(leaderboards['players'])} players, "
+            f"version {leaderboards['version']}{'' if leaderboards['complete'] else ' (incomplete)'}"
+        )
+
+    def get_leaderboard(self, name: str, season: int = None, limit: int = 10,
+                        wait: bool = True) -> List[Dict[str, Any]]:
+        """
+        Get the top of one player leaderboard.
+
+        Args:
+            name: Board name: goals, assists, goal_involvements, yellow_cards,
+                red_cards, cards, clean_sheets, goals_per_90, assists_per_90
+                or goal_involvements_per_90
+            season: Season year (defaults to current season)
+            limit: Maximum number of players to return
+            wait: Build the leaderboards in this call when none are cached
+                (see get_leaderboards)
+
+        Returns:
+            Players in the shape of the topscorers endpoint, each with its
+            ``rank`` and the ``value`` ranked on; empty while the
+            leaderboards are built in the background
+        """
+        leaderboards = self.get_leaderboards(season, wait=wait)
+        if leaderboards is None:
             return []
+        return leaderboard(leaderboards, name, limit)
+
+    def get_player_index(self, season: int = None) -> PlayerIndex:
+        """
+        Get the faceted index of every player in the league.
+
+        The index joins the league roster with the players' league totals
+        from the leaderboards, when they are cached; otherwise they are
+        built in the background and the index is rebuilt once they are
+        there. Each process keeps the index it built while
+        the roster is fresh and neither dataset's content version changes,
+        so a filtered listing doesn't read the roster at all.
+
+        Args:
+            season: Season year (defaults to current season)
+
+        Returns:
+            Player index (see player_index.PlayerIndex)
+        """
+        season = season or self.current_season
+        roster_params = {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}
+        roster_key = make_cache_key('league/roster', roster_params)
+
+        try:
+            leaderboards = self.get_leaderboards(season, wait=False)
+        except APIFootballError as e:
+            logger.warning(f"Building the player index without league totals: {e}")
+            leaderboards = None
+        leaderboards_version = (leaderboards or {}).get('version')
+
+        if self.data_versions is not None and _warming.get() is None:
+            version = self.data_versions.get(roster_key)
+            digest = f"{version.digest}:{leaderboards_version}" if version else None
+            kept = self.player_index_memo.get(roster_key, digest)
+            if kept is not None:
+                self._count_lookup('hit', 'league/roster')
+                self._track_version(roster_key)
+                return kept
+
+        return self._keep_player_index(roster_params, roster_key, self.get_league_roster(season), leaderboards)
+
+    def _keep_player_index(self, roster_params: Dict[str, Any], roster_key: str, roster: Dict[str, Any],
+                           leaderboards: Optional[Dict[str, Any]]) -> PlayerIndex:
+        """Build the player index and keep it in this process until the roster goes stale."""
+        index = build_player_index(roster, leaderboards)
+        if roster['players']:
+            decision = self.ttl_policy.resolve(
+                'league/roster', roster_params, context={'current_season': self.current_season}
+            )
+            expires = roster['built_at'] + (decision.ttl if roster['complete'] else self.error_ttl)
+            digest = f"{roster['version']}:{(leaderboards or {}).get('version')}"
+            self.player_index_memo.put(roster_key, digest, expires, index)
+        return index
+
+    def _player_slugs_key(self, season: int) -> str:
+        """Cache key of the slug index written with the league roster."""
+        return make_cache_key('league/player_slugs', {
+            'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT,
+        })
+
+    def _unknown_slug_key(self, season: int, slug: str) -> str:
+        """Cache key of the negative entry of a slug no player has."""
+        return make_cache_key('league/player_slug', {
+            'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT, 'slug': slug,
+        })
+
+    def _store_player_slugs(self, season: int, roster: Dict[str, Any], ttl: int, grace: int) -> None:
+        """Write the slug index of a freshly built roster, versioned like the roster, and keep it in this process."""
+        key = self._player_slugs_key(season)
+        records = roster_slug_index(roster)
+        entry = wrap_entry(records, ttl, grace, digest=roster['version'])
+        self._stamp_version(key, entry)
+        cache.set(key, entry, entry_timeout(ttl, grace))
+        self.player_slug_memo.put(key, roster['version'], entry['soft_expires'], records)
+
+    def get_player_slug_index(self, season: int = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get the slug index of the league roster.
+
+        The index is one cache entry written with the roster; each process
+        keeps it decoded while its content version holds.
+
+        Args:
+            season: Season year (defaults to current season)
+
+        Returns:
+            Slug record per slug (see league_roster.roster_slug_index), or
+            None when no index is cached
+        """
+        season = season or self.current_season
+        key = self._player_slugs_key(season)
+
+        if self.data_versions is not None:
+            version = self.data_versions.get(key)
+            kept = self.player_slug_memo.get(key, version.digest if version else None)
+            if kept is not None:
+                return kept
+
+        entry = read_entry(cache.get(key))
+        if not entry:
+            return None
+        # A stale index is as good as the stale roster it came from
+        records, _ = unwrap_entry(entry)
+        if entry.get('digest'):
+            self.player_slug_memo.put(key, entry['digest'], entry['soft_expires'], records)
+        return records
+
+    def get_player_by_slug(self, slug: str, season: int = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a league player by the slug of their name.
+
+        Answers from the slug index written with the league roster. Only
+        when no index is cached (the roster was never built, or was
+        evicted) is the roster read, which writes the index again; a slug
+        no player has is then remembered for the negative TTL, so repeated
+        requests for it don't read the roster.
+
+        Args:
+            slug: Slug of the player's name, possibly qualified with their
+                club and id (see league_roster.roster_slugs)
+            season: Season year (defaults to current season)
+
+        Returns:
+            Dict with the ``player``, their unique ``slug`` and the other
+            players sharing their name under ``same_name``, or None if no
+            league player has the slug
+        """
+        season = season or self.current_season
+        # Slug records are derived from the roster without versions of their own
+        self._track_unversioned('league/player_slug')
+
+        index = self.get_player_slug_index(season)
+        if index is not None:
+            record = index.get(slug)
+            self._count_lookup('hit' if record is not None else 'negative_hit', 'league/player_slug')
+            return record
+
+        unknown_key = self._unknown_slug_key(season, slug)
+        if entry_negative(read_entry(cache.get(unknown_key))):
+            self._count_lookup('negative_hit', 'league/player_slug')
+            return None
+
+        self._count_lookup('miss', 'league/player_slug')
+        roster = self.get_league_roster(season)
+        if roster['players']:
+            # Put the index back, so the next lookups don't read the roster again
+            ttl, grace = self._roster_lifetime(
+                {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}, roster['complete']
+            )
+            self._store_player_slugs(season, roster, ttl, grace)
+        record = roster_slug_record(roster, slug)
+        if record is None and roster['players'] and self.negative_ttl > 0:
+            cache.set(unknown_key, wrap_entry(None, self.negative_ttl, negative=NEGATIVE_EMPTY), self.negative_ttl)
+        return record
+
+    def _format_league_player(self, player: Dict[str, Any], team_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a squad player into the player/statistics shape the views expect."""
+        return {
+            'player': {
+                'id': player.get('id'),
+                'name': player.get('name'),
+                'firstname': player.get('firstname'),
+                'lastname': player.get('lastname'),
+                'age': player.get('age'),
+                'birth': player.get('birth', {}),
+                'nationality': player.get('nationality'),
+                'height': player.get('height'),
+                'weight': player.get('weight'),
+                'photo': player.get('photo')
+            },
+            'statistics': [{
+                'team': team_info,
+                'league': {'id': self.league_id, 'name': 'Allsvenskan'},
+                'games': {'position': player.get('position')},
+                'goals': {'total': 0, 'assists': 0},
+                'cards': {'yellow': 0, 'red': 0}
+            }]
+        }
 
     def get_team_coaches(self, team_id: int, season: int = None) -> List[Dict[str, Any]]:
         """
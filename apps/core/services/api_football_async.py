@@ -0,0 +1,933 @@
+"""
+Native asyncio client for the API Football service.
+
+``AsyncAPIFootballService`` mirrors every public method of
+``APIFootballService`` as a coroutine. It shares the same cache keys,
+cache entries, TTL policy, negative caching and error semantics, so sync
+and async callers read and write the same cache, but upstream calls run on
+an ``httpx.AsyncClient`` with a bounded connection pool instead of
+occupying a thread each.
+
+The client needs a long-lived event loop: its connection pool belongs to
+the loop it was created on, and stale entries are refreshed in tasks on
+that loop. The site is served through WSGI (``config.wsgi``), where Django
+runs every async view on a loop of its own that ends with the request, so
+the views use the sync client until the site is served through
+``config.asgi``.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from decouple import config
+
+from .api_football import (
+    APIFootballError, APIFootballService, CircuitOpenError, QuotaExceededError, _tracking, _warming,
+    api_football_service,
+)
+from .cache_entry import NEGATIVE_EMPTY, entry_data_version, entry_negative, entry_timeout, read_entry, unwrap_entry, wrap_entry
+from .cache_keys import make_cache_key
+from .data_version import DataVersion
+from .leaderboards import LEADERBOARDS_FORMAT, build_leaderboards, leaderboard
+from .league_roster import ROSTER_FORMAT, build_league_roster, roster_slug_index, roster_slug_record
+from .player_index import PlayerIndex
+from .rate_limiter import PRIORITY_LOW
+from .single_flight import AsyncSingleFlight
+from .telemetry import accounted
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIFootballService(APIFootballService):
+    """
+    Async variant of APIFootballService.
+
+    Configuration, caching and response handling are inherited; only the
+    I/O paths are replaced with their asyncio equivalents.
+    """
+
+    def __init__(self, shared: Optional[APIFootballService] = None):
+        """
+        Args:
+            shared: Sync client whose process-wide state to use (see
+                APIFootballService.PROCESS_STATE)
+        """
+        super().__init__(shared)
+        self.max_connections = config('API_FOOTBALL_ASYNC_MAX_CONNECTIONS', default=20, cast=int)
+        self.max_keepalive = config('API_FOOTBALL_ASYNC_MAX_KEEPALIVE', default=10, cast=int)
+        self.async_single_flight = AsyncSingleFlight(
+            lock_timeout=self.single_flight.lock_timeout,
+            wait_timeout=self.single_flight.wait_timeout,
+        )
+        self._client = None
+        self._client_loop = None
+        self._refresh_tasks = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._get_headers(),
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    @accounted
+    async def _make_request(self, endpoint: str, params: Dict[str, Any] = None,
+                            use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Make a request to the API Football service.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+            use_cache: Read and store the response in the cache
+
+        Returns:
+            Parsed JSON response
+
+        Raises:
+            APIFootballError: If request fails or returns error
+        """
+        archived = self._read_archive(endpoint, params)
+        if archived is not None:
+            return archived
+
+        if not self.api_key:
+            raise APIFootballError("API key not configured")
+
+        if not use_cache:
+            self._track_unversioned(endpoint)
+            return await self._fetch(endpoint, params, None)
+
+        cache_key = make_cache_key(endpoint, params)
+
+        entry = await self._read_tiered(cache_key, endpoint)
+        if entry:
+            cached_data, is_stale = unwrap_entry(entry)
+            if entry_negative(entry):
+                self._count_lookup('negative_hit', endpoint)
+                logger.debug(f"Negative cache hit for {endpoint}")
+                data = self._from_negative_entry(entry)
+                await self._track_version(cache_key, entry)
+                return data
+
+            if not is_stale:
+                self._count_lookup('hit', endpoint)
+                logger.debug(f"Cache hit for {endpoint}")
+                await self._track_version(cache_key, entry)
+                return cached_data
+
+            self._count_lookup('stale_hit', endpoint)
+            logger.debug(f"Serving stale {endpoint} while refreshing in background")
+            self._schedule_refresh(endpoint, params, cache_key)
+            await self._track_version(cache_key, entry)
+            return cached_data
+
+        self._count_lookup('miss', endpoint)
+        data = await self.async_single_flight.do(
+            cache_key,
+            lambda: self._fetch(endpoint, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        await self._track_version(cache_key)
+        return data
+
+    async def _read_tiered(self, cache_key: str, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Read an entry through the in-process tier (see APIFootballService._read_tiered)."""
+        tier = self.local_tier
+        if tier is None:
+            value = await cache.aget(cache_key)
+            self.cache_stats.incr('shared_hit' if value else 'shared_miss', endpoint)
+            return read_entry(value)
+
+        if tier.needs_check():
+            await tier.acheck_versions()
+        value = tier.get(cache_key)
+        if value is not None:
+            self.cache_stats.incr('local_hit', endpoint)
+            return self._decode_local(cache_key, value)
+
+        self.cache_stats.incr('local_miss', endpoint)
+        version_key = tier.version_key(cache_key)
+        values = await cache.aget_many([cache_key, version_key])
+        return self._keep_local(cache_key, endpoint, values.get(cache_key), values.get(version_key))
+
+    async def _written(self, cache_key: str, timeout: int) -> None:
+        """Invalidate other workers' local copies of an entry just written to the shared cache."""
+        if self.local_tier is not None:
+            await self.local_tier.abump(cache_key, timeout)
+
+    async def get_data_version(self, endpoint: str, params: Dict[str, Any] = None) -> Optional[DataVersion]:
+        """Get the content version of a cached request (see APIFootballService.get_data_version)."""
+        if self.data_versions is None:
+            return None
+        return await self.data_versions.aget(make_cache_key(endpoint, params))
+
+    async def _track_version(self, cache_key: str, entry: Optional[Dict[str, Any]] = None) -> None:
+        """Record the version of a dataset read inside tracking_versions(), from its entry if stamped."""
+        versions = _tracking.get()
+        if versions is None:
+            return
+        version = entry_data_version(entry)
+        if version is None and self.data_versions is not None:
+            version = await self.data_versions.aget(cache_key)
+        versions.add(cache_key, version)
+
+    async def _stamp_version(self, cache_key: str, entry: Dict[str, Any]) -> None:
+        """Stamp an entry about to be written with its dataset's content version."""
+        if self.data_versions is not None and entry.get('digest'):
+            version = await self.data_versions.astamp(cache_key, entry['digest'])
+            if version is not None:
+                entry['data_version'] = version.version
+
+    async def _get_cached(self, cache_key: str, fresh_only: bool = False) -> Optional[Dict[str, Any]]:
+        """Read a payload from the cache (see APIFootballService._get_cached)."""
+        entry = read_entry(await cache.aget(cache_key))
+        if not entry:
+            return None
+        if entry_negative(entry):
+            return self._from_negative_entry(entry)
+        data, is_stale = unwrap_entry(entry)
+        if fresh_only and is_stale:
+            return None
+        return data
+
+    def _schedule_refresh(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str,
+                          fetch: Callable[[], Awaitable[Any]] = None) -> None:
+        """Refresh a stale cache entry in a background task, at most once per key at a time."""
+        # The set is shared with the sync client (see PROCESS_STATE), so guard it the same way
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        try:
+            task = asyncio.get_running_loop().create_task(self._refresh(endpoint, params, cache_key, fetch))
+        except RuntimeError as e:
+            logger.warning(f"Could not schedule background refresh for {endpoint}: {e}")
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+            return
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: str,
+                       fetch: Callable[[], Awaitable[Any]] = None) -> None:
+        """Background refresh of a stale entry, coordinated with other workers."""
+        try:
+            await self.async_single_flight.do(
+                cache_key,
+                fetch or (lambda: self._fetch(endpoint, params, cache_key, priority=PRIORITY_LOW)),
+                check=lambda: self._get_cached(cache_key, fresh_only=True),
+            )
+        except (QuotaExceededError, CircuitOpenError) as e:
+            self.cache_stats.incr('refresh_deferred', endpoint)
+            logger.info(f"Background refresh deferred for {endpoint}: {e}")
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {endpoint}: {e}")
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+
+    async def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]], cache_key: Optional[str],
+                     priority: str = None, project: bool = True) -> Dict[str, Any]:
+        """
+        Fetch a response from the upstream API and store it in the cache.
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit breaker is open
+            QuotaExceededError: If the quota governor defers the request
+            APIFootballError: If request fails or returns error
+        """
+        # Quota and breaker bookkeeping is thread-safe; don't queue behind Django's one sync thread
+        admit = sync_to_async(self._admit, thread_sensitive=False)
+        await admit(endpoint, priority or self._request_priority(endpoint, params))
+
+        started = time.monotonic()
+        try:
+            logger.info(f"Making async API request to {endpoint} with params: {params}")
+            response = await self._get_client().get(f"/{endpoint}", params=params)
+        except httpx.TimeoutException:
+            self.breaker.record_failure(endpoint)
+            self.cache_stats.incr('error_timeout', endpoint)
+            logger.error(f"Request timeout for {endpoint}")
+            raise APIFootballError("Request timeout")
+        except httpx.HTTPError as e:
+            self.breaker.record_failure(endpoint)
+            self.cache_stats.incr('error_connection', endpoint)
+            logger.error(f"Request failed for {endpoint}: {str(e)}")
+            raise APIFootballError(f"Request failed: {str(e)}")
+
+        await sync_to_async(self._record_outcome, thread_sensitive=False)(
+            endpoint, response.status_code, response.headers, time.monotonic() - started, len(response.content)
+        )
+
+        writes = []
+        try:
+            return self._handle_response(
+                endpoint, params, response.status_code, response.reason_phrase, response.json,
+                store=lambda entry, timeout: writes.append((entry, timeout)), project=project,
+            )
+        finally:
+            if cache_key is not None:
+                for entry, timeout in writes:
+                    await self._stamp_version(cache_key, entry)
+                    await cache.aset(cache_key, entry, timeout)
+                    await self._written(cache_key, timeout)
+
+    async def get_league_info(self, season: int = None) -> Dict[str, Any]:
+        """Get Allsvenskan league information (see APIFootballService.get_league_info)."""
+        season = season or self.current_season
+        params = {
+            'id': self.league_id,
+            'season': season
+        }
+
+        try:
+            data = await self._make_request('leagues', params)
+            if data['response']:
+                return data['response'][0]
+            return {}
+        except APIFootballError as e:
+            logger.error(f"Failed to get league info: {e}")
+            return {}
+
+    async def get_standings(self, season: int = None) -> List[Dict[str, Any]]:
+        """Get the current league table (see APIFootballService.get_standings)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season
+        }
+
+        local = await sync_to_async(self._read_local)(lambda store: store.get_standings(season))
+        if local is not None:
+            return local
+
+        try:
+            data = await self._make_request('standings', params)
+            if data['response'] and data['response'][0]['league']['standings']:
+                return data['response'][0]['league']['standings'][0]
+            return []
+        except APIFootballError as e:
+            logger.error(f"Failed to get standings: {e}")
+            return []
+
+    async def get_fixtures(self, season: int = None, status: str = None,
+                           team_id: int = None, last: int = None, next: int = None) -> List[Dict[str, Any]]:
+        """Get fixtures and results (see APIFootballService.get_fixtures)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season
+        }
+
+        if status:
+            params['status'] = status
+        if team_id:
+            params['team'] = team_id
+        if last:
+            params['last'] = last
+        if next:
+            params['next'] = next
+
+        local = await sync_to_async(self._read_local)(lambda store: store.get_fixtures(season, status, team_id, last, next))
+        if local is not None:
+            return local
+
+        try:
+            data = await self._make_request('fixtures', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get fixtures: {e}")
+            return []
+
+    async def get_live_fixtures(self) -> List[Dict[str, Any]]:
+        """Get currently live matches (see APIFootballService.get_live_fixtures)."""
+        params = {
+            'league': self.league_id,
+            'live': 'all'
+        }
+
+        try:
+            data = await self._make_request('fixtures', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get live fixtures: {e}")
+            return []
+
+    async def get_teams(self, season: int = None) -> List[Dict[str, Any]]:
+        """Get all teams for the season (see APIFootballService.get_teams)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season
+        }
+
+        local = await sync_to_async(self._read_local)(lambda store: store.get_teams(season))
+        if local is not None:
+            return local
+
+        try:
+            data = await self._make_request('teams', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get teams: {e}")
+            return []
+
+    async def get_top_scorers(self, season: int = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get top goalscorers (see APIFootballService.get_top_scorers)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season
+        }
+
+        local = await sync_to_async(self._read_local)(lambda store: store.get_top_scorers(season, limit))
+        if local is not None:
+            return local
+
+        try:
+            data = await self._make_request('players/topscorers', params)
+            scorers = data['response'] if data['response'] else []
+            return scorers[:limit]
+        except APIFootballError as e:
+            logger.error(f"Failed to get top scorers: {e}")
+            return []
+
+    async def get_top_assists(self, season: int = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get top assist providers (see APIFootballService.get_top_assists)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season
+        }
+
+        local = await sync_to_async(self._read_local)(lambda store: store.get_top_assists(season, limit))
+        if local is not None:
+            return local
+
+        try:
+            data = await self._make_request('players/topassists', params)
+            assists = data['response'] if data['response'] else []
+            return assists[:limit]
+        except APIFootballError as e:
+            logger.error(f"Failed to get top assists: {e}")
+            return []
+
+    async def get_team_statistics(self, team_id: int, season: int = None) -> Dict[str, Any]:
+        """Get statistics for a team (see APIFootballService.get_team_statistics)."""
+        season = season or self.current_season
+        params = {
+            'league': self.league_id,
+            'season': season,
+            'team': team_id
+        }
+
+        try:
+            data = await self._make_request('teams/statistics', params)
+            if data['response']:
+                return data['response']
+            return {}
+        except APIFootballError as e:
+            logger.error(f"Failed to get team statistics: {e}")
+            return {}
+
+    async def get_team_lineups(self, team_id: int, season: int = None) -> List[Dict[str, Any]]:
+        """Get most used formations for a team (see APIFootballService.get_team_lineups)."""
+        season = season or self.current_season
+
+        fixtures = await self.get_fixtures(team_id=team_id, season=season)
+        details = await self.get_fixture_details(self._played_fixture_ids(fixtures))
+
+        return self._formation_usage(self._count_formations(details.values(), team_id))
+
+    async def get_fixture_details(self, fixture_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get fixture details for many fixtures (see
+        APIFootballService.get_fixture_details). Batches are fetched
+        concurrently.
+        """
+        keys = self._fixture_detail_keys(fixture_ids)
+        if not keys:
+            return {}
+        self._track_unversioned('fixture_details')
+
+        details, missing = self._split_cached_details(keys, await cache.aget_many(list(keys.values())))
+
+        batches = self._fixture_batches(missing)
+        responses = await asyncio.gather(
+            *(self._make_request('fixtures', {'ids': '-'.join(str(fixture_id) for fixture_id in batch)},
+                                 use_cache=False)
+              for batch in batches),
+            return_exceptions=True,
+        )
+
+        for batch, data in zip(batches, responses):
+            if isinstance(data, Exception):
+                logger.error(f"Failed to get fixture details for {batch}: {data}")
+                continue
+            fetched, entries = self._fixture_detail_entries(keys, data.get('response') or [])
+            details.update(fetched)
+            for timeout, batch_entries in entries.items():
+                await cache.aset_many(batch_entries, timeout)
+
+        return details
+
+    async def get_h2h_matches(self, team1_id: int, team2_id: int, last: int = 10) -> List[Dict[str, Any]]:
+        """Get head-to-head matches (see APIFootballService.get_h2h_matches)."""
+        params = {
+            'h2h': f"{team1_id}-{team2_id}",
+            'last': last
+        }
+
+        try:
+            data = await self._make_request('fixtures/headtohead', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get H2H matches: {e}")
+            return []
+
+    async def get_player_statistics(self, player_id: int, season: int = None) -> Dict[str, Any]:
+        """Get statistics for a player (see APIFootballService.get_player_statistics)."""
+        season = season or self.current_season
+        params = {
+            'id': player_id,
+            'season': season
+        }
+
+        try:
+            data = await self._make_request('players', params)
+            if data['response'] and len(data['response']) > 0:
+                return data['response'][0]
+            return {}
+        except APIFootballError as e:
+            logger.error(f"Failed to get player statistics: {e}")
+            return {}
+
+    async def get_player_transfers(self, player_id: int) -> List[Dict[str, Any]]:
+        """Get transfer history for a player (see APIFootballService.get_player_transfers)."""
+        params = {
+            'player': player_id
+        }
+
+        try:
+            data = await self._make_request('transfers', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get player transfers: {e}")
+            return []
+
+    async def get_team_squad(self, team_id: int, season: int = None) -> List[Dict[str, Any]]:
+        """Get all squad players for a team (see APIFootballService.get_team_squad)."""
+        try:
+            return await self._load_team_squad(team_id, season or self.current_season)
+        except APIFootballError as e:
+            logger.error(f"Failed to get team squad: {e}")
+            return []
+
+    async def _load_team_squad(self, team_id: int, season: int) -> List[Dict[str, Any]]:
+        """Load a team's squad players; raises APIFootballError if it could not be loaded."""
+        local = await sync_to_async(self._read_local)(lambda store: store.get_team_squad(team_id, season))
+        if local is not None:
+            return local
+
+        data = await self._make_request('players/squads', {'team': team_id})
+        if data['response'] and len(data['response']) > 0:
+            return data['response'][0].get('players', [])
+        return []
+
+    async def get_all_league_players(self, season: int = None) -> List[Dict[str, Any]]:
+        """
+        Get all players from all teams in the league.
+
+        Squads are fetched concurrently; see
+        APIFootballService.get_all_league_players for the result format.
+        """
+        players, _ = await self._load_league_players(season or self.current_season)
+        return players
+
+    async def _load_league_players(self, season: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Load and format every squad of the league (see APIFootballService._load_league_players)."""
+        all_players = []
+
+        try:
+            teams = await self.get_teams(season)
+            logger.info(f"Found {len(teams)} teams in Allsvenskan")
+
+            team_infos = [
+                team_data.get('team', {}) for team_data in teams
+                if team_data.get('team', {}).get('id')
+            ]
+            squads = await asyncio.gather(
+                *(self._load_team_squad(team_info['id'], season) for team_info in team_infos),
+                return_exceptions=True,
+            )
+
+            complete = bool(team_infos)
+            for team_info, squad_players in zip(team_infos, squads):
+                if isinstance(squad_players, Exception):
+                    logger.warning(f"Failed to get squad for team {team_info.get('name', 'Unknown')}: {squad_players}")
+                    complete = False
+                    continue
+                for player in squad_players:
+                    if player.get('id'):
+                        all_players.append(self._format_league_player(player, team_info))
+
+            logger.info(f"Successfully collected {len(all_players)} total players from all teams")
+            return all_players, complete
+
+        except APIFootballError as e:
+            logger.error(f"Failed to get all league players: {e}")
+            return [], False
+        except Exception as e:
+            logger.error(f"Unexpected error getting all league players: {e}")
+            return [], False
+
+    async def get_league_roster(self, season: int = None) -> Dict[str, Any]:
+        """Get the materialized league roster (see APIFootballService.get_league_roster)."""
+        season = season or self.current_season
+        params = {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}
+        cache_key = make_cache_key('league/roster', params)
+
+        entry = await self._read_tiered(cache_key, 'league/roster')
+        if entry:
+            roster, is_stale = unwrap_entry(entry)
+            if not is_stale:
+                self._count_lookup('hit', 'league/roster')
+                await self._track_version(cache_key, entry)
+                return roster
+
+            self._count_lookup('stale_hit', 'league/roster')
+            self._schedule_refresh(
+                'league/roster', params, cache_key,
+                fetch=lambda: self._build_league_roster(season, params, cache_key),
+            )
+            await self._track_version(cache_key, entry)
+            return roster
+
+        self._count_lookup('miss', 'league/roster')
+        roster = await self.async_single_flight.do(
+            cache_key,
+            lambda: self._build_league_roster(season, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        await self._track_version(cache_key)
+        return roster
+
+    async def _build_league_roster(self, season: int, params: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Build the league roster and store it in the cache."""
+        players, complete = await self._load_league_players(season)
+        roster = build_league_roster(players, season, complete=complete)
+        if not players:
+            return roster
+
+        ttl, grace = self._roster_lifetime(params, complete)
+        entry = wrap_entry(roster, ttl, grace, digest=roster['version'])
+        await self._stamp_version(cache_key, entry)
+        await cache.aset(cache_key, entry, entry_timeout(ttl, grace))
+        await self._written(cache_key, entry_timeout(ttl, grace))
+        await self._store_player_slugs(season, roster, ttl, grace)
+        logger.info(
+            f"Built league roster for {season}: {len(players)} players, version {roster['version']}"
+            f"{'' if complete else ' (incomplete)'}"
+        )
+        return roster
+
+    async def get_league_player_stats(self, season: int = None) -> List[Dict[str, Any]]:
+        """Get the league statistics of every player (see APIFootballService.get_league_player_stats)."""
+        players, _ = await self._load_league_player_stats(season or self.current_season)
+        return players
+
+    async def _load_league_player_stats(self, season: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Load every page of the league's player statistics (see APIFootballService._load_league_player_stats)."""
+        local = await sync_to_async(self._read_local)(lambda store: store.get_league_player_stats(season))
+        if local is not None:
+            return local, True
+
+        params = {'league': self.league_id, 'season': season}
+        try:
+            first = await self._make_request('players', {**params, 'page': 1})
+        except APIFootballError as e:
+            logger.error(f"Failed to get league player statistics: {e}")
+            return [], False
+
+        players = list(first.get('response') or [])
+        total_pages = (first.get('paging') or {}).get('total') or 1
+        pages = await asyncio.gather(
+            *(self._make_request('players', {**params, 'page': page}) for page in range(2, total_pages + 1)),
+            return_exceptions=True,
+        )
+
+        complete = True
+        for page, data in enumerate(pages, start=2):
+            if isinstance(data, Exception):
+                logger.warning(f"Failed to get page {page} of the league player statistics: {data}")
+                complete = False
+                continue
+            players.extend(data.get('response') or [])
+        return players, complete
+
+    async def _load_leaderboard_fixtures(self, season: int) -> List[Dict[str, Any]]:
+        """Get the season's fixtures, with lineups for those that have been played."""
+        fixtures = await self.get_fixtures(season)
+        details = await self.get_fixture_details(self._played_fixture_ids(fixtures))
+        return [details.get(fixture.get('fixture', {}).get('id'), fixture) for fixture in fixtures]
+
+    async def get_leaderboards(self, season: int = None, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """Get every precomputed player leaderboard (see APIFootballService.get_leaderboards)."""
+        season = season or self.current_season
+        params = {'league': self.league_id, 'season': season, 'format': LEADERBOARDS_FORMAT}
+        cache_key = make_cache_key('league/leaderboards', params)
+
+        if self.data_versions is not None and _warming.get() is None:
+            version = await self.data_versions.aget(cache_key)
+            kept = self.leaderboard_memo.get(cache_key, version.digest if version else None)
+            if kept is not None:
+                self._count_lookup('hit', 'league/leaderboards')
+                await self._track_version(cache_key)
+                return kept
+
+        entry = await self._read_tiered(cache_key, 'league/leaderboards')
+        if entry:
+            leaderboards, is_stale = unwrap_entry(entry)
+            if not is_stale:
+                self._count_lookup('hit', 'league/leaderboards')
+                self.leaderboard_memo.put(cache_key, entry.get('digest'), entry['soft_expires'], leaderboards)
+                await self._track_version(cache_key, entry)
+                return leaderboards
+
+            self._count_lookup('stale_hit', 'league/leaderboards')
+            self._schedule_refresh(
+                'league/leaderboards', params, cache_key,
+                fetch=lambda: self._build_leaderboards(season, params, cache_key),
+            )
+            await self._track_version(cache_key, entry)
+            return leaderboards
+
+        self._count_lookup('miss', 'league/leaderboards')
+        if not wait:
+            self._schedule_refresh(
+                'league/leaderboards', params, cache_key,
+                fetch=lambda: self._build_leaderboards(season, params, cache_key),
+            )
+            return None
+        leaderboards = await self.async_single_flight.do(
+            cache_key,
+            lambda: self._build_leaderboards(season, params, cache_key),
+            check=lambda: self._get_cached(cache_key),
+        )
+        await self._track_version(cache_key)
+        return leaderboards
+
+    async def _build_leaderboards(self, season: int, params: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Compute the leaderboards and store them in the cache."""
+        player_stats, complete = await self._load_league_player_stats(season)
+        fixtures = await self._load_leaderboard_fixtures(season) if player_stats else []
+        leaderboards = build_leaderboards(player_stats, fixtures, self.league_id, season, complete=complete)
+        if not player_stats:
+            return leaderboards
+
+        entry, timeout = self._leaderboards_entry(params, leaderboards)
+        await self._stamp_version(cache_key, entry)
+        await cache.aset(cache_key, entry, timeout)
+        await self._written(cache_key, timeout)
+        self.leaderboard_memo.put(cache_key, leaderboards['version'], entry['soft_expires'], leaderboards)
+        logger.info(
+            f"Built leaderboards for {season}: {len(leaderboards['players'])} players, "
+            f"version {leaderboards['version']}{'' if complete else ' (incomplete)'}"
+        )
+        return leaderboards
+
+    async def get_leaderboard(self, name: str, season: int = None, limit: int = 10,
+                              wait: bool = True) -> List[Dict[str, Any]]:
+        """Get the top of one player leaderboard (see APIFootballService.get_leaderboard)."""
+        leaderboards = await self.get_leaderboards(season, wait=wait)
+        if leaderboards is None:
+            return []
+        return leaderboard(leaderboards, name, limit)
+
+    async def get_player_index(self, season: int = None) -> PlayerIndex:
+        """Get the faceted index of every player in the league (see APIFootballService.get_player_index)."""
+        season = season or self.current_season
+        roster_params = {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}
+        roster_key = make_cache_key('league/roster', roster_params)
+
+        try:
+            leaderboards = await self.get_leaderboards(season, wait=False)
+        except APIFootballError as e:
+            logger.warning(f"Building the player index without league totals: {e}")
+            leaderboards = None
+
+        if self.data_versions is not None and _warming.get() is None:
+            version = await self.data_versions.aget(roster_key)
+            digest = f"{version.digest}:{(leaderboards or {}).get('version')}" if version else None
+            kept = self.player_index_memo.get(roster_key, digest)
+            if kept is not None:
+                self._count_lookup('hit', 'league/roster')
+                await self._track_version(roster_key)
+                return kept
+
+        roster = await self.get_league_roster(season)
+        return self._keep_player_index(roster_params, roster_key, roster, leaderboards)
+
+    async def _store_player_slugs(self, season: int, roster: Dict[str, Any], ttl: int, grace: int) -> None:
+        """Write the slug index of a freshly built roster (see APIFootballService._store_player_slugs)."""
+        key = self._player_slugs_key(season)
+        records = roster_slug_index(roster)
+        entry = wrap_entry(records, ttl, grace, digest=roster['version'])
+        await self._stamp_version(key, entry)
+        await cache.aset(key, entry, entry_timeout(ttl, grace))
+        self.player_slug_memo.put(key, roster['version'], entry['soft_expires'], records)
+
+    async def get_player_slug_index(self, season: int = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get the slug index of the league roster (see APIFootballService.get_player_slug_index)."""
+        season = season or self.current_season
+        key = self._player_slugs_key(season)
+
+        if self.data_versions is not None:
+            version = await self.data_versions.aget(key)
+            kept = self.player_slug_memo.get(key, version.digest if version else None)
+            if kept is not None:
+                return kept
+
+        entry = read_entry(await cache.aget(key))
+        if not entry:
+            return None
+        records, _ = unwrap_entry(entry)
+        if entry.get('digest'):
+            self.player_slug_memo.put(key, entry['digest'], entry['soft_expires'], records)
+        return records
+
+    async def get_player_by_slug(self, slug: str, season: int = None) -> Optional[Dict[str, Any]]:
+        """Look up a league player by the slug of their name (see APIFootballService.get_player_by_slug)."""
+        season = season or self.current_season
+        self._track_unversioned('league/player_slug')
+
+        index = await self.get_player_slug_index(season)
+        if index is not None:
+            record = index.get(slug)
+            self._count_lookup('hit' if record is not None else 'negative_hit', 'league/player_slug')
+            return record
+
+        unknown_key = self._unknown_slug_key(season, slug)
+        if entry_negative(read_entry(await cache.aget(unknown_key))):
+            self._count_lookup('negative_hit', 'league/player_slug')
+            return None
+
+        self._count_lookup('miss', 'league/player_slug')
+        roster = await self.get_league_roster(season)
+        if roster['players']:
+            # Put the index back, so the next lookups don't read the roster again
+            ttl, grace = self._roster_lifetime(
+                {'league': self.league_id, 'season': season, 'format': ROSTER_FORMAT}, roster['complete']
+            )
+            await self._store_player_slugs(season, roster, ttl, grace)
+        record = roster_slug_record(roster, slug)
+        if record is None and roster['players'] and self.negative_ttl > 0:
+            await cache.aset(unknown_key, wrap_entry(None, self.negative_ttl, negative=NEGATIVE_EMPTY),
+                             self.negative_ttl)
+        return record
+
+    async def get_team_coaches(self, team_id: int, season: int = None) -> List[Dict[str, Any]]:
+        """Get coaching staff for a team (see APIFootballService.get_team_coaches)."""
+        season = season or self.current_season
+        params = {
+            'team': team_id,
+            'season': season
+        }
+
+        try:
+            data = await self._make_request('coachs', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to get team coaches: {e}")
+            return []
+
+    async def get_coach_details(self, coach_id: int) -> Dict[str, Any]:
+        """Get details for a coach (see APIFootballService.get_coach_details)."""
+        params = {
+            'id': coach_id
+        }
+
+        try:
+            data = await self._make_request('coachs', params)
+            if data['response'] and len(data['response']) > 0:
+                return data['response'][0]
+            return {}
+        except APIFootballError as e:
+            logger.error(f"Failed to get coach details: {e}")
+            return {}
+
+    async def get_venue_details(self, venue_id: int) -> Dict[str, Any]:
+        """Get details for a venue (see APIFootballService.get_venue_details)."""
+        params = {
+            'id': venue_id
+        }
+
+        try:
+            data = await self._make_request('venues', params)
+            if data['response'] and len(data['response']) > 0:
+                return data['response'][0]
+            return {}
+        except APIFootballError as e:
+            logger.error(f"Failed to get venue details: {e}")
+            return {}
+
+    async def search_venues(self, name: str = None, city: str = None, country: str = None) -> List[Dict[str, Any]]:
+        """Search for venues (see APIFootballService.search_venues)."""
+        params = {}
+        if name:
+            params['search'] = name
+        if city:
+            params['city'] = city
+        if country:
+            params['country'] = country
+
+        try:
+            data = await self._make_request('venues', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to search venues: {e}")
+            return []
+
+    async def search_players(self, name: str, league_id: int = None, season: int = None) -> List[Dict[str, Any]]:
+        """Search for players by name (see APIFootballService.search_players)."""
+        season = season or self.current_season
+        league_id = league_id or self.league_id
+
+        params = {
+            'search': name,
+            'league': league_id,
+            'season': season
+        }
+
+        try:
+            data = await self._make_request('players', params)
+            return data['response'] if data['response'] else []
+        except APIFootballError as e:
+            logger.error(f"Failed to search players: {e}")
+            return []
+
+
+# Singleton instance
+async_api_football_service = AsyncAPIFootballService(shared=api_football_service)
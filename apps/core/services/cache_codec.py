@@ -0,0 +1,190 @@
+"""
+Pluggable serialization and compression for cached API-Football payloads.
+
+By default Django pickles whatever is cached. For the client's large
+entries (a season of fixtures, the league roster) a compact serialization
+plus compression above a size threshold stores far fewer bytes in Redis and
+moves far fewer over the network on each hit.
+
+The payload of each cache entry is encoded to bytes by a codec, and the
+codec's tag (e.g. ``'json+zlib'``) is stored in the entry next to it.
+Entries are decoded with the codec they were written with, so the
+configured codec can change at any time without flushing the cache.
+
+Serializers: ``pickle``, ``json`` (standard library) and ``msgpack``
+(optional ``msgpack`` package). Compressors: ``zlib`` (standard library)
+and ``zstd`` (optional ``zstandard`` package). A codec configured with a
+missing optional package falls back to ``pickle``/``zlib`` with a warning.
+Payloads must be JSON-compatible (string keys) for ``json``.
+
+The default, ``pickle`` compressed with ``zlib`` from 4 KB, was the fastest
+and smallest combination available without extra packages in
+``manage.py benchmark_cache_codec``; the standard library's JSON encoder is
+slower than pickle in both directions. Run the benchmark again to choose
+between ``msgpack``/``zstd`` and the default once they are installed.
+"""
+
+import json
+import logging
+import pickle
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from decouple import config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+NO_COMPRESSION = 'none'
+
+
+def _json_dumps(data: Any) -> bytes:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(blob: bytes) -> Any:
+    return json.loads(blob)
+
+
+def _msgpack_dumps(data: Any) -> bytes:
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def _msgpack_loads(blob: bytes) -> Any:
+    return msgpack.unpackb(blob, raw=False, strict_map_key=False)
+
+
+def _pickle_dumps(data: Any) -> bytes:
+    return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+
+SERIALIZERS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    'pickle': (_pickle_dumps, pickle.loads),
+    'json': (_json_dumps, _json_loads),
+}
+if msgpack is not None:
+    SERIALIZERS['msgpack'] = (_msgpack_dumps, _msgpack_loads)
+
+
+def _zlib_compressor(level: int) -> Callable[[bytes], bytes]:
+    return lambda blob: zlib.compress(blob, level)
+
+
+def _zstd_compressor(level: int) -> Callable[[bytes], bytes]:
+    # Compressor objects must not be shared between threads
+    local = threading.local()
+
+    def compress(blob: bytes) -> bytes:
+        compressor = getattr(local, 'compressor', None)
+        if compressor is None:
+            compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+        return compressor.compress(blob)
+
+    return compress
+
+
+def _zstd_decompress(blob: bytes) -> bytes:
+    return zstandard.decompress(blob)
+
+
+# name: (compressor factory taking a level, decompress, default level)
+COMPRESSORS: Dict[str, Tuple[Callable[[int], Callable[[bytes], bytes]], Callable[[bytes], bytes], int]] = {
+    'zlib': (_zlib_compressor, zlib.decompress, 6),
+}
+if zstandard is not None:
+    COMPRESSORS['zstd'] = (_zstd_compressor, _zstd_decompress, 3)
+
+
+class CacheCodec:
+    """
+    Encodes payloads to tagged bytes and decodes them by tag.
+    """
+
+    def __init__(self, serializer: str = 'pickle', compression: str = 'zlib',
+                 threshold: int = 4096, level: Optional[int] = None):
+        """
+        Args:
+            serializer: 'pickle', 'json' or 'msgpack'
+            compression: 'zlib', 'zstd' or 'none'
+            threshold: Encoded size in bytes from which payloads are compressed
+            level: Compression level (defaults to the compressor's own default)
+        """
+        if serializer not in SERIALIZERS:
+            if serializer != 'msgpack':
+                raise ValueError(f"Unknown cache serializer: {serializer}")
+            logger.warning("msgpack is not installed, using the pickle cache serializer")
+            serializer = 'pickle'
+        if compression not in COMPRESSORS and compression != NO_COMPRESSION:
+            if compression != 'zstd':
+                raise ValueError(f"Unknown cache compression: {compression}")
+            logger.warning("zstandard is not installed, using zlib cache compression")
+            compression = 'zlib'
+
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+        self._dumps = SERIALIZERS[serializer][0]
+        self._compress = None
+        if compression != NO_COMPRESSION:
+            factory, _, default_level = COMPRESSORS[compression]
+            self._compress = factory(default_level if level is None else level)
+
+    @classmethod
+    def from_settings(cls) -> 'CacheCodec':
+        """Build the codec configured by the API_FOOTBALL_CACHE_* settings."""
+        level = config('API_FOOTBALL_CACHE_COMPRESS_LEVEL', default='')
+        return cls(
+            serializer=config('API_FOOTBALL_CACHE_SERIALIZER', default='pickle'),
+            compression=config('API_FOOTBALL_CACHE_COMPRESSION', default='zlib'),
+            threshold=config('API_FOOTBALL_CACHE_COMPRESS_THRESHOLD', default=4096, cast=int),
+            level=int(level) if level else None,
+        )
+
+    def encode(self, data: Any) -> Tuple[str, bytes]:
+        """
+        Encode a payload.
+
+        Returns:
+            Tuple of (codec tag, encoded bytes)
+        """
+        blob = self._dumps(data)
+        if self._compress is not None and len(blob) >= self.threshold:
+            return f"{self.serializer}+{self.compression}", self._compress(blob)
+        return self.serializer, blob
+
+
+def decode(tag: str, blob: bytes) -> Any:
+    """
+    Decode bytes written by any codec.
+
+    Args:
+        tag: Codec tag stored with the entry
+        blob: Encoded bytes
+
+    Returns:
+        The decoded payload
+
+    Raises:
+        ValueError: If the tag names a codec that isn't available
+    """
+    serializer, _, compression = tag.partition('+')
+    if compression:
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Cache compression {compression} is not available")
+        blob = COMPRESSORS[compression][1](blob)
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Cache serializer {serializer} is not available")
+    return SERIALIZERS[serializer][1](blob)
+
+
+default_codec = CacheCodec.from_settings()
@@ -0,0 +1,135 @@
+"""
+Cache entry envelope with soft and hard expiry times.
+
+Entries are stored with the cache backend's own timeout set to the hard
+expiry. Between the soft and the hard expiry the payload is *stale*: it may
+still be served while a background refresh replaces it.
+
+The payload is stored encoded by a cache codec (see ``cache_codec``) and
+tagged with it; values read from the cache go through ``read_entry`` to
+decode it before they are unwrapped. Entries may also carry the digest and
+version of their content (see ``data_version``).
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .cache_codec import CacheCodec, decode, default_codec
+from .data_version import DataVersion
+
+logger = logging.getLogger(__name__)
+
+ENTRY_MARKER = '__api_football_entry__'
+
+# Kinds of negative entries
+NEGATIVE_EMPTY = 'empty'
+NEGATIVE_ERROR = 'error'
+
+
+def wrap_entry(data: Any, ttl: int, stale_grace: int = 0,
+               now: Optional[float] = None, negative: Optional[str] = None,
+               codec: Optional[CacheCodec] = None, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Wrap a payload with its expiry times.
+
+    Args:
+        data: Payload to cache
+        ttl: Seconds until the entry becomes stale (soft expiry)
+        stale_grace: Extra seconds the stale entry may still be served
+        now: Current timestamp (defaults to time.time())
+        negative: NEGATIVE_EMPTY or NEGATIVE_ERROR for negative entries
+        codec: Codec encoding the payload (defaults to the configured codec)
+        digest: Content digest of the payload (see data_version.content_digest)
+
+    Returns:
+        Envelope dict ready to be stored in the cache
+    """
+    now = time.time() if now is None else now
+    tag, blob = (codec or default_codec).encode(data)
+    entry = {
+        ENTRY_MARKER: 1,
+        'codec': tag,
+        'data': blob,
+        'soft_expires': now + ttl,
+        'hard_expires': now + ttl + stale_grace,
+    }
+    if negative:
+        entry['negative'] = negative
+    if digest:
+        entry['digest'] = digest
+    return entry
+
+
+def read_entry(value: Any) -> Any:
+    """
+    Decode the payload of a value read from the cache.
+
+    Args:
+        value: Value returned by the cache backend
+
+    Returns:
+        The entry with its payload decoded, the value unchanged if it isn't
+        an encoded entry, or None (a miss) if it can't be decoded
+    """
+    if not isinstance(value, dict) or 'codec' not in value or ENTRY_MARKER not in value:
+        return value
+    entry = dict(value)
+    try:
+        entry['data'] = decode(entry.pop('codec'), entry['data'])
+    except Exception as e:
+        logger.warning(f"Could not decode cache entry, treating it as a miss: {e}")
+        return None
+    return entry
+
+
+def unwrap_entry(entry: Any, now: Optional[float] = None) -> Tuple[Any, bool]:
+    """
+    Unwrap a cached entry decoded by read_entry.
+
+    Entries written before envelopes existed are returned as fresh.
+
+    Args:
+        entry: Value read from the cache
+        now: Current timestamp (defaults to time.time())
+
+    Returns:
+        Tuple of (payload, is_stale)
+    """
+    if not isinstance(entry, dict) or ENTRY_MARKER not in entry:
+        return entry, False
+    now = time.time() if now is None else now
+    return entry['data'], now >= entry['soft_expires']
+
+
+def entry_expires_in(entry: Any, now: Optional[float] = None) -> float:
+    """
+    Get the seconds until an entry's soft expiry.
+
+    Returns:
+        Seconds until the entry becomes stale (negative once it is), or
+        infinity for entries written before envelopes existed
+    """
+    if not isinstance(entry, dict) or ENTRY_MARKER not in entry:
+        return float('inf')
+    now = time.time() if now is None else now
+    return entry['soft_expires'] - now
+
+
+def entry_data_version(entry: Any) -> Optional[DataVersion]:
+    """Get the content version stamped on a cached entry, or None if it has none."""
+    if isinstance(entry, dict) and ENTRY_MARKER in entry and entry.get('data_version') and entry.get('digest'):
+        return DataVersion(entry['data_version'], entry['digest'])
+    return None
+
+
+def entry_timeout(ttl: int, stale_grace: int = 0) -> int:
+    """Get the backend timeout for an entry: its hard expiry in seconds."""
+    return ttl + stale_grace
+
+
+def entry_negative(entry: Any) -> Optional[str]:
+    """Get the negative kind of a cached entry, or None for positive entries."""
+    if isinstance(entry, dict) and ENTRY_MARKER in entry:
+        return entry.get('negative')
+    return None
@@ -0,0 +1,84 @@
+"""
+Deterministic cache keys for API-Football responses.
+
+Keys are built from a stable digest of the endpoint and its normalized
+query parameters, so every worker process (and every restart) computes the
+same key for the same upstream request and shares hits in Redis.
+
+Key format::
+
+    api_football:v<version>:<endpoint>:<fingerprint>
+
+Migration from the old ``api_football_<endpoint>_<hash()>`` keys needs no
+flush: those keys were salted per process, are never read again and expire
+on their own within their original TTL (30 minutes at most). Bumping
+``API_FOOTBALL_CACHE_VERSION`` invalidates every entry written under the
+previous scheme version in the same way.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from decouple import config
+
+CACHE_NAMESPACE = 'api_football'
+CACHE_KEY_VERSION = config('API_FOOTBALL_CACHE_VERSION', default=2, cast=int)
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Normalize query parameters into their on-the-wire form.
+
+    ``None`` values are dropped (requests never sends them) and every value
+    is converted to a string, so ``{'season': 2025}`` and
+    ``{'season': '2025'}`` produce the same fingerprint.
+
+    Args:
+        params: Query parameters
+
+    Returns:
+        Parameters with sorted keys and string values
+    """
+    return {
+        str(key): str(value)
+        for key, value in sorted((params or {}).items(), key=lambda item: str(item[0]))
+        if value is not None
+    }
+
+
+def request_fingerprint(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Get a stable digest identifying an upstream request.
+
+    Args:
+        endpoint: API endpoint path
+        params: Query parameters
+
+    Returns:
+        Hex digest that is identical across processes and restarts
+    """
+    canonical = json.dumps(
+        {'endpoint': endpoint.strip('/'), 'params': normalize_params(params)},
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                   version: int = None) -> str:
+    """
+    Build the namespaced, versioned cache key for an upstream request.
+
+    Args:
+        endpoint: API endpoint path
+        params: Query parameters
+        version: Key scheme version (defaults to API_FOOTBALL_CACHE_VERSION)
+
+    Returns:
+        Cache key safe for Redis, Memcached and local-memory backends
+    """
+    version = version or CACHE_KEY_VERSION
+    endpoint = endpoint.strip('/')
+    return f"{CACHE_NAMESPACE}:v{version}:{endpoint}:{request_fingerprint(endpoint, params)}"
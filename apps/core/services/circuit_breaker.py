@@ -0,0 +1,153 @@
+"""
+Per-endpoint circuit breaker for upstream calls.
+
+When the upstream is down or very slow, every request would otherwise wait
+for the full timeout. After ``failure_threshold`` consecutive failures (or
+calls slower than ``slow_call_threshold``) an endpoint's circuit opens and
+calls fail fast, so callers fall back to cached data immediately. After
+``recovery_timeout`` seconds the circuit is half-open: a limited number of
+probe calls are let through, and their outcome closes or re-opens it.
+
+State is kept per process; each worker detects an outage after a handful
+of its own failed calls.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker keyed by endpoint.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 slow_call_threshold: Optional[float] = None, half_open_max_calls: int = 1,
+                 on_state_change: Optional[Callable[[str, str, str], None]] = None):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds an open circuit waits before probing
+            slow_call_threshold: Seconds after which a successful call still
+                counts as a failure (None to disable)
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+            on_state_change: Called with (endpoint, old_state, new_state)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def _transition(self, endpoint: str, circuit: _Circuit, state: str) -> Optional[Tuple[str, str, str]]:
+        """Change state under the lock; returns the change to report outside it."""
+        if circuit.state == state:
+            return None
+        old_state, circuit.state = circuit.state, state
+        circuit.probes = 0
+        if state == OPEN:
+            circuit.opened_at = time.monotonic()
+        if state == CLOSED:
+            circuit.failures = 0
+        return endpoint, old_state, state
+
+    def _report(self, change: Optional[Tuple[str, str, str]]) -> None:
+        if change is None:
+            return
+        endpoint, old_state, new_state = change
+        log = logger.warning if new_state == OPEN else logger.info
+        log(f"Circuit for {endpoint} changed from {old_state} to {new_state}")
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(endpoint, old_state, new_state)
+            except Exception as e:
+                logger.debug(f"Circuit state change callback failed: {e}")
+
+    def allow(self, endpoint: str) -> bool:
+        """
+        Check whether a call to ``endpoint`` may be made now.
+
+        Every allowed call must be followed by record_success,
+        record_failure or release.
+        """
+        change = None
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == OPEN:
+                if time.monotonic() - circuit.opened_at < self.recovery_timeout:
+                    return False
+                change = self._transition(endpoint, circuit, HALF_OPEN)
+            if circuit.state == HALF_OPEN:
+                allowed = circuit.probes < self.half_open_max_calls
+                if allowed:
+                    circuit.probes += 1
+            else:
+                allowed = True
+        self._report(change)
+        return allowed
+
+    def release(self, endpoint: str) -> None:
+        """Return an allowed call that was never made."""
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    def record_success(self, endpoint: str, elapsed: float = 0.0) -> None:
+        """Record a completed call; slow calls count as failures."""
+        if self.slow_call_threshold is not None and elapsed > self.slow_call_threshold:
+            logger.warning(f"Slow upstream call to {endpoint} ({elapsed:.1f}s)")
+            self.record_failure(endpoint)
+            return
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures = 0
+            change = self._transition(endpoint, circuit, CLOSED)
+        self._report(change)
+
+    def record_failure(self, endpoint: str) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        change = None
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                change = self._transition(endpoint, circuit, OPEN)
+                # Re-opening restarts the recovery timeout
+                circuit.opened_at = time.monotonic()
+        self._report(change)
+
+    def state(self, endpoint: str) -> str:
+        """Get the current state of an endpoint's circuit."""
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            return circuit.state if circuit else CLOSED
+
+    def states(self) -> Dict[str, str]:
+        """Get the state of every endpoint seen so far."""
+        with self._lock:
+            return {endpoint: circuit.state for endpoint, circuit in self._circuits.items()}
@@ -0,0 +1,238 @@
+"""
+Content versions of cached API-Football datasets.
+
+A refresh that returns the same standings as before still rewrites the
+cache entry, so nothing downstream can tell whether the content changed
+and rendered output has to expire on a timer. Each dataset (one cached
+request, identified by its cache key) therefore gets:
+
+* a digest of its content as cached, after projection, and
+* a version number that increases by one each time the digest changes,
+  and only then.
+
+The version record is stored in the shared cache next to the entry without
+a timeout, so it outlives the entry: an entry that expires and is fetched
+again with the same content keeps its version. The version and digest are
+also stored in the entry itself, so readers get them with the payload
+without another round trip.
+
+Callers key off versions in two ways:
+
+* ``DataVersions.get`` for one dataset, e.g. as part of a fragment cache key
+  (``{% cache None 'standings' version.version %}``) that stays valid until
+  the content changes;
+* ``VersionSet`` for everything read inside
+  ``APIFootballService.tracking_versions()``, e.g. as an ETag.
+
+Writes of one dataset are coordinated by single-flight, so workers don't
+bump the same version concurrently. Versions restart at 1 when the shared
+cache is flushed; anything that outlives the cache, such as an ETag held
+by a browser, should include the digest as well (``VersionSet`` does).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersion(NamedTuple):
+    version: int
+    digest: str
+
+
+def content_digest(data: Any) -> str:
+    """
+    Get a stable digest of JSON-compatible content.
+
+    Args:
+        data: Payload to digest
+
+    Returns:
+        Hex digest that only changes when the content changes
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+class DataVersions:
+    """
+    Per-dataset version records in the shared cache.
+    """
+
+    def __init__(self, suffix: str = ':data_version'):
+        """
+        Args:
+            suffix: Suffix of a dataset's version key in the shared cache
+        """
+        self.suffix = suffix
+
+    def key(self, dataset: str) -> str:
+        """Shared cache key holding a dataset's version record."""
+        return f"{dataset}{self.suffix}"
+
+    @staticmethod
+    def _from_record(record: Any) -> Optional[DataVersion]:
+        if isinstance(record, dict) and 'version' in record and 'digest' in record:
+            return DataVersion(record['version'], record['digest'])
+        return None
+
+    def get(self, dataset: str) -> Optional[DataVersion]:
+        """
+        Get the current version of a dataset.
+
+        Args:
+            dataset: Cache key of the dataset
+
+        Returns:
+            The version, or None if the dataset was never stamped
+        """
+        try:
+            return self._from_record(cache.get(self.key(dataset)))
+        except Exception as e:
+            logger.debug(f"Could not read data version of {dataset}: {e}")
+            return None
+
+    async def aget(self, dataset: str) -> Optional[DataVersion]:
+        """Get the current version of a dataset (async)."""
+        try:
+            return self._from_record(await cache.aget(self.key(dataset)))
+        except Exception as e:
+            logger.debug(f"Could not read data version of {dataset}: {e}")
+            return None
+
+    def stamp(self, dataset: str, digest: str, now: float = None) -> Optional[DataVersion]:
+        """
+        Record the digest of content just written, bumping the version if it changed.
+
+        Args:
+            dataset: Cache key of the dataset
+            digest: Digest of the written content (see content_digest)
+            now: Current timestamp (defaults to time.time())
+
+        Returns:
+            The dataset's version after the write, or None if the version
+            record is unavailable
+        """
+        try:
+            record = cache.get(self.key(dataset))
+            current, record = self._next(record, digest, now)
+            if record is not None:
+                cache.set(self.key(dataset), record, None)
+            return current
+        except Exception as e:
+            logger.debug(f"Could not stamp data version of {dataset}: {e}")
+            return None
+
+    async def astamp(self, dataset: str, digest: str, now: float = None) -> Optional[DataVersion]:
+        """Record the digest of content just written (async, see stamp)."""
+        try:
+            record = await cache.aget(self.key(dataset))
+            current, record = self._next(record, digest, now)
+            if record is not None:
+                await cache.aset(self.key(dataset), record, None)
+            return current
+        except Exception as e:
+            logger.debug(f"Could not stamp data version of {dataset}: {e}")
+            return None
+
+    def _next(self, record: Any, digest: str,
+              now: Optional[float]) -> Tuple[DataVersion, Optional[Dict[str, Any]]]:
+        """The version for ``digest`` and the record to store, or None when unchanged."""
+        current = self._from_record(record)
+        if current is not None and current.digest == digest:
+            return current, None
+        version = DataVersion((current.version if current else 0) + 1, digest)
+        changed_at = time.time() if now is None else now
+        return version, {'version': version.version, 'digest': digest, 'changed_at': changed_at}
+
+
+class VersionedMemo:
+    """
+    Values derived from cached datasets, kept in process memory by content digest.
+
+    Decoding a large entry on every request is what a process-local copy
+    avoids: a value is served for as long as it is fresh and the digest the
+    caller reads from the shared version record still matches, which a
+    rebuild by any worker changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, float, Any]] = {}
+
+    def get(self, cache_key: str, digest: Optional[str], now: float = None) -> Any:
+        """The value kept for a cache key, if it matches ``digest`` and is still fresh, else None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            kept = self._entries.get(cache_key)
+        if kept is None or digest is None or kept[0] != digest or now >= kept[1]:
+            return None
+        return kept[2]
+
+    def put(self, cache_key: str, digest: str, expires: float, value: Any) -> None:
+        """Keep a value until ``expires`` (the soft expiry of the entry it came from)."""
+        with self._lock:
+            self._entries[cache_key] = (digest, expires, value)
+
+    def clear(self) -> None:
+        """Drop every kept value."""
+        with self._lock:
+            self._entries.clear()
+
+
+class VersionSet:
+    """
+    Versions of the datasets read inside a tracking block.
+
+    Reads that can't be versioned (data served from the local database, or
+    fixture details) make the set incomplete, and an incomplete set yields
+    no fingerprint: callers then fall back to their unversioned behaviour.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.versions: Dict[str, Optional[DataVersion]] = {}
+
+    def add(self, dataset: str, version: Optional[DataVersion]) -> None:
+        """Record a dataset read; None marks it as unversioned."""
+        with self._lock:
+            if version is None or self.versions.get(dataset, version) is not None:
+                self.versions[dataset] = version
+
+    @property
+    def complete(self) -> bool:
+        """Whether every dataset read has a version."""
+        with self._lock:
+            return bool(self.versions) and all(version is not None for version in self.versions.values())
+
+    def fingerprint(self, *extra: Any) -> Optional[str]:
+        """
+        Get a digest of every version read.
+
+        Args:
+            extra: Further values to fold in, e.g. the version of the
+                response format built from the datasets
+
+        Returns:
+            Hex digest that changes whenever any dataset changes, or None
+            when the set is incomplete
+        """
+        if not self.complete:
+            return None
+        with self._lock:
+            parts = sorted(f"{dataset}={version.version}:{version.digest}"
+                           for dataset, version in self.versions.items())
+        parts.extend(str(value) for value in extra)
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+    def etag(self, *extra: Any) -> Optional[str]:
+        """Get the fingerprint as a quoted strong ETag, or None when incomplete."""
+        fingerprint = self.fingerprint(*extra)
+        return f'"{fingerprint}"' if fingerprint else None
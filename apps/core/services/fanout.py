@@ -0,0 +1,224 @@
+"""
+Dependency-aware parallel fan-out for pages that need many upstream calls.
+
+A page registers named tasks (optionally depending on other tasks) and
+runs them on a bounded, shared thread pool under a single deadline.
+Independent tasks run concurrently; a task that fails, or does not finish
+before the deadline, yields its default value so the page can degrade that
+section instead of failing as a whole. Tasks run in a copy of the caller's
+context, so context variables set by the caller apply inside them, and
+their thread's database connection is closed like a request's would be.
+
+The deadline starts when ``run`` is called, and time a task spends waiting
+for a pool thread counts against it. So that one page cannot crowd out the
+others, a run keeps at most ``API_FOOTBALL_FANOUT_PER_REQUEST`` tasks in the
+pool and queues the rest itself, and the pool is sized for every request
+thread of the process (``API_FOOTBALL_REQUEST_THREADS``, e.g. gunicorn's
+``--threads``) to have that many running at once. A task then only waits
+behind tasks of its own page.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable
+
+from decouple import config
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def per_request_limit() -> int:
+    """Tasks one fan-out run may have in the pool at once."""
+    return max(1, config('API_FOOTBALL_FANOUT_PER_REQUEST', default=4, cast=int))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide fan-out pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Every request thread can run its full share of tasks at once
+            request_threads = config('API_FOOTBALL_REQUEST_THREADS', default=4, cast=int)
+            _executor = ThreadPoolExecutor(
+                max_workers=config(
+                    'API_FOOTBALL_FANOUT_WORKERS', default=request_threads * per_request_limit(), cast=int
+                ),
+                thread_name_prefix='api-football-fanout',
+            )
+        return _executor
+
+
+def _run_task(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a task on a pool thread.
+
+    Tasks may query the database, and Django only closes the connections of
+    request threads, so the pool thread's connection is closed around the
+    task when it is broken or past CONN_MAX_AGE.
+    """
+    close_old_connections()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+class FanOutResult:
+    """Outcome of a fan-out run."""
+
+    def __init__(self):
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.timed_out = []
+        self.elapsed = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+    def ok(self, name: str) -> bool:
+        """Whether a task completed without error before the deadline."""
+        return name not in self.errors and name not in self.timed_out
+
+
+class _Task:
+    def __init__(self, name, fn, args, kwargs, depends_on, default):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.depends_on = tuple(depends_on)
+        self.default = default
+
+
+class FanOut:
+    """
+    Run a set of named tasks concurrently, respecting their dependencies.
+
+    Example::
+
+        fanout = FanOut(deadline=8)
+        fanout.add('standings', service.get_standings, default=[])
+        fanout.add('squad', service.get_team_squad, team_id, default=[])
+        fanout.add('venue', service.get_venue_details, depends_on=['teams'], default={})
+        result = fanout.run()
+    """
+
+    def __init__(self, deadline: float = None, executor: ThreadPoolExecutor = None,
+                 max_concurrency: int = None):
+        """
+        Args:
+            deadline: Seconds the whole run may take, counted from the call
+                to run (defaults to API_FOOTBALL_PAGE_DEADLINE)
+            executor: Pool to run tasks on (defaults to the shared pool)
+            max_concurrency: Tasks of this run in the pool at once (defaults
+                to API_FOOTBALL_FANOUT_PER_REQUEST)
+        """
+        if deadline is None:
+            deadline = config('API_FOOTBALL_PAGE_DEADLINE', default=8, cast=float)
+        self.deadline = deadline
+        self.executor = executor
+        self.max_concurrency = max_concurrency or per_request_limit()
+        self._tasks: Dict[str, _Task] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], *args,
+            depends_on: Iterable[str] = (), default: Any = None, **kwargs) -> 'FanOut':
+        """
+        Register a task.
+
+        Tasks with ``depends_on`` receive the results of those tasks as
+        leading positional arguments, in the order listed.
+
+        Args:
+            name: Unique task name, used as the result key
+            fn: Callable to run
+            depends_on: Names of tasks that must complete first
+            default: Value used when the task fails or misses the deadline
+        """
+        if name in self._tasks:
+            raise ValueError(f"Duplicate fan-out task: {name}")
+        self._tasks[name] = _Task(name, fn, args, kwargs, depends_on, default)
+        return self
+
+    def run(self) -> FanOutResult:
+        """
+        Run all tasks and wait for them until the deadline.
+
+        Returns:
+            FanOutResult with a value (or default) for every task
+        """
+        executor = self.executor or get_executor()
+        result = FanOutResult()
+        start = time.monotonic()
+        deadline_at = start + self.deadline
+
+        for task in self._tasks.values():
+            missing = [dep for dep in task.depends_on if dep not in self._tasks]
+            if missing:
+                raise ValueError(f"Fan-out task {task.name} depends on unknown tasks: {missing}")
+
+        waiting = dict(self._tasks)
+        running = {}
+
+        while waiting or running:
+            # Start the tasks whose dependencies are resolved, in the order added, up to the limit
+            for name, task in list(waiting.items()):
+                if len(running) >= self.max_concurrency:
+                    break
+                if any(dep in waiting or dep in running.values() for dep in task.depends_on):
+                    continue
+                del waiting[name]
+                failed = [dep for dep in task.depends_on if not result.ok(dep)]
+                if failed:
+                    result.errors[name] = RuntimeError(f"Dependency failed: {', '.join(failed)}")
+                    result.results[name] = task.default
+                    continue
+                dep_values = [result.results[dep] for dep in task.depends_on]
+                future = executor.submit(
+                    contextvars.copy_context().run, _run_task, task.fn, *dep_values, *task.args, **task.kwargs
+                )
+                running[future] = name
+
+            if not running:
+                if waiting and not any(
+                    all(dep not in waiting for dep in task.depends_on) for task in waiting.values()
+                ):
+                    raise ValueError(f"Fan-out tasks have circular dependencies: {list(waiting)}")
+                continue
+
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(list(running), timeout=remaining, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result.results[name] = future.result()
+                except Exception as e:
+                    logger.warning(f"Fan-out task {name} failed: {e}")
+                    result.errors[name] = e
+                    result.results[name] = self._tasks[name].default
+
+        # Anything left missed the deadline; its thread finishes in the background
+        for future, name in running.items():
+            future.cancel()
+            result.timed_out.append(name)
+            result.results[name] = self._tasks[name].default
+        for name, task in waiting.items():
+            result.timed_out.append(name)
+            result.results[name] = task.default
+        if result.timed_out:
+            logger.warning(f"Fan-out deadline of {self.deadline}s missed by: {', '.join(result.timed_out)}")
+
+        result.elapsed = time.monotonic() - start
+        return result
@@ -0,0 +1,470 @@
+"""
+Sync pipeline that ingests API-Football data into the local models.
+
+Each stage pulls one dataset for a league season and upserts it into the
+teams, players and matches apps. Rows carry a digest of their upstream
+payload, so unchanged rows are never rewritten, and each stage records its
+progress in ``SyncState`` so later runs can work incrementally:
+
+* ``teams`` and ``squads`` are refreshed at most once a day;
+* ``standings`` are refreshed on every run;
+* ``fixtures`` only re-fetch the window around the previous run's date
+  (plus the next two weeks), after a first full-season load;
+* ``player_stats`` only run when a fixture has finished since the last
+  run, or once a day.
+
+Every run is recorded as a ``SyncRun`` with per-stage timings and row
+counts. Upstream calls go through the API client with low quota priority,
+so a sync never eats into the budget reserved for page requests.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from apps.core.models import SyncRun, SyncState
+from apps.matches.models import Fixture
+from apps.players.models import Player, PlayerSeason
+from apps.teams.models import Standing, Team, TeamSeason
+
+from .api_football import APIFootballService, api_football_service
+from .fanout import FanOut
+from .rate_limiter import PRIORITY_LOW
+from .ttl_policy import DAY, FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('teams', 'standings', 'squads', 'fixtures', 'player_stats')
+
+# Minimum seconds between two runs of a stage, unless the run is forced
+STAGE_INTERVALS = {
+    'teams': DAY,
+    'standings': 0,
+    'squads': DAY,
+    'fixtures': 0,
+    'player_stats': DAY,
+}
+
+# Days ahead an incremental fixture sync looks for rescheduled fixtures
+FIXTURE_LOOKAHEAD_DAYS = 14
+
+
+def payload_hash(payload: Any) -> str:
+    """Get a stable digest of an upstream payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _changed(model, rows: List[Any], key: str, hash_field: str, lookup: Dict[str, Any] = None) -> List[Any]:
+    """Keep the rows that are new or whose payload digest differs from the stored one."""
+    if not rows:
+        return []
+    existing = dict(
+        model.objects.filter(**(lookup or {}), **{f'{key}__in': [getattr(row, key) for row in rows]})
+        .values_list(key, hash_field)
+    )
+    return [row for row in rows if existing.get(getattr(row, key)) != getattr(row, hash_field)]
+
+
+class FootballSync:
+    """
+    Runs the sync stages for one league season.
+    """
+
+    def __init__(self, service: APIFootballService = None, season: int = None, full: bool = False):
+        """
+        Args:
+            service: API client to fetch with (defaults to the shared client)
+            season: Season year (defaults to the client's current season)
+            full: Ignore stage intervals and incremental cursors
+        """
+        self.service = service or api_football_service
+        self.league_id = self.service.league_id
+        self.season = season or self.service.current_season
+        self.full = full
+        self.finished_fixtures_changed = 0
+
+    def run(self, stages: Iterable[str] = None) -> SyncRun:
+        """
+        Run the given stages (all by default) and record the run.
+
+        Returns:
+            The finished SyncRun
+        """
+        stages = list(stages or STAGES)
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown sync stages: {', '.join(unknown)}")
+
+        run = SyncRun.objects.create(league_id=self.league_id, season=self.season, full=self.full)
+        started = time.monotonic()
+        attempted = 0
+
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            state, _ = SyncState.objects.get_or_create(
+                dataset=stage, league_id=self.league_id, season=self.season
+            )
+            if not self._due(stage, state):
+                run.counts[stage] = 'skipped'
+                continue
+
+            attempted += 1
+            stage_started = time.monotonic()
+            try:
+                with transaction.atomic():
+                    run.counts[stage] = getattr(self, f'sync_{stage}')(state)
+                    state.last_success_at = timezone.now()
+                    state.save()
+            except Exception as e:
+                logger.error(f"Sync stage {stage} failed: {e}")
+                run.errors[stage] = str(e)
+            run.timings[stage] = round(time.monotonic() - stage_started, 3)
+            logger.info(f"Sync stage {stage}: {run.counts.get(stage, 0)} rows in {run.timings[stage]}s")
+
+        # Readers in this process see the new sync state right away
+        if self.service.local_store is not None:
+            self.service.local_store.forget_sync_state()
+
+        if not run.errors:
+            run.status = 'success'
+        elif len(run.errors) == attempted:
+            run.status = 'failed'
+        else:
+            run.status = 'partial'
+        run.finished_at = timezone.now()
+        run.duration = round(time.monotonic() - started, 3)
+        run.save()
+        return run
+
+    def _due(self, stage: str, state: SyncState) -> bool:
+        """Whether a stage should run now."""
+        if self.full or state.last_success_at is None:
+            return True
+        if stage == 'player_stats' and self.finished_fixtures_changed:
+            return True
+        return timezone.now() - state.last_success_at >= timedelta(seconds=STAGE_INTERVALS[stage])
+
+    def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch fresh, unprojected data from upstream, bypassing the response cache."""
+        return self.service._fetch(endpoint, params, None, priority=PRIORITY_LOW, project=False)
+
+    def _league_params(self, **extra) -> Dict[str, Any]:
+        return {'league': self.league_id, 'season': self.season, **extra}
+
+    # Stages
+
+    def sync_teams(self, state: SyncState) -> int:
+        """Upsert the league's teams and their venues."""
+        items = self._fetch('teams', self._league_params())['response'] or []
+
+        rows = []
+        for item in items:
+            team = item.get('team', {})
+            venue = item.get('venue') or {}
+            if not team.get('id'):
+                continue
+            rows.append(Team(
+                api_id=team['id'],
+                name=team.get('name') or '',
+                code=team.get('code') or '',
+                country=team.get('country') or '',
+                founded=team.get('founded'),
+                logo=team.get('logo') or '',
+                venue_api_id=venue.get('id'),
+                venue_name=venue.get('name') or '',
+                venue_city=venue.get('city') or '',
+                venue_capacity=venue.get('capacity'),
+                raw=item,
+                payload_hash=payload_hash(item),
+            ))
+
+        changed = _changed(Team, rows, 'api_id', 'payload_hash')
+        Team.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['api_id'],
+            update_fields=[
+                'name', 'code', 'country', 'founded', 'logo', 'venue_api_id', 'venue_name',
+                'venue_city', 'venue_capacity', 'raw', 'payload_hash', 'updated_at',
+            ],
+        )
+
+        team_ids = self._team_ids(row.api_id for row in rows)
+        TeamSeason.objects.bulk_create(
+            [TeamSeason(team_id=team_ids[row.api_id], league_id=self.league_id, season=self.season) for row in rows],
+            ignore_conflicts=True,
+        )
+        return len(changed)
+
+    def sync_standings(self, state: SyncState) -> int:
+        """Upsert the league table."""
+        response = self._fetch('standings', self._league_params())['response'] or []
+        if not response or not response[0]['league']['standings']:
+            return 0
+        table = response[0]['league']['standings'][0]
+
+        team_ids = self._ensure_teams(row['team'] for row in table)
+        rows = []
+        for row in table:
+            totals = row.get('all', {})
+            goals = totals.get('goals', {})
+            rows.append(Standing(
+                team_id=team_ids[row['team']['id']],
+                league_id=self.league_id,
+                season=self.season,
+                rank=row.get('rank') or 0,
+                points=row.get('points') or 0,
+                played=totals.get('played') or 0,
+                win=totals.get('win') or 0,
+                draw=totals.get('draw') or 0,
+                lose=totals.get('lose') or 0,
+                goals_for=goals.get('for') or 0,
+                goals_against=goals.get('against') or 0,
+                goals_diff=row.get('goalsDiff') or 0,
+                form=row.get('form') or '',
+                description=row.get('description') or '',
+                raw=row,
+                payload_hash=payload_hash(row),
+            ))
+
+        changed = _changed(
+            Standing, rows, 'team_id', 'payload_hash',
+            lookup={'league_id': self.league_id, 'season': self.season},
+        )
+        Standing.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['team', 'league_id', 'season'],
+            update_fields=[
+                'rank', 'points', 'played', 'win', 'draw', 'lose', 'goals_for', 'goals_against',
+                'goals_diff', 'form', 'description', 'raw', 'payload_hash', 'updated_at',
+            ],
+        )
+        return len(changed)
+
+    def sync_squads(self, state: SyncState) -> int:
+        """Upsert every team's current squad."""
+        teams = list(
+            Team.objects.filter(seasons__league_id=self.league_id, seasons__season=self.season)
+            .values_list('api_id', 'id')
+        )
+
+        fanout = FanOut(deadline=2 * self.service.timeout)
+        for api_id, _ in teams:
+            fanout.add(str(api_id), self._fetch, 'players/squads', {'team': api_id})
+        squads = fanout.run()
+
+        written = 0
+        for api_id, team_pk in teams:
+            if not squads.ok(str(api_id)):
+                raise RuntimeError(f"Squad of team {api_id} could not be fetched")
+            response = squads[str(api_id)]['response'] or []
+            squad = response[0].get('players', []) if response else []
+            squad = [player for player in squad if player.get('id')]
+
+            player_ids = self._upsert_players(
+                [{'id': player['id'], 'name': player.get('name'), 'age': player.get('age'),
+                  'photo': player.get('photo')} for player in squad],
+                update_fields=['name', 'slug', 'age', 'photo', 'updated_at'],
+            )
+            rows = [
+                PlayerSeason(
+                    player_id=player_ids[player['id']],
+                    team_id=team_pk,
+                    league_id=self.league_id,
+                    season=self.season,
+                    position=player.get('position') or '',
+                    number=player.get('number'),
+                    squad_raw=player,
+                    squad_hash=payload_hash(player),
+                )
+                for player in squad
+            ]
+            changed = _changed(
+                PlayerSeason, rows, 'player_id', 'squad_hash',
+                lookup={'team_id': team_pk, 'league_id': self.league_id, 'season': self.season},
+            )
+            PlayerSeason.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['player', 'team', 'league_id', 'season'],
+                update_fields=['position', 'number', 'squad_raw', 'squad_hash', 'updated_at'],
+            )
+            # Players who left the squad keep their statistics but are no longer listed
+            PlayerSeason.objects.filter(
+                team_id=team_pk, league_id=self.league_id, season=self.season, squad_raw__isnull=False,
+            ).exclude(player_id__in=[row.player_id for row in rows]).update(squad_raw=None, squad_hash='')
+            written += len(changed)
+        return written
+
+    def sync_fixtures(self, state: SyncState) -> int:
+        """Upsert fixtures, only re-fetching the window since the previous run when possible."""
+        today = timezone.now().date()
+        params = self._league_params()
+        since = state.cursor.get('date')
+        if since and not self.full:
+            start = min(date.fromisoformat(since), today) - timedelta(days=1)
+            params.update({
+                'from': start.isoformat(),
+                'to': (today + timedelta(days=FIXTURE_LOOKAHEAD_DAYS)).isoformat(),
+            })
+        items = self._fetch('fixtures', params)['response'] or []
+
+        team_ids = self._ensure_teams(
+            team for item in items for team in (item['teams']['home'], item['teams']['away'])
+        )
+        rows = []
+        for item in items:
+            fixture = item['fixture']
+            rows.append(Fixture(
+                api_id=fixture['id'],
+                league_id=self.league_id,
+                season=self.season,
+                round=item.get('league', {}).get('round') or '',
+                date=parse_datetime(fixture['date']),
+                status_short=fixture.get('status', {}).get('short') or '',
+                status_long=fixture.get('status', {}).get('long') or '',
+                elapsed=fixture.get('status', {}).get('elapsed'),
+                venue_name=(fixture.get('venue') or {}).get('name') or '',
+                home_team_id=team_ids[item['teams']['home']['id']],
+                away_team_id=team_ids[item['teams']['away']['id']],
+                home_goals=item.get('goals', {}).get('home'),
+                away_goals=item.get('goals', {}).get('away'),
+                raw=item,
+                payload_hash=payload_hash(item),
+            ))
+
+        changed = _changed(Fixture, rows, 'api_id', 'payload_hash')
+        Fixture.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['api_id'],
+            update_fields=[
+                'round', 'date', 'status_short', 'status_long', 'elapsed', 'venue_name', 'home_team',
+                'away_team', 'home_goals', 'away_goals', 'raw', 'payload_hash', 'updated_at',
+            ],
+        )
+        self.finished_fixtures_changed = sum(1 for row in changed if row.status_short in FINISHED_STATUSES)
+
+        state.cursor = {'date': today.isoformat()}
+        return len(changed)
+
+    def sync_player_stats(self, state: SyncState) -> int:
+        """Upsert league statistics for every player, page by page."""
+        written = 0
+        page, total_pages = 1, 1
+        while page <= total_pages:
+            data = self._fetch('players', self._league_params(page=page))
+            total_pages = (data.get('paging') or {}).get('total') or 1
+            items = [item for item in data['response'] or [] if item.get('player', {}).get('id')]
+            written += self._store_player_stats(items)
+            page += 1
+        return written
+
+    def _store_player_stats(self, items: List[Dict[str, Any]]) -> int:
+        player_ids = self._upsert_players(
+            [item['player'] for item in items],
+            update_fields=['name', 'slug', 'firstname', 'lastname', 'age', 'nationality', 'photo', 'updated_at'],
+        )
+
+        entries = [
+            (item, entry) for item in items for entry in item.get('statistics', [])
+            if entry.get('league', {}).get('id') == self.league_id and entry.get('team', {}).get('id')
+        ]
+        team_ids = self._ensure_teams(entry['team'] for _, entry in entries)
+
+        rows = []
+        for item, entry in entries:
+            # Keep only this league's entry, in the shape of the top scorers endpoint
+            stats_raw = {'player': item['player'], 'statistics': [entry]}
+            games = entry.get('games', {})
+            goals = entry.get('goals', {})
+            cards = entry.get('cards', {})
+            rows.append(PlayerSeason(
+                player_id=player_ids[item['player']['id']],
+                team_id=team_ids[entry['team']['id']],
+                league_id=self.league_id,
+                season=self.season,
+                position=games.get('position') or '',
+                appearances=games.get('appearences') or 0,
+                minutes=games.get('minutes') or 0,
+                goals=goals.get('total') or 0,
+                assists=goals.get('assists') or 0,
+                yellow_cards=cards.get('yellow') or 0,
+                red_cards=cards.get('red') or 0,
+                rating=round(float(games['rating']), 2) if games.get('rating') else None,
+                stats_raw=stats_raw,
+                stats_hash=payload_hash(stats_raw),
+            ))
+
+        existing = {
+            (player_id, team_id): stats_hash
+            for player_id, team_id, stats_hash in PlayerSeason.objects.filter(
+                league_id=self.league_id, season=self.season,
+                player_id__in=[row.player_id for row in rows],
+            ).values_list('player_id', 'team_id', 'stats_hash')
+        }
+        changed = [row for row in rows if existing.get((row.player_id, row.team_id)) != row.stats_hash]
+        PlayerSeason.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=['player', 'team', 'league_id', 'season'],
+            update_fields=[
+                'position', 'appearances', 'minutes', 'goals', 'assists', 'yellow_cards', 'red_cards',
+                'rating', 'stats_raw', 'stats_hash', 'updated_at',
+            ],
+        )
+        return len(changed)
+
+    # Helpers
+
+    def _team_ids(self, api_ids: Iterable[int]) -> Dict[int, int]:
+        """Map API team ids to primary keys."""
+        return dict(Team.objects.filter(api_id__in=set(api_ids)).values_list('api_id', 'id'))
+
+    def _ensure_teams(self, teams: Iterable[Dict[str, Any]]) -> Dict[int, int]:
+        """Create minimal rows for teams not synced yet; returns API id to primary key."""
+        teams = {team['id']: team for team in teams if team.get('id')}
+        Team.objects.bulk_create(
+            [Team(api_id=api_id, name=team.get('name') or '', logo=team.get('logo') or '')
+             for api_id, team in teams.items()],
+            ignore_conflicts=True,
+        )
+        return self._team_ids(teams)
+
+    def _upsert_players(self, players: List[Dict[str, Any]], update_fields: List[str]) -> Dict[int, int]:
+        """Upsert players from squad or statistics payloads; returns API id to primary key."""
+        rows = {}
+        for player in players:
+            rows[player['id']] = Player(
+                api_id=player['id'],
+                name=player.get('name') or '',
+                slug=slugify(player.get('name') or ''),
+                firstname=player.get('firstname') or '',
+                lastname=player.get('lastname') or '',
+                age=player.get('age'),
+                nationality=player.get('nationality') or '',
+                photo=player.get('photo') or '',
+            )
+        Player.objects.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=['api_id'],
+            update_fields=update_fields,
+        )
+        return dict(Player.objects.filter(api_id__in=rows).values_list('api_id', 'id'))
+
+
+def run_sync(season: Optional[int] = None, stages: Iterable[str] = None, full: bool = False) -> SyncRun:
+    """Run the sync pipeline once with the shared API client."""
+    return FootballSync(season=season, full=full).run(stages)
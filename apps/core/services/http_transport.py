@@ -0,0 +1,113 @@
+"""
+Pooled HTTP transport for upstream API calls.
+
+Wraps a single urllib3 connection pool (through a requests ``HTTPAdapter``)
+so that consecutive calls to the same host reuse an open keep-alive
+connection instead of paying a fresh TCP + TLS handshake every time.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class PooledTransport:
+    """
+    Long-lived, thread-safe HTTP transport with per-host connection pooling.
+
+    The connection pool lives in one shared ``HTTPAdapter`` (urllib3 pools are
+    thread-safe). Each thread gets its own ``requests.Session`` mounted on that
+    adapter, so session state such as cookies is never shared between threads
+    while the underlying sockets are.
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 10,
+                 keep_alive: bool = True, pool_block: bool = False):
+        """
+        Args:
+            pool_connections: Number of per-host pools to keep around
+            pool_maxsize: Maximum open connections kept per host
+            keep_alive: Reuse connections between requests when True
+            pool_block: Block instead of opening extra connections when the
+                per-host pool is exhausted
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._sessions = []
+
+    def _get_session(self) -> requests.Session:
+        """Return the calling thread's session, creating it on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            if not self.keep_alive:
+                session.headers['Connection'] = 'close'
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            params: Optional[Dict[str, Any]] = None, timeout: float = 30) -> requests.Response:
+        """
+        Perform a GET request over the pooled connections.
+
+        Raises:
+            requests.exceptions.RequestException: On transport failures
+        """
+        with self._lock:
+            self._request_count += 1
+        return self._get_session().get(url, headers=headers, params=params, timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get connection reuse statistics.
+
+        Returns:
+            Dict with requests sent, connections opened and connections reused
+        """
+        connections = 0
+        pool_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            pool_requests += pool.num_requests
+
+        with self._lock:
+            request_count = self._request_count
+
+        return {
+            'requests': request_count,
+            'connections_opened': connections,
+            'connections_reused': max(pool_requests - connections, 0),
+            'pool_maxsize': self.pool_maxsize,
+        }
+
+    def close(self) -> None:
+        """Close all sessions and drop pooled connections."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+        self._local = threading.local()
@@ -0,0 +1,265 @@
+"""
+Precomputed player leaderboards.
+
+The leaders pages used to re-fetch the top scorers and re-filter them on
+every request: assists leaders were whatever top scorers also had
+assists, and goalkeepers were whichever keepers happened to score. The
+leaderboards are computed instead from the league's player statistics and
+its finished fixtures, once per refresh, and stored as a single cache
+entry:
+
+* ``players`` holds one statistics item per player, in the shape of the
+  topscorers endpoint, with the player's league totals summed over every
+  team they played for this season;
+* ``boards`` holds, per leaderboard, two parallel arrays sorted best first:
+  indexes into ``players`` and the values ranked on.
+
+Serving the top ``k`` of a board is then a slice of both arrays, with no
+filtering or sorting per request (see ``leaderboard``).
+
+Clean sheets come from the fixtures: a goalkeeper is credited when they
+started a match played to a result (full time, extra time or penalties) in
+which their team conceded nothing. Abandoned, awarded and walkover results
+don't count. When a fixture carries no lineup, the team's keeper with the
+most league minutes is credited instead.
+
+``LEADERBOARDS_FORMAT`` is part of the cache key: bump it whenever the
+structure below changes so old entries are never read by new code.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .data_version import VersionedMemo, content_digest
+from .ttl_policy import COMPLETED_STATUSES
+
+LEADERBOARDS_FORMAT = 1
+
+# Minutes a player needs before they are ranked on a per-90 board
+MIN_MINUTES_PER_90 = 450
+
+GOALKEEPER = 'Goalkeeper'
+
+
+def _stat(item: Dict[str, Any], group: str, field: str) -> int:
+    return (item['statistics'][0].get(group) or {}).get(field) or 0
+
+
+def _per_90(value: int, item: Dict[str, Any]) -> float:
+    return round(value * 90 / _stat(item, 'games', 'minutes'), 2)
+
+
+# Board name: (value of an item, minimum minutes to be ranked)
+BOARDS: Dict[str, Tuple[Callable[[Dict[str, Any]], float], int]] = {
+    'goals': (lambda item: _stat(item, 'goals', 'total'), 0),
+    'assists': (lambda item: _stat(item, 'goals', 'assists'), 0),
+    'goal_involvements': (lambda item: _stat(item, 'goals', 'total') + _stat(item, 'goals', 'assists'), 0),
+    'yellow_cards': (lambda item: _stat(item, 'cards', 'yellow'), 0),
+    'red_cards': (lambda item: _stat(item, 'cards', 'red'), 0),
+    'cards': (lambda item: _stat(item, 'cards', 'yellow') + _stat(item, 'cards', 'red'), 0),
+    'clean_sheets': (lambda item: item.get('clean_sheets', 0), 0),
+    'goals_per_90': (lambda item: _per_90(_stat(item, 'goals', 'total'), item), MIN_MINUTES_PER_90),
+    'assists_per_90': (lambda item: _per_90(_stat(item, 'goals', 'assists'), item), MIN_MINUTES_PER_90),
+    'goal_involvements_per_90': (
+        lambda item: _per_90(_stat(item, 'goals', 'total') + _stat(item, 'goals', 'assists'), item),
+        MIN_MINUTES_PER_90,
+    ),
+}
+
+
+def merge_player_statistics(items: Iterable[Dict[str, Any]], league_id: int) -> List[Dict[str, Any]]:
+    """
+    Collapse player statistics to one item per player with league totals.
+
+    Args:
+        items: Items of the players endpoint (a player with a statistics
+            entry per team and competition)
+        league_id: League whose entries count
+
+    Returns:
+        One item per player. Its single statistics entry is the one of the
+        team the player played most minutes for, with the appearances,
+        minutes, goals and cards summed over all of the league's entries.
+    """
+    merged = {}
+    for item in items:
+        player_id = item.get('player', {}).get('id')
+        entries = [
+            entry for entry in item.get('statistics') or []
+            if (entry.get('league') or {}).get('id') in (league_id, None)
+        ]
+        if player_id is None or not entries:
+            continue
+        merged.setdefault(player_id, (item['player'], []))[1].extend(entries)
+
+    players = []
+    for info, entries in merged.values():
+        primary = max(entries, key=lambda entry: (entry.get('games') or {}).get('minutes') or 0)
+
+        def total(group, field):
+            return sum((entry.get(group) or {}).get(field) or 0 for entry in entries)
+
+        statistics = {
+            **primary,
+            'games': {
+                **(primary.get('games') or {}),
+                'appearences': total('games', 'appearences'),
+                'minutes': total('games', 'minutes'),
+            },
+            'goals': {
+                **(primary.get('goals') or {}),
+                'total': total('goals', 'total'),
+                'assists': total('goals', 'assists'),
+            },
+            'cards': {
+                **(primary.get('cards') or {}),
+                'yellow': total('cards', 'yellow'),
+                'red': total('cards', 'red'),
+            },
+        }
+        players.append({'player': info, 'statistics': [statistics]})
+    return players
+
+
+def count_clean_sheets(fixtures: Iterable[Dict[str, Any]], players: List[Dict[str, Any]]) -> Dict[int, int]:
+    """
+    Count the clean sheets of every goalkeeper.
+
+    Args:
+        fixtures: Fixtures of the season, with their lineups where known
+        players: Merged player statistics (see merge_player_statistics)
+
+    Returns:
+        Clean sheets by player id
+    """
+    # Stand-in when a fixture has no lineup: the team's most used keeper
+    first_choice = {}
+    for item in players:
+        stats = item['statistics'][0]
+        team_id = (stats.get('team') or {}).get('id')
+        if (stats.get('games') or {}).get('position') != GOALKEEPER or team_id is None:
+            continue
+        current = first_choice.get(team_id)
+        if current is None or _stat(item, 'games', 'minutes') > _stat(current, 'games', 'minutes'):
+            first_choice[team_id] = item
+
+    clean_sheets = {}
+    for fixture in fixtures:
+        # Abandoned, awarded and walkover results were not played out
+        if (fixture.get('fixture', {}).get('status') or {}).get('short') not in COMPLETED_STATUSES:
+            continue
+        goals = fixture.get('goals') or {}
+        teams = fixture.get('teams') or {}
+        for side, opponent in (('home', 'away'), ('away', 'home')):
+            team_id = (teams.get(side) or {}).get('id')
+            if team_id is None or goals.get(opponent) != 0:
+                continue
+            keeper_id = _starting_keeper(fixture, team_id)
+            if keeper_id is None and team_id in first_choice:
+                keeper_id = first_choice[team_id]['player']['id']
+            if keeper_id is not None:
+                clean_sheets[keeper_id] = clean_sheets.get(keeper_id, 0) + 1
+    return clean_sheets
+
+
+def _starting_keeper(fixture: Dict[str, Any], team_id: int) -> Optional[int]:
+    """The goalkeeper a team started a fixture with, if the lineup is known."""
+    for lineup in fixture.get('lineups') or []:
+        if (lineup.get('team') or {}).get('id') != team_id:
+            continue
+        for starter in lineup.get('startXI') or []:
+            player = starter.get('player') or {}
+            if player.get('pos') == 'G' and player.get('id') is not None:
+                return player['id']
+    return None
+
+
+def build_leaderboards(player_stats: Iterable[Dict[str, Any]], fixtures: Iterable[Dict[str, Any]],
+                       league_id: int, season: int, complete: bool = True,
+                       now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Compute every leaderboard of a league season.
+
+    Args:
+        player_stats: Items of the players endpoint for the league season
+        fixtures: Fixtures of the season, with lineups where fetched
+        league_id: League of the season
+        season: Season year
+        complete: Whether every input was loaded
+        now: Build timestamp (defaults to time.time())
+
+    Returns:
+        Leaderboards dict with the players and a sorted board per entry of
+        ``BOARDS``
+    """
+    players = merge_player_statistics(player_stats, league_id)
+    clean_sheets = count_clean_sheets(fixtures, players)
+    for item in players:
+        if item['statistics'][0].get('games', {}).get('position') == GOALKEEPER:
+            item['clean_sheets'] = clean_sheets.get(item['player']['id'], 0)
+
+    boards = {}
+    for name, (value, min_minutes) in BOARDS.items():
+        ranked = []
+        for index, item in enumerate(players):
+            if min_minutes and _stat(item, 'games', 'minutes') < min_minutes:
+                continue
+            score = value(item)
+            if score > 0:
+                # Ties go to fewer minutes played, then to the name
+                ranked.append((-score, _stat(item, 'games', 'minutes'), item['player'].get('name') or '',
+                               index, score))
+        ranked.sort()
+        boards[name] = {
+            'order': [row[3] for row in ranked],
+            'values': [row[4] for row in ranked],
+        }
+
+    return {
+        'format': LEADERBOARDS_FORMAT,
+        'season': season,
+        'version': content_digest([players, boards]),
+        'built_at': time.time() if now is None else now,
+        'complete': complete,
+        'players': players,
+        'boards': boards,
+    }
+
+
+def leaderboard(leaderboards: Dict[str, Any], name: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Get the top of a leaderboard.
+
+    Reads only the first ``limit`` rows of the board. Rows share the
+    player and statistics dicts of the leaderboards, so treat them as
+    read-only.
+
+    Args:
+        leaderboards: Leaderboards dict (see build_leaderboards)
+        name: Board name, one of ``BOARDS``
+        limit: Rows to return
+
+    Returns:
+        Rows in the shape of the topscorers endpoint, plus ``rank`` (shared
+        by tied rows) and ``value`` (what the board ranks on)
+    """
+    board = leaderboards.get('boards', {}).get(name)
+    if not board:
+        return []
+    players = leaderboards['players']
+    rows = []
+    for position, (index, value) in enumerate(zip(board['order'][:limit], board['values'][:limit])):
+        rank = rows[-1]['rank'] if rows and rows[-1]['value'] == value else position + 1
+        rows.append({**players[index], 'rank': rank, 'value': value})
+    return rows
+
+
+class LeaderboardMemo(VersionedMemo):
+    """
+    Decoded leaderboards kept in process memory, keyed by their content digest.
+
+    Reading the cached leaderboards means decoding every player on each
+    request. A process keeps the last decoded copy instead, and serves it
+    for as long as the entry is fresh and the shared version record still
+    carries the same digest, which a rebuild by any worker changes.
+    """
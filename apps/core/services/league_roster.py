@@ -0,0 +1,182 @@
+"""
+Materialized league roster.
+
+Merging every squad of the league into the player/statistics shape the
+views use means thousands of dicts per request. The roster is built once
+per refresh instead and stored as a single cache entry, together with the
+lookups the player pages need (by id, by slug, available positions and
+teams).
+
+Player pages are addressed by the slug of the player's name, and names
+collide: two players called "Erik Andersson" at different clubs get
+``erik-andersson-aik`` and ``erik-andersson-hammarby`` (and the player id
+on top if they share a club too). The bare ``erik-andersson``, which is
+what existing links use, still resolves, to the first of them; the
+others are listed as ``same_name`` in its slug record. The slug records
+are also written to the cache as one index next to the roster, which each
+process keeps decoded (see ``APIFootballService.get_player_by_slug``), so a
+profile lookup is a dict lookup instead of a read of the whole roster.
+
+``ROSTER_FORMAT`` is part of the roster's cache key: bump it whenever the
+structure below changes so old entries are never read by new code.
+"""
+
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from django.utils.text import slugify
+
+from .data_version import content_digest
+
+ROSTER_FORMAT = 3
+
+
+def roster_digest(players: List[Dict[str, Any]]) -> str:
+    """
+    Get a stable digest of roster content.
+
+    Args:
+        players: Formatted league players
+
+    Returns:
+        Hex digest that only changes when a player's data changes
+    """
+    return content_digest(players)
+
+
+def _team_name(player: Dict[str, Any]) -> str:
+    stats = player.get('statistics', [{}])[0] if player.get('statistics') else {}
+    return (stats.get('team') or {}).get('name') or ''
+
+
+def roster_slugs(players: List[Dict[str, Any]]) -> List[str]:
+    """
+    Get a unique slug for every player.
+
+    Args:
+        players: Formatted league players
+
+    Returns:
+        Slugs in player order: the slug of the name, qualified with the club
+        when several players share it, and with the player id when that is
+        still not unique. Players without a name get an empty slug.
+    """
+    bases = [slugify(player.get('player', {}).get('name') or '') for player in players]
+    base_counts = Counter(base for base in bases if base)
+
+    slugs = []
+    for base, player in zip(bases, players):
+        if base and base_counts[base] > 1:
+            club = slugify(_team_name(player))
+            base = f"{base}-{club}" if club else base
+        slugs.append(base)
+
+    # Same name at the same club, or a qualified slug equal to another name
+    counts = Counter(slug for slug in slugs if slug)
+    return [
+        f"{slug}-{player.get('player', {}).get('id')}" if slug and counts[slug] > 1 else slug
+        for slug, player in zip(slugs, players)
+    ]
+
+
+def build_league_roster(players: List[Dict[str, Any]], season: int,
+                        complete: bool = True, now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Build the materialized roster for a league season.
+
+    Args:
+        players: Formatted league players (see
+            APIFootballService.get_all_league_players)
+        season: Season year the players belong to
+        complete: Whether every team's squad was loaded
+        now: Build timestamp (defaults to time.time())
+
+    Returns:
+        Roster dict with the players and their lookup indexes
+    """
+    by_id = {}
+    by_slug = {}
+    same_name = {}
+    positions = set()
+    teams = set()
+    slugs = roster_slugs(players)
+
+    for position, (player, slug) in enumerate(zip(players, slugs)):
+        info = player.get('player', {})
+        stats = player.get('statistics', [{}])[0] if player.get('statistics') else {}
+
+        if info.get('id') is not None:
+            # String keys, so the roster survives JSON cache codecs
+            by_id.setdefault(str(info['id']), position)
+        if slug:
+            by_slug[slug] = position
+            base = slugify(info.get('name') or '')
+            if base != slug:
+                same_name.setdefault(base, []).append(position)
+
+        if stats.get('games', {}).get('position'):
+            positions.add(stats['games']['position'])
+        if stats.get('team', {}).get('name'):
+            teams.add(stats['team']['name'])
+
+    # The bare name keeps resolving, to the first player who has it
+    for base, colliding in same_name.items():
+        by_slug.setdefault(base, colliding[0])
+
+    return {
+        'format': ROSTER_FORMAT,
+        'season': season,
+        'version': roster_digest(players),
+        'built_at': time.time() if now is None else now,
+        'complete': complete,
+        'players': players,
+        'by_id': by_id,
+        'slugs': slugs,
+        'by_slug': by_slug,
+        'same_name': same_name,
+        'positions': sorted(positions),
+        'teams': sorted(teams),
+    }
+
+
+def roster_player_by_slug(roster: Dict[str, Any], slug: str) -> Optional[Dict[str, Any]]:
+    """Look up a roster player by the slug of their name."""
+    position = roster.get('by_slug', {}).get(slug)
+    return roster['players'][position] if position is not None else None
+
+
+def roster_slug_record(roster: Dict[str, Any], slug: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up what a player page needs for a slug.
+
+    Returns:
+        Dict with the player, their unique ``slug`` and ``same_name``, the
+        other players sharing their name (each with slug, name and team),
+        or None if no player has the slug
+    """
+    position = roster.get('by_slug', {}).get(slug)
+    if position is None:
+        return None
+    player = roster['players'][position]
+    base = slugify(player.get('player', {}).get('name') or '')
+    same_name = [
+        {
+            'slug': roster['slugs'][other],
+            'name': roster['players'][other].get('player', {}).get('name'),
+            'team': _team_name(roster['players'][other]),
+        }
+        for other in roster.get('same_name', {}).get(base, []) if other != position
+    ]
+    return {'player': player, 'slug': roster['slugs'][position], 'same_name': same_name}
+
+
+def roster_slug_index(roster: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Get the slug record of every slug that resolves (see roster_slug_record)."""
+    return {slug: roster_slug_record(roster, slug) for slug in roster.get('by_slug', {})}
+
+
+def roster_player_by_id(roster: Dict[str, Any], player_id: int) -> Optional[Dict[str, Any]]:
+    """Look up a roster player by API-Football player id."""
+    position = roster.get('by_id', {}).get(str(player_id))
+    return roster['players'][position] if position is not None else None
@@ -0,0 +1,179 @@
+"""
+Read path over the locally synced API-Football data.
+
+The sync pipeline (see ``football_sync``) stores upstream payloads in the
+teams, players and matches models. This store answers the client's most
+frequent queries from those tables, in exactly the shape the API returns,
+so pages are served from the database instead of the upstream.
+
+Every method returns ``None`` when it can't answer: the dataset was never
+synced for the season, its last successful sync is older than
+``max_age``, or (for fixtures) a match in the result may be in play right
+now. The client then falls back to the API.
+
+Freshness is read from the ``SyncState`` rows of the league, which are
+kept in process memory for ``state_ttl`` seconds: every query needs them,
+and on deployments that never ran the sync they would otherwise cost a
+database round trip per query just to learn there is nothing to serve.
+"""
+
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .ttl_policy import DAY, FINISHED_STATUSES, HOUR, IN_PLAY_STATUSES
+
+# Kickoff to final whistle, with stoppages and extra time
+MATCH_WINDOW = timedelta(hours=3)
+
+
+class LocalFootballStore:
+    """
+    API-shaped queries over the synced models.
+    """
+
+    # Seconds after its last successful sync that a dataset is still served
+    max_age = {
+        'teams': 2 * DAY,
+        'standings': HOUR,
+        'squads': 2 * DAY,
+        'fixtures': HOUR,
+        'player_stats': 2 * DAY,
+    }
+
+    def __init__(self, league_id: int, max_age: Dict[str, int] = None, state_ttl: float = 10):
+        """
+        Args:
+            league_id: League the store answers for
+            max_age: Overrides for the per-dataset maximum age
+            state_ttl: Seconds the sync state read from the database is reused
+        """
+        self.league_id = league_id
+        self.max_age = {**self.max_age, **(max_age or {})}
+        self.state_ttl = state_ttl
+        self._sync_state: Optional[Dict[Tuple[str, int], Any]] = None
+        self._sync_state_expires = 0.0
+        self._sync_state_lock = threading.Lock()
+
+    def last_success(self, dataset: str, season: int) -> Optional[Any]:
+        """When a dataset was last synced successfully for the season, or None if never."""
+        from apps.core.models import SyncState
+
+        with self._sync_state_lock:
+            if self._sync_state is None or time.monotonic() >= self._sync_state_expires:
+                rows = SyncState.objects.filter(league_id=self.league_id).values_list(
+                    'dataset', 'season', 'last_success_at'
+                )
+                self._sync_state = {(name, year): at for name, year, at in rows}
+                self._sync_state_expires = time.monotonic() + self.state_ttl
+            return self._sync_state.get((dataset, int(season)))
+
+    def forget_sync_state(self) -> None:
+        """Read the sync state from the database again on the next query."""
+        with self._sync_state_lock:
+            self._sync_state = None
+
+    def is_fresh(self, dataset: str, season: int) -> bool:
+        """Whether a dataset has been synced for the season recently enough to serve."""
+        last_success_at = self.last_success(dataset, season)
+        if last_success_at is None:
+            return False
+        return timezone.now() - last_success_at <= timedelta(seconds=self.max_age[dataset])
+
+    def get_teams(self, season: int) -> Optional[List[Dict[str, Any]]]:
+        """Teams of the league season, as returned by the teams endpoint."""
+        from apps.teams.models import Team
+
+        if not self.is_fresh('teams', season):
+            return None
+        teams = Team.objects.filter(seasons__league_id=self.league_id, seasons__season=season)
+        return [team.raw for team in teams.only('raw')] or None
+
+    def get_standings(self, season: int) -> Optional[List[Dict[str, Any]]]:
+        """League table rows, as returned by the standings endpoint."""
+        from apps.teams.models import Standing
+
+        if not self.is_fresh('standings', season):
+            return None
+        standings = Standing.objects.filter(league_id=self.league_id, season=season).order_by('rank')
+        return [standing.raw for standing in standings.only('raw')] or None
+
+    def get_fixtures(self, season: int, status: str = None, team_id: int = None,
+                     last: int = None, next: int = None) -> Optional[List[Dict[str, Any]]]:
+        """Fixtures filtered like the fixtures endpoint's query parameters."""
+        from apps.matches.models import Fixture
+
+        statuses = set(status.split('-')) if status else set()
+        if statuses & IN_PLAY_STATUSES or not self.is_fresh('fixtures', season):
+            return None
+
+        now = timezone.now()
+        fixtures = Fixture.objects.only('raw', 'date', 'status_short').filter(
+            league_id=self.league_id, season=season,
+        )
+        if statuses:
+            fixtures = fixtures.filter(status_short__in=statuses)
+        if team_id:
+            fixtures = fixtures.filter(Q(home_team__api_id=team_id) | Q(away_team__api_id=team_id))
+        if last:
+            fixtures = fixtures.filter(status_short__in=FINISHED_STATUSES, date__lte=now).order_by('-date')[:last]
+        elif next:
+            fixtures = fixtures.filter(date__gt=now).exclude(status_short__in=FINISHED_STATUSES).order_by('date')[:next]
+        else:
+            fixtures = fixtures.order_by('date')
+
+        fixtures = list(fixtures)
+        # Anything that may be playing right now is only current upstream
+        if any(self._may_be_in_play(fixture, now) for fixture in fixtures):
+            return None
+        return [fixture.raw for fixture in fixtures]
+
+    @staticmethod
+    def _may_be_in_play(fixture, now) -> bool:
+        if fixture.status_short in IN_PLAY_STATUSES:
+            return True
+        return fixture.status_short not in FINISHED_STATUSES and now - MATCH_WINDOW <= fixture.date <= now
+
+    def get_team_squad(self, team_id: int, season: int) -> Optional[List[Dict[str, Any]]]:
+        """A team's current squad, as returned by the squads endpoint."""
+        from apps.players.models import PlayerSeason
+
+        if not self.is_fresh('squads', season):
+            return None
+        members = PlayerSeason.objects.filter(
+            team__api_id=team_id, league_id=self.league_id, season=season, squad_raw__isnull=False,
+        ).order_by('id')
+        return [member.squad_raw for member in members.only('squad_raw')] or None
+
+    def get_top_scorers(self, season: int, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Top scorers, as returned by the topscorers endpoint."""
+        return self._leaders(season, 'goals', ['-goals', '-assists', 'minutes'], limit)
+
+    def get_top_assists(self, season: int, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Top assist providers, as returned by the topassists endpoint."""
+        return self._leaders(season, 'assists', ['-assists', '-goals', 'minutes'], limit)
+
+    def get_league_player_stats(self, season: int) -> Optional[List[Dict[str, Any]]]:
+        """League statistics of every player, as returned by the players endpoint."""
+        from apps.players.models import PlayerSeason
+
+        if not self.is_fresh('player_stats', season):
+            return None
+        seasons = PlayerSeason.objects.only('stats_raw').filter(
+            league_id=self.league_id, season=season, stats_raw__isnull=False,
+        ).order_by('id')
+        return [player_season.stats_raw for player_season in seasons] or None
+
+    def _leaders(self, season: int, field: str, ordering: List[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        from apps.players.models import PlayerSeason
+
+        if not self.is_fresh('player_stats', season):
+            return None
+        leaders = PlayerSeason.objects.only('stats_raw').filter(
+            league_id=self.league_id, season=season, stats_raw__isnull=False, **{f'{field}__gt': 0},
+        ).order_by(*ordering)[:limit]
+        return [leader.stats_raw for leader in leaders] or None
@@ -0,0 +1,233 @@
+"""
+In-process cache tier in front of the shared cache.
+
+A page render reads the same handful of hot entries (standings, top
+scorers, fixtures) on every request, and each read is a round trip to the
+shared cache. ``LocalTier`` keeps recently read entries in process memory:
+
+* bounded by entry count and by encoded bytes, evicting the least recently
+  used entries first;
+* each entry lives at most ``ttl`` seconds locally, and never past its soft
+  expiry, so stale-while-revalidate still happens against the shared tier;
+* entries are kept encoded (see ``cache_codec``) and decoded on every hit,
+  so callers never share payload objects and can't corrupt each other.
+
+Invalidation across workers uses version stamps. Every write to the shared
+cache bumps a small version counter stored next to the entry. Each process
+reads the versions of the keys it holds locally at most once per
+``check_interval`` (one ``get_many`` round trip) and drops entries whose
+stamp has moved, so a rewritten entry is served stale for at most
+``check_interval`` seconds instead of ``ttl``.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+
+from .cache_entry import ENTRY_MARKER
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalEntry:
+    __slots__ = ('value', 'size', 'expires', 'version')
+
+    def __init__(self, value: Dict[str, Any], size: int, expires: float, version: Optional[int]):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.version = version
+
+
+class LocalTier:
+    """
+    Bounded LRU/TTL cache of encoded entries with version-stamp invalidation.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024,
+                 ttl: float = 30.0, check_interval: float = 1.0,
+                 version_suffix: str = ':tier_version'):
+        """
+        Args:
+            max_entries: Entries kept in memory
+            max_bytes: Encoded payload bytes kept in memory
+            ttl: Seconds an entry is served locally at most
+            check_interval: Seconds between version checks against the shared cache
+            version_suffix: Suffix of an entry's version key in the shared cache
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.version_suffix = version_suffix
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, _LocalEntry]' = OrderedDict()
+        self._bytes = 0
+        self._checked_at = 0.0
+        self._evictions = 0
+
+    def version_key(self, key: str) -> str:
+        """Shared cache key holding an entry's version stamp."""
+        return f"{key}{self.version_suffix}"
+
+    @staticmethod
+    def _size(value: Any) -> Optional[int]:
+        """Encoded size of a cache entry, or None for values the tier doesn't keep."""
+        if isinstance(value, dict) and ENTRY_MARKER in value and isinstance(value.get('data'), bytes):
+            return len(value['data'])
+        return None
+
+    # Reads
+
+    def get(self, key: str, now: float = None) -> Optional[Dict[str, Any]]:
+        """
+        Get an entry as it was read from the shared cache.
+
+        Args:
+            key: Cache key
+            now: Current timestamp (defaults to time.time())
+
+        Returns:
+            The encoded entry, or None when not held or expired locally
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            local = self._entries.get(key)
+            if local is None:
+                return None
+            if now >= local.expires:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return local.value
+
+    def needs_check(self, now: float = None) -> bool:
+        """Whether the version stamps are due to be checked."""
+        now = time.time() if now is None else now
+        return bool(self._entries) and now - self._checked_at >= self.check_interval
+
+    def check_versions(self, now: float = None) -> None:
+        """Drop entries rewritten in the shared cache since they were read."""
+        keys = self._begin_check(now)
+        if keys:
+            try:
+                versions = cache.get_many([self.version_key(key) for key in keys])
+            except Exception as e:
+                logger.debug(f"Could not check local tier versions: {e}")
+                return
+            self._apply_versions(keys, versions)
+
+    async def acheck_versions(self, now: float = None) -> None:
+        """Drop entries rewritten in the shared cache since they were read (async)."""
+        keys = self._begin_check(now)
+        if keys:
+            try:
+                versions = await cache.aget_many([self.version_key(key) for key in keys])
+            except Exception as e:
+                logger.debug(f"Could not check local tier versions: {e}")
+                return
+            self._apply_versions(keys, versions)
+
+    def _begin_check(self, now: Optional[float]) -> List[str]:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._checked_at = now
+            return list(self._entries)
+
+    def _apply_versions(self, keys: List[str], versions: Dict[str, Any]) -> None:
+        with self._lock:
+            for key in keys:
+                local = self._entries.get(key)
+                if local is not None and versions.get(self.version_key(key)) != local.version:
+                    self._discard(key)
+
+    # Writes
+
+    def put(self, key: str, value: Any, version: Optional[int], now: float = None) -> None:
+        """
+        Keep an entry read from the shared cache.
+
+        Args:
+            key: Cache key
+            value: Encoded entry as returned by the shared cache
+            version: The entry's version stamp, read together with it
+            now: Current timestamp (defaults to time.time())
+        """
+        size = self._size(value)
+        if size is None or size > self.max_bytes:
+            return
+        now = time.time() if now is None else now
+        expires = min(now + self.ttl, value.get('soft_expires', now + self.ttl))
+        if expires <= now:
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = _LocalEntry(value, size, expires, version)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop an entry from this process."""
+        with self._lock:
+            self._discard(key)
+
+    def bump(self, key: str, timeout: int) -> None:
+        """
+        Mark an entry as rewritten in the shared cache.
+
+        Args:
+            key: Cache key that was written
+            timeout: Timeout of the written entry; its version lives as long
+        """
+        self.invalidate(key)
+        version_key = self.version_key(key)
+        try:
+            if not cache.add(version_key, 1, timeout):
+                cache.incr(version_key)
+        except ValueError:
+            # Expired between add and incr
+            cache.add(version_key, 1, timeout)
+        except Exception as e:
+            logger.debug(f"Could not bump local tier version for {key}: {e}")
+
+    async def abump(self, key: str, timeout: int) -> None:
+        """Mark an entry as rewritten in the shared cache (async)."""
+        self.invalidate(key)
+        version_key = self.version_key(key)
+        try:
+            if not await cache.aadd(version_key, 1, timeout):
+                await cache.aincr(version_key)
+        except ValueError:
+            await cache.aadd(version_key, 1, timeout)
+        except Exception as e:
+            logger.debug(f"Could not bump local tier version for {key}: {e}")
+
+    def _discard(self, key: str) -> None:
+        local = self._entries.pop(key, None)
+        if local is not None:
+            self._bytes -= local.size
+
+    def clear(self) -> None:
+        """Drop every entry from this process."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the tier's occupancy for reporting."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'evictions': self._evictions,
+            }
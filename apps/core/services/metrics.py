@@ -0,0 +1,103 @@
+"""
+Lightweight in-process counters and histograms for the API-Football client.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+# Upper bounds in seconds of the default latency buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CounterSet:
+    """
+    Thread-safe counters keyed by name and endpoint.
+
+    Incrementing is a dict update under a lock, cheap enough to call on every
+    cache lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+
+    def incr(self, name: str, endpoint: str = '', amount: int = 1) -> None:
+        """Increment a counter, optionally scoped to an endpoint."""
+        with self._lock:
+            self._counts[(name, endpoint)] += amount
+
+    def get(self, name: str, endpoint: str = None) -> int:
+        """Get a counter value; summed over all endpoints when none is given."""
+        with self._lock:
+            if endpoint is not None:
+                return self._counts.get((name, endpoint), 0)
+            return sum(count for (key, _), count in self._counts.items() if key == name)
+
+    def snapshot(self) -> Dict[Tuple[str, str], int]:
+        """Get a copy of all counters keyed by (name, endpoint)."""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        """Reset every counter to zero."""
+        with self._lock:
+            self._counts.clear()
+
+
+class HistogramSet:
+    """
+    Thread-safe histograms keyed by name and endpoint.
+
+    Observing a value is a bisect and three updates under a lock; the
+    per-bucket counts are only made cumulative when a snapshot is taken.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Increasing upper bounds of the buckets; values above
+                the last bound fall in an implicit +Inf bucket
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], List[int]] = {}
+        self._sums: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def observe(self, name: str, endpoint: str, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        key = (name, endpoint)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._sums[key] += value
+
+    def snapshot(self) -> Dict[Tuple[str, str], Tuple[List[int], float, int]]:
+        """
+        Get every histogram keyed by (name, endpoint).
+
+        Returns:
+            Dict of (cumulative count per bucket including +Inf, sum, count)
+        """
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+
+        snapshot = {}
+        for key, counts, total in items:
+            cumulative = []
+            running = 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            snapshot[key] = (cumulative, total, running)
+        return snapshot
+
+    def reset(self) -> None:
+        """Drop every observation."""
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
@@ -0,0 +1,258 @@
+"""
+In-memory faceted index of the league's players.
+
+The players page used to filter the whole roster per request, with a
+case-insensitive scan of every player dict per filter, and rendered every
+match. The index is built once per roster and leaderboards version and
+kept in process memory instead:
+
+* every facet value (position, team, nationality) maps to a bitmap, an
+  int whose bit ``i`` is set when player ``i`` has the value, so a filter
+  is an AND of at most three ints and its count a popcount;
+* facet counts for the unfiltered roster are computed at build time; the
+  counts under a filter (how many of the matching players play for each
+  team, say) are a popcount per value;
+* every sort order is a precomputed list of player positions, so a page
+  of a filtered, sorted listing walks that list only until the page is
+  full.
+
+Players carry their league totals from the leaderboards (goals, assists,
+appearances, cards), on top of the squad data of the roster.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.utils.text import slugify
+
+from .data_version import VersionedMemo
+
+FACETS = ('position', 'team', 'nationality')
+
+# Sort name: key of a player row; best first
+SORTS = {
+    'goals': lambda row: (-_stat(row, 'goals', 'total'), -_stat(row, 'goals', 'assists'), _name(row)),
+    'assists': lambda row: (-_stat(row, 'goals', 'assists'), -_stat(row, 'goals', 'total'), _name(row)),
+    'age': lambda row: (row['player'].get('age') is None, row['player'].get('age') or 0, _name(row)),
+    'name': lambda row: (_name(row),),
+}
+
+DEFAULT_SORT = 'goals'
+
+
+def _stat(row: Dict[str, Any], group: str, field: str) -> int:
+    return (row['statistics'][0].get(group) or {}).get(field) or 0
+
+
+def _name(row: Dict[str, Any]) -> str:
+    return (row['player'].get('name') or '').lower()
+
+
+def _facet_value(row: Dict[str, Any], facet: str) -> str:
+    stats = row['statistics'][0]
+    if facet == 'position':
+        return (stats.get('games') or {}).get('position') or ''
+    if facet == 'team':
+        return (stats.get('team') or {}).get('name') or ''
+    return row['player'].get('nationality') or ''
+
+
+def player_rows(roster: Dict[str, Any], leaderboards: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Join the roster's players with their league totals.
+
+    Args:
+        roster: League roster (see league_roster.build_league_roster)
+        leaderboards: Leaderboards of the same season (see
+            leaderboards.build_leaderboards), if available
+
+    Returns:
+        One row per roster player, in roster order: the player with their
+        unique ``slug``, and a statistics entry with the squad's team and
+        position and the league totals of the leaderboards
+    """
+    totals = {
+        item['player']['id']: item['statistics'][0]
+        for item in (leaderboards or {}).get('players') or []
+    }
+    slugs = roster.get('slugs') or []
+
+    rows = []
+    for position, player in enumerate(roster['players']):
+        info = player.get('player', {})
+        squad = player['statistics'][0] if player.get('statistics') else {}
+        league = totals.get(info.get('id'))
+        statistics = squad
+        if league is not None:
+            statistics = {
+                **league,
+                # The current squad wins over the club played for most this season
+                'team': squad.get('team') or league.get('team'),
+                'games': {
+                    **(league.get('games') or {}),
+                    'position': (squad.get('games') or {}).get('position')
+                    or (league.get('games') or {}).get('position'),
+                },
+            }
+        slug = slugs[position] if position < len(slugs) else slugify(info.get('name') or '')
+        rows.append({'player': info, 'statistics': [statistics], 'slug': slug})
+    return rows
+
+
+class PlayerResults(Sequence):
+    """
+    Players matching a filter, in a sort order, read lazily.
+
+    Has a length and supports slicing, so it can be handed to Django's
+    Paginator: a page only visits the players up to its end.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], order: List[int], mask: int, full: bool):
+        self._rows = rows
+        self._order = order
+        self._mask = mask
+        self._full = full
+        self._count = mask.bit_count()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            if self._full:
+                return [self._rows[position] for position in self._order[start:stop:step]]
+            return list(self._matching(stop))[start:stop:step]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('player results index out of range')
+        return self[index:index + 1][0]
+
+    def _matching(self, stop: int) -> Iterable[Dict[str, Any]]:
+        """The first ``stop`` matching rows in order."""
+        found = 0
+        mask = self._mask
+        for position in self._order:
+            if found >= stop:
+                return
+            if mask >> position & 1:
+                found += 1
+                yield self._rows[position]
+
+
+class PlayerIndex:
+    """
+    Bitmap facets and sort orders over a list of player rows.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        """
+        Args:
+            rows: Player rows (see player_rows)
+        """
+        self.rows = rows
+        self.all = (1 << len(rows)) - 1
+        self.bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+
+        for position, row in enumerate(rows):
+            bit = 1 << position
+            for facet in FACETS:
+                value = _facet_value(row, facet)
+                if value:
+                    bitmaps = self.bitmaps[facet]
+                    bitmaps[value] = bitmaps.get(value, 0) | bit
+
+        # Filter values are matched case-insensitively
+        self._values = {
+            facet: {value.lower(): value for value in bitmaps}
+            for facet, bitmaps in self.bitmaps.items()
+        }
+        self.values = {facet: sorted(bitmaps) for facet, bitmaps in self.bitmaps.items()}
+        self.counts = {
+            facet: {value: bitmap.bit_count() for value, bitmap in bitmaps.items()}
+            for facet, bitmaps in self.bitmaps.items()
+        }
+        self.orders = {
+            name: sorted(range(len(rows)), key=lambda position, key=key: key(rows[position]))
+            for name, key in SORTS.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def resolve(self, facet: str, value: Optional[str]) -> Optional[str]:
+        """The facet value a filter names, ignoring case, or None if no player has it."""
+        if not value:
+            return None
+        return self._values[facet].get(value.strip().lower())
+
+    def mask(self, filters: Dict[str, Optional[str]], exclude: Optional[str] = None) -> int:
+        """
+        Get the bitmap of the players matching every filter.
+
+        Args:
+            filters: Facet value per facet; empty values don't filter
+            exclude: Facet whose filter to leave out (for its facet counts)
+
+        Returns:
+            Bitmap of the matching players; a filter on a value no player
+            has matches nothing
+        """
+        mask = self.all
+        for facet, value in filters.items():
+            if facet == exclude or not value:
+                continue
+            resolved = self.resolve(facet, value)
+            mask &= self.bitmaps[facet][resolved] if resolved else 0
+        return mask
+
+    def facet_counts(self, facet: str, filters: Dict[str, Optional[str]]) -> List[Tuple[str, int]]:
+        """
+        Count the players per value of a facet, under the other facets' filters.
+
+        Returns:
+            (value, count) pairs in value order, including values with no
+            matching players
+        """
+        mask = self.mask(filters, exclude=facet)
+        if mask == self.all:
+            counts = self.counts[facet]
+            return [(value, counts[value]) for value in self.values[facet]]
+        bitmaps = self.bitmaps[facet]
+        return [(value, (bitmaps[value] & mask).bit_count()) for value in self.values[facet]]
+
+    def query(self, filters: Dict[str, Optional[str]], sort: str = DEFAULT_SORT) -> PlayerResults:
+        """
+        Get the players matching every filter, in a sort order.
+
+        Args:
+            filters: Facet value per facet (see mask)
+            sort: Sort name, one of ``SORTS``; unknown names use the default
+
+        Returns:
+            Lazily read results (see PlayerResults)
+        """
+        order = self.orders.get(sort) or self.orders[DEFAULT_SORT]
+        mask = self.mask(filters)
+        return PlayerResults(self.rows, order, mask, full=mask == self.all)
+
+
+def build_player_index(roster: Dict[str, Any], leaderboards: Optional[Dict[str, Any]] = None) -> PlayerIndex:
+    """
+    Build the faceted index of a roster's players.
+
+    Args:
+        roster: League roster (see league_roster.build_league_roster)
+        leaderboards: Leaderboards with the players' league totals
+
+    Returns:
+        The index
+    """
+    return PlayerIndex(player_rows(roster, leaderboards))
+
+
+class PlayerIndexMemo(VersionedMemo):
+    """
+    Player indexes kept in process memory, keyed by the versions they were built from.
+    """
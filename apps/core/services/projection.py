@@ -0,0 +1,181 @@
+"""
+Per-endpoint field projection for cached API-Football payloads.
+
+Upstream responses carry much more than the site reads: league metadata
+and flags on every player statistic, every season's coverage table on the
+league, fixture periods, referees and events, and so on. Projecting each
+response down to the fields the views, templates and JSON endpoints use
+before it is cached cuts cache memory, the bytes moved on every cache hit
+and the time spent unpickling them.
+
+A schema is a dict of the keys to keep. A key maps to ``KEEP`` to keep its
+whole value, or to a nested schema; lists are projected element by
+element. Keys missing from a payload stay missing, so projected payloads
+read exactly like the originals with ``.get()`` and in templates.
+
+Adding a field to a template means adding it here too; the cache key
+version (``API_FOOTBALL_CACHE_VERSION``) must then be bumped so entries
+projected under the old schema are not served.
+"""
+
+import json
+import pickle
+from typing import Any, Dict, Optional
+
+KEEP = True
+
+TEAM = {'id': KEEP, 'name': KEEP, 'logo': KEEP}
+
+FIXTURE = {
+    'fixture': {
+        'id': KEEP,
+        'date': KEEP,
+        'timestamp': KEEP,
+        'status': KEEP,
+        'venue': {'id': KEEP, 'name': KEEP, 'city': KEEP},
+    },
+    'league': {'id': KEEP, 'season': KEEP, 'round': KEEP},
+    'teams': {'home': {**TEAM, 'winner': KEEP}, 'away': {**TEAM, 'winner': KEEP}},
+    'goals': KEEP,
+    # Only present on fixtures fetched by id; used for formation usage and
+    # for crediting clean sheets to the starting goalkeeper
+    'lineups': {'team': TEAM, 'formation': KEEP, 'startXI': {'player': {'id': KEEP, 'pos': KEEP}}},
+}
+
+PLAYER = {
+    'id': KEEP,
+    'name': KEEP,
+    'firstname': KEEP,
+    'lastname': KEEP,
+    'age': KEEP,
+    'birth': {'date': KEEP, 'place': KEEP},
+    'nationality': KEEP,
+    'height': KEEP,
+    'weight': KEEP,
+    'photo': KEEP,
+}
+
+PLAYER_STATISTICS = {
+    'player': PLAYER,
+    'statistics': {
+        'team': TEAM,
+        # Tells league entries from cup entries when totals are summed (see leaderboards)
+        'league': {'id': KEEP},
+        'games': KEEP,
+        'goals': KEEP,
+        'shots': KEEP,
+        'passes': KEEP,
+        'fouls': KEEP,
+        'cards': KEEP,
+        'penalty': KEEP,
+    },
+}
+
+STANDING = {
+    'rank': KEEP,
+    'team': TEAM,
+    'points': KEEP,
+    'goalsDiff': KEEP,
+    'form': KEEP,
+    'description': KEEP,
+    'all': KEEP,
+    'home': KEEP,
+    'away': KEEP,
+}
+
+PROJECTIONS: Dict[str, Dict[str, Any]] = {
+    'leagues': {
+        'league': {'id': KEEP, 'name': KEEP, 'type': KEEP, 'logo': KEEP},
+        'country': {'name': KEEP, 'code': KEEP, 'flag': KEEP},
+        # Each season otherwise carries its full coverage table
+        'seasons': {'year': KEEP, 'start': KEEP, 'end': KEEP, 'current': KEEP},
+    },
+    'standings': {
+        'league': {'id': KEEP, 'name': KEEP, 'season': KEEP, 'standings': STANDING},
+    },
+    'fixtures': FIXTURE,
+    'fixtures/headtohead': FIXTURE,
+    'players': PLAYER_STATISTICS,
+    'players/topscorers': PLAYER_STATISTICS,
+    'players/topassists': PLAYER_STATISTICS,
+    'teams/statistics': {
+        'team': TEAM,
+        'form': KEEP,
+        'fixtures': KEEP,
+        'goals': KEEP,
+        'clean_sheet': KEEP,
+        'failed_to_score': KEEP,
+        'cards': KEEP,
+        'lineups': KEEP,
+    },
+    'coachs': {
+        'id': KEEP,
+        'name': KEEP,
+        'age': KEEP,
+        'birth': {'date': KEEP},
+        'nationality': KEEP,
+        'photo': KEEP,
+        'team': TEAM,
+        'career': {'team': TEAM, 'start': KEEP, 'end': KEEP},
+    },
+}
+
+# Envelope keys kept around the projected ``response``
+ENVELOPE = ('errors', 'results', 'paging', 'response')
+
+
+def project(value: Any, schema: Any) -> Any:
+    """
+    Project a value onto a schema.
+
+    Args:
+        value: Decoded JSON value
+        schema: ``KEEP`` or a dict of keys to keep
+
+    Returns:
+        A copy of ``value`` with only the schema's keys
+    """
+    if schema is KEEP:
+        return value
+    if isinstance(value, list):
+        return [project(item, schema) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub_schema) for key, sub_schema in schema.items() if key in value}
+    return value
+
+
+def project_response(endpoint: str, data: Dict[str, Any],
+                     projections: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Project an upstream response for caching.
+
+    Endpoints without a schema are returned unchanged.
+
+    Args:
+        endpoint: API endpoint path
+        data: Decoded response body
+        projections: Schemas by endpoint (defaults to PROJECTIONS)
+
+    Returns:
+        The response with its envelope trimmed and each item projected
+    """
+    schema = (PROJECTIONS if projections is None else projections).get(endpoint.strip('/'))
+    if schema is None or not isinstance(data, dict):
+        return data
+    projected = {key: data[key] for key in ENVELOPE if key in data}
+    projected['response'] = project(data.get('response') or [], schema)
+    return projected
+
+
+def payload_size(data: Any) -> Dict[str, int]:
+    """
+    Measure a payload as it is cached and as it travels.
+
+    Returns:
+        Dict with the pickled size (what the cache stores) and the compact
+        JSON size, in bytes
+    """
+    return {
+        'pickle': len(pickle.dumps(data, pickle.HIGHEST_PROTOCOL)),
+        'json': len(json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')),
+    }
@@ -0,0 +1,229 @@
+"""
+Upstream quota governor shared by every worker process.
+
+API-Football enforces a per-minute and a per-day request quota. The
+governor keeps a budget for both in the shared cache, so all workers draw
+from the same allowance, and corrects its view of the daily budget from the
+rate-limit headers on every upstream response.
+
+Requests are admitted by priority. Each priority may only spend the budget
+down to its own floor:
+
+* ``PRIORITY_LIVE`` (in-play data) may use the whole budget;
+* ``PRIORITY_NORMAL`` (page requests) stops at the live reserve;
+* ``PRIORITY_LOW`` (background refreshes, warming) stops earlier still, so
+  refreshes are deferred long before pages start failing.
+
+Budgets are spent through atomic ``add``/``incr`` counters, one per minute
+and one per UTC day (the upstream's reset time), which every Django cache
+backend supports without extra locking. If the cache is unavailable the
+governor fails open: the upstream's own limits still apply.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_LIVE = 'live'
+PRIORITY_NORMAL = 'normal'
+PRIORITY_LOW = 'low'
+
+# Upstream rate-limit headers: daily quota and per-minute quota
+DAY_LIMIT_HEADER = 'x-ratelimit-requests-limit'
+DAY_REMAINING_HEADER = 'x-ratelimit-requests-remaining'
+MINUTE_LIMIT_HEADER = 'x-ratelimit-limit'
+MINUTE_REMAINING_HEADER = 'x-ratelimit-remaining'
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    """Read an integer header, tolerating missing or malformed values."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class QuotaGovernor:
+    """
+    Priority-aware request budget for the upstream API.
+    """
+
+    def __init__(self, per_minute: int = 300, per_day: int = 7500,
+                 live_reserve: float = 0.1, low_priority_floor: float = 0.25,
+                 prefix: str = 'api_football:quota'):
+        """
+        Args:
+            per_minute: Requests allowed per minute (until the upstream reports its own)
+            per_day: Requests allowed per UTC day (until the upstream reports its own)
+            live_reserve: Share of each budget only live requests may use
+            low_priority_floor: Share of each budget low-priority requests must leave
+            prefix: Cache key prefix for the shared counters
+        """
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.live_reserve = live_reserve
+        self.low_priority_floor = low_priority_floor
+        self.prefix = prefix
+
+    def _minute_key(self, now: float) -> str:
+        return f"{self.prefix}:minute:{int(now // 60)}"
+
+    def _day_key(self, now: float) -> str:
+        return f"{self.prefix}:day:{time.strftime('%Y%m%d', time.gmtime(now))}"
+
+    def _upstream_key(self) -> str:
+        return f"{self.prefix}:upstream"
+
+    def _floor(self, limit: int, priority: str) -> int:
+        """Budget a priority must leave unused."""
+        if priority == PRIORITY_LIVE:
+            return 0
+        if priority == PRIORITY_LOW:
+            return int(limit * max(self.low_priority_floor, self.live_reserve))
+        return int(limit * self.live_reserve)
+
+    def _limits(self, upstream: Dict[str, Any]) -> Dict[str, int]:
+        return {
+            'minute': upstream.get('minute_limit') or self.per_minute,
+            'day': upstream.get('day_limit') or self.per_day,
+        }
+
+    def acquire(self, priority: str = PRIORITY_NORMAL, now: float = None) -> bool:
+        """
+        Take one request from the budget.
+
+        Args:
+            priority: PRIORITY_LIVE, PRIORITY_NORMAL or PRIORITY_LOW
+            now: Current timestamp (defaults to time.time())
+
+        Returns:
+            True if the request may be sent, False if it must be deferred
+        """
+        now = time.time() if now is None else now
+        minute_key = self._minute_key(now)
+        day_key = self._day_key(now)
+
+        try:
+            upstream = cache.get(self._upstream_key()) or {}
+            limits = self._limits(upstream)
+
+            cache.add(minute_key, 0, 120)
+            cache.add(day_key, 0, 2 * 86400)
+            minute_used = cache.incr(minute_key)
+            day_used = cache.incr(day_key)
+        except Exception as e:
+            logger.warning(f"Quota counters unavailable, allowing request: {e}")
+            return True
+
+        # Budget left before this request
+        minute_remaining = limits['minute'] - (minute_used - 1)
+        day_remaining = self._day_remaining(limits['day'], day_used - 1, upstream, day_key)
+
+        if (minute_remaining > self._floor(limits['minute'], priority) and
+                day_remaining > self._floor(limits['day'], priority)):
+            return True
+
+        # Give the unused request back
+        try:
+            cache.decr(minute_key)
+            cache.decr(day_key)
+        except Exception:
+            pass
+        logger.info(
+            f"Quota governor deferred a {priority} request "
+            f"(minute remaining {minute_remaining}, day remaining {day_remaining})"
+        )
+        return False
+
+    @staticmethod
+    def _day_remaining(limit: int, used: int, upstream: Dict[str, Any], day_key: str) -> int:
+        """
+        Estimate the daily budget left.
+
+        The upstream's count also includes requests made outside this
+        deployment, so its last report (minus what was sent since) caps the
+        local estimate.
+        """
+        remaining = limit - used
+        if upstream.get('day_remaining') is not None and upstream.get('day') == day_key:
+            sent_since_report = max(used - upstream.get('day_used_at_report', used), 0)
+            remaining = min(remaining, upstream['day_remaining'] - sent_since_report)
+        return remaining
+
+    def record_headers(self, headers: Mapping[str, str], now: float = None) -> None:
+        """
+        Update the budget from an upstream response's rate-limit headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+            now: Current timestamp (defaults to time.time())
+        """
+        now = time.time() if now is None else now
+        report = {
+            'day_limit': _header_int(headers, DAY_LIMIT_HEADER),
+            'day_remaining': _header_int(headers, DAY_REMAINING_HEADER),
+            'minute_limit': _header_int(headers, MINUTE_LIMIT_HEADER),
+            'minute_remaining': _header_int(headers, MINUTE_REMAINING_HEADER),
+        }
+        if all(value is None for value in report.values()):
+            return
+
+        day_key = self._day_key(now)
+        try:
+            report.update({
+                'day': day_key,
+                'day_used_at_report': cache.get(day_key, 0),
+                'reported_at': now,
+            })
+            cache.set(self._upstream_key(), report, 2 * 86400)
+        except Exception as e:
+            logger.debug(f"Could not record upstream quota headers: {e}")
+
+    def record_throttled(self, now: float = None) -> None:
+        """Spend the rest of the current minute after the upstream answered 429."""
+        now = time.time() if now is None else now
+        minute_key = self._minute_key(now)
+        try:
+            limits = self._limits(cache.get(self._upstream_key()) or {})
+            cache.set(minute_key, limits['minute'], 120)
+        except Exception as e:
+            logger.debug(f"Could not record upstream throttling: {e}")
+
+    def stats(self, now: float = None) -> Dict[str, Any]:
+        """
+        Get the current budget for reporting.
+
+        Returns:
+            Dict with the limits, usage and remaining budget for the
+            current minute and day, plus the last upstream report
+        """
+        now = time.time() if now is None else now
+        try:
+            upstream = cache.get(self._upstream_key()) or {}
+            minute_used = cache.get(self._minute_key(now), 0)
+            day_used = cache.get(self._day_key(now), 0)
+        except Exception as e:
+            logger.debug(f"Quota counters unavailable: {e}")
+            upstream, minute_used, day_used = {}, 0, 0
+
+        limits = self._limits(upstream)
+        day_remaining = self._day_remaining(limits['day'], day_used, upstream, self._day_key(now))
+
+        return {
+            'minute_limit': limits['minute'],
+            'minute_used': minute_used,
+            'minute_remaining': max(limits['minute'] - minute_used, 0),
+            'day_limit': limits['day'],
+            'day_used': day_used,
+            'day_remaining': max(day_remaining, 0),
+            'upstream_day_remaining': upstream.get('day_remaining'),
+            'upstream_minute_remaining': upstream.get('minute_remaining'),
+            'upstream_reported_at': upstream.get('reported_at'),
+        }
@@ -0,0 +1,290 @@
+"""
+Immutable on-disk archive of completed league seasons.
+
+A finished season never changes, yet its standings, fixtures and scorers
+would otherwise be fetched upstream and held in the shared cache like any
+other data. ``manage.py build_season_archive`` fetches a completed season
+once and writes it to a single file per league-season; the client then
+answers requests for that season from the file, with no upstream call and
+nothing stored in Redis.
+
+File layout (``<league>-<season>.afa``)::
+
+    magic     8 bytes   b'AFSARCH1'
+    length    4 bytes   big-endian length of the header
+    header    JSON      league, season, build time and the section table
+    sections  bytes     one encoded payload per endpoint
+
+Each section is the projected upstream response of one endpoint, encoded
+on its own as compressed JSON (see ``cache_codec``; never pickle, so an
+archive file can't execute code when read). Files are memory-mapped: a
+lookup decodes only the section it needs, straight from the page cache
+shared by every worker, and each lookup gets its own copy of the payload.
+An archive that is rebuilt while a process has it open is picked up when
+the process restarts.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache_codec import CacheCodec, decode
+from .data_version import DataVersion, content_digest
+from .ttl_policy import FINISHED_STATUSES, IN_PLAY_STATUSES
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'AFSARCH1'
+FORMAT_VERSION = 1
+_LENGTH = struct.Struct('>I')
+
+# Archived endpoints and the query that fetches each for a league season
+ARCHIVED_ENDPOINTS = ('leagues', 'standings', 'teams', 'fixtures', 'players/topscorers', 'players/topassists')
+
+# Query parameters the fixtures section can answer by filtering
+FIXTURE_FILTERS = {'status', 'team', 'last', 'next'}
+
+_codec = CacheCodec(serializer='json', compression='zlib', threshold=0)
+
+
+def archive_params(endpoint: str, league_id: int, season: int) -> Dict[str, Any]:
+    """Query parameters that fetch an archived endpoint for a whole league season."""
+    if endpoint == 'leagues':
+        return {'id': league_id, 'season': season}
+    return {'league': league_id, 'season': season}
+
+
+def archive_filename(league_id: int, season: int) -> str:
+    """Name of the archive file of a league season."""
+    return f"{league_id}-{season}.afa"
+
+
+def write_archive(path: str, league_id: int, season: int, sections: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Write a season archive atomically.
+
+    Args:
+        path: File to write
+        league_id: League of the season
+        season: Season year
+        sections: Projected upstream response per endpoint
+
+    Returns:
+        Size of the written file in bytes
+    """
+    blobs = []
+    table = {}
+    offset = 0
+    for endpoint, data in sections.items():
+        tag, blob = _codec.encode(data)
+        table[endpoint] = {
+            'offset': offset,
+            'length': len(blob),
+            'codec': tag,
+            'digest': content_digest(data),
+        }
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = json.dumps({
+        'format': FORMAT_VERSION,
+        'league': league_id,
+        'season': season,
+        'built_at': time.time(),
+        'sections': table,
+    }, separators=(',', ':')).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Readers map the file; replace it in one step so none sees a partial write
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        # Readable by web workers running as another user
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(MAGIC) + _LENGTH.size + len(header) + offset
+
+
+class SeasonArchive:
+    """
+    Read-only, memory-mapped view of one archive file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Archive file
+
+        Raises:
+            ValueError: If the file isn't a season archive of a known format
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a season archive")
+        start = len(MAGIC) + _LENGTH.size
+        (header_length,) = _LENGTH.unpack(self._map[len(MAGIC):start])
+        header = json.loads(self._map[start:start + header_length])
+        if header.get('format') != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} has unsupported archive format {header.get('format')}")
+
+        self.league_id = header['league']
+        self.season = header['season']
+        self.built_at = header['built_at']
+        self.sections = header['sections']
+        self._data_start = start + header_length
+
+    def section(self, endpoint: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Decode one archived response.
+
+        Returns:
+            Tuple of (response, content digest), or None if not archived
+        """
+        entry = self.sections.get(endpoint)
+        if entry is None:
+            return None
+        start = self._data_start + entry['offset']
+        return decode(entry['codec'], self._map[start:start + entry['length']]), entry['digest']
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+
+class SeasonArchiveStore:
+    """
+    API-shaped lookups over the archive files in a directory.
+    """
+
+    def __init__(self, directory: str, league_id: int):
+        """
+        Args:
+            directory: Directory holding the archive files
+            league_id: League the store answers for
+        """
+        self.directory = directory
+        self.league_id = league_id
+        self._lock = threading.Lock()
+        self._archives: Dict[int, SeasonArchive] = {}
+
+    def path(self, season: int) -> str:
+        """Archive file of a season."""
+        return os.path.join(self.directory, archive_filename(self.league_id, season))
+
+    def get(self, season: int) -> Optional[SeasonArchive]:
+        """The archive of a season, opened on first use, or None if there is none."""
+        with self._lock:
+            archive = self._archives.get(season)
+            if archive is not None:
+                return archive
+            path = self.path(season)
+            if not os.path.exists(path):
+                return None
+            try:
+                archive = SeasonArchive(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable season archive {path}: {e}")
+                return None
+            self._archives[season] = archive
+            return archive
+
+    def lookup(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple[Dict[str, Any], DataVersion]]:
+        """
+        Answer a request from the archive.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters of the request
+
+        Returns:
+            Tuple of (API-shaped response, content version), or None when
+            the request isn't for an archived season or asks for something
+            the archive can't answer exactly
+        """
+        if endpoint not in ARCHIVED_ENDPOINTS or not params or 'season' not in params:
+            return None
+        try:
+            season = int(params['season'])
+        except (TypeError, ValueError):
+            return None
+
+        expected = archive_params(endpoint, self.league_id, season)
+        filters = {key: value for key, value in params.items() if key not in expected}
+        if any(str(params.get(key)) != str(value) for key, value in expected.items()):
+            return None
+        if filters and (endpoint != 'fixtures' or set(filters) - FIXTURE_FILTERS):
+            return None
+
+        archive = self.get(season)
+        if archive is None:
+            return None
+        section = archive.section(endpoint)
+        if section is None:
+            return None
+        data, digest = section
+
+        if filters:
+            fixtures = self._filter_fixtures(data.get('response') or [], filters)
+            data = {**data, 'parameters': params, 'results': len(fixtures), 'response': fixtures}
+            digest = content_digest([digest, sorted((key, str(value)) for key, value in filters.items())])
+        return data, DataVersion(1, digest)
+
+    @staticmethod
+    def _filter_fixtures(fixtures: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply the fixtures endpoint's filters to a season of fixtures."""
+        def status(fixture):
+            return fixture.get('fixture', {}).get('status', {}).get('short')
+
+        def kickoff(fixture):
+            return parse_datetime(fixture.get('fixture', {}).get('date') or '') or timezone.now()
+
+        if filters.get('status'):
+            statuses = set(str(filters['status']).split('-'))
+            fixtures = [fixture for fixture in fixtures if status(fixture) in statuses]
+        if filters.get('team'):
+            team_id = int(filters['team'])
+            fixtures = [
+                fixture for fixture in fixtures
+                if team_id in (fixture.get('teams', {}).get('home', {}).get('id'),
+                               fixture.get('teams', {}).get('away', {}).get('id'))
+            ]
+        if filters.get('last'):
+            played = [fixture for fixture in fixtures if status(fixture) in FINISHED_STATUSES]
+            return sorted(played, key=kickoff, reverse=True)[:int(filters['last'])]
+        if filters.get('next'):
+            upcoming = [
+                fixture for fixture in fixtures
+                if status(fixture) not in FINISHED_STATUSES and status(fixture) not in IN_PLAY_STATUSES
+            ]
+            return sorted(upcoming, key=kickoff)[:int(filters['next'])]
+        return sorted(fixtures, key=kickoff)
+
+    def close(self) -> None:
+        """Unmap every open archive."""
+        with self._lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
@@ -0,0 +1,235 @@
+"""
+Single-flight coalescing for concurrent cache misses.
+
+When a popular cache entry expires, every request that misses at the same
+moment would otherwise fire its own upstream call. ``SingleFlight`` lets
+exactly one caller fetch a given key while the others wait for its result:
+
+* inside a process, through a table of in-flight calls guarded by a lock;
+* across worker processes, through a short-lived lock entry in the shared
+  cache. Followers poll the cache for the leader's result and fall back to
+  fetching themselves if it does not arrive in time.
+
+``AsyncSingleFlight`` does the same for coroutines.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call that other threads can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+    """
+
+    def __init__(self, lock_timeout: int = 30, wait_timeout: float = 10.0,
+                 poll_interval: float = 0.05, lock_prefix: str = 'api_football:lock'):
+        """
+        Args:
+            lock_timeout: Seconds before a cross-worker lock expires on its own
+            wait_timeout: Seconds a follower waits before fetching itself
+            poll_interval: Seconds between cache polls while waiting on
+                another worker
+            lock_prefix: Cache key prefix for cross-worker locks
+        """
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.lock_prefix = lock_prefix
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any],
+           check: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Run ``fn`` once for all concurrent callers of ``key``.
+
+        Args:
+            key: Identity of the call, e.g. the request's cache key
+            fn: Function that performs the fetch and stores its result
+            check: Function returning the stored result (or None) so callers
+                can pick up a value written by another worker
+
+        Returns:
+            The result of ``fn``, or the value returned by ``check``
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised in every waiter
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            logger.debug(f"Waiting on in-flight request for {key}")
+            if call.event.wait(self.wait_timeout + self.lock_timeout):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            logger.warning(f"Timed out waiting on in-flight request for {key}")
+            return fn()
+
+        try:
+            call.result = self._do_distributed(key, fn, check)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _do_distributed(self, key: str, fn: Callable[[], Any],
+                        check: Optional[Callable[[], Any]]) -> Any:
+        """Coordinate with other workers through a lock entry in the cache."""
+        lock_key = f"{self.lock_prefix}:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = cache.add(lock_key, token, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"Cache lock unavailable for {key}, fetching directly: {e}")
+            return fn()
+
+        if acquired:
+            try:
+                # Another worker may have stored the value since our cache miss
+                if check is not None:
+                    value = check()
+                    if value is not None:
+                        return value
+                return fn()
+            finally:
+                try:
+                    if cache.get(lock_key) == token:
+                        cache.delete(lock_key)
+                except Exception as e:
+                    logger.debug(f"Failed to release cache lock for {key}: {e}")
+
+        logger.debug(f"Another worker is fetching {key}, waiting for its result")
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            if check is not None:
+                value = check()
+                if value is not None:
+                    return value
+            if cache.get(lock_key) is None:
+                # The other worker finished (or failed) without a usable value
+                break
+
+        logger.info(f"No result from other worker for {key}, fetching directly")
+        return fn()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of ``SingleFlight``.
+
+    Waiters share an ``asyncio.Future`` instead of blocking a thread, and
+    the cross-worker lock uses the cache's async API.
+    """
+
+    def __init__(self, lock_timeout: int = 30, wait_timeout: float = 10.0,
+                 poll_interval: float = 0.05, lock_prefix: str = 'api_football:lock'):
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.lock_prefix = lock_prefix
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]],
+                 check: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """
+        Await ``fn`` once for all concurrent callers of ``key``.
+
+        Args:
+            key: Identity of the call, e.g. the request's cache key
+            fn: Coroutine function that performs the fetch and stores its result
+            check: Coroutine function returning the stored result (or None)
+
+        Returns:
+            The result of ``fn``, or the value returned by ``check``
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            logger.debug(f"Waiting on in-flight request for {key}")
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await self._do_distributed(key, fn, check)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._calls.pop(key, None)
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]],
+                              check: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+        """Coordinate with other workers through a lock entry in the cache."""
+        lock_key = f"{self.lock_prefix}:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await cache.aadd(lock_key, token, self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"Cache lock unavailable for {key}, fetching directly: {e}")
+            return await fn()
+
+        if acquired:
+            try:
+                if check is not None:
+                    value = await check()
+                    if value is not None:
+                        return value
+                return await fn()
+            finally:
+                try:
+                    if await cache.aget(lock_key) == token:
+                        await cache.adelete(lock_key)
+                except Exception as e:
+                    logger.debug(f"Failed to release cache lock for {key}: {e}")
+
+        logger.debug(f"Another worker is fetching {key}, waiting for its result")
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            if check is not None:
+                value = await check()
+                if value is not None:
+                    return value
+            if await cache.aget(lock_key) is None:
+                break
+
+        logger.info(f"No result from other worker for {key}, fetching directly")
+        return await fn()
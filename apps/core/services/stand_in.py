@@ -0,0 +1,568 @@
+"""
+Record/replay stand-in server for the API-Football endpoints.
+
+Point the client at a ``StandInServer`` (``API_FOOTBALL_BASE_URL``) to
+benchmark or load-test the football pages without the live API or its
+quota. For each request the server answers, in order of preference:
+
+1. a recorded response from the fixtures directory, matched on the endpoint
+   and its normalized query parameters;
+2. in capture mode, the live upstream response, which is then recorded;
+3. a deterministic synthetic response in the upstream's format, so every
+   endpoint the client uses works offline without any recordings.
+
+Latency (fixed plus random jitter) and errors (a share of requests answered
+with an error status) can be injected to exercise timeouts, the circuit
+breaker and stale-while-revalidate. Responses carry rate-limit headers like
+the upstream's so the quota governor sees a draining budget.
+
+Recordings are plain JSON files, one per request::
+
+    <fixtures_dir>/<endpoint with / as __>/<request fingerprint>.json
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .cache_keys import normalize_params, request_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Upstream headers worth keeping in a recording
+RECORDED_HEADERS = (
+    'content-type',
+    'x-ratelimit-requests-limit',
+    'x-ratelimit-requests-remaining',
+    'x-ratelimit-limit',
+    'x-ratelimit-remaining',
+)
+
+SYNTHETIC_TEAMS = [
+    'Malmö FF', 'Hammarby', 'AIK', 'Djurgården', 'IFK Göteborg', 'BK Häcken', 'IF Elfsborg',
+    'IK Sirius', 'Mjällby AIF', 'IFK Norrköping', 'GAIS', 'Halmstad', 'IFK Värnamo',
+    'Degerfors IF', 'Östers IF', 'Brommapojkarna',
+]
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Attacker']
+
+
+class FixtureStore:
+    """
+    Recorded responses on disk.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def path(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        endpoint = endpoint.strip('/')
+        return self.directory / endpoint.replace('/', '__') / f"{request_fingerprint(endpoint, params)}.json"
+
+    def load(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the recording for a request, or None."""
+        path = self.path(endpoint, params)
+        if not path.exists():
+            return None
+        with path.open(encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, endpoint: str, params: Dict[str, Any], status: int,
+             headers: Dict[str, str], body: Any) -> Path:
+        """Record a response."""
+        path = self.path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recording = {
+            'endpoint': endpoint.strip('/'),
+            'params': normalize_params(params),
+            'status': status,
+            'headers': headers,
+            'body': body,
+        }
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(recording, f, ensure_ascii=False, indent=1)
+        return path
+
+
+class SyntheticData:
+    """
+    Deterministic, internally consistent league data in the upstream format.
+    """
+
+    def __init__(self, league_id: int = 113, season: int = 2025, squad_size: int = 24):
+        self.league_id = league_id
+        self.season = season
+        self.squad_size = squad_size
+        self.teams = [
+            {'id': 1000 + index, 'name': name, 'logo': f"https://media.api-sports.io/football/teams/{1000 + index}.png"}
+            for index, name in enumerate(SYNTHETIC_TEAMS)
+        ]
+        self.fixtures = self._build_fixtures()
+
+    def respond(self, endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Build the response body for a request."""
+        handler = getattr(self, f"_{endpoint.strip('/').replace('/', '_')}", None)
+        response = handler(params) if handler else []
+        body = {
+            'get': endpoint,
+            'parameters': params,
+            'errors': [],
+            'results': len(response),
+            'paging': {'current': 1, 'total': 1},
+            'response': response,
+        }
+        if isinstance(response, tuple):
+            response, body['paging'] = response
+            body.update({'response': response, 'results': len(response)})
+        return body
+
+    # Helpers
+
+    def _team(self, team_id) -> Dict[str, Any]:
+        team_id = int(team_id)
+        return next((team for team in self.teams if team['id'] == team_id), self.teams[0])
+
+    def _squad(self, team: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'id': team['id'] * 100 + number,
+                'name': f"{chr(65 + number % 26)}. {team['name'].split()[-1]}{number}",
+                'age': 18 + (team['id'] + number) % 16,
+                'number': number,
+                'position': POSITIONS[min(number // 6, 3)],
+                'photo': f"https://media.api-sports.io/football/players/{team['id'] * 100 + number}.png",
+            }
+            for number in range(1, self.squad_size + 1)
+        ]
+
+    def _player_stats(self, team: Dict[str, Any], player: Dict[str, Any]) -> Dict[str, Any]:
+        seed = player['id']
+        goals = (seed * 7) % 13 if player['position'] == 'Attacker' else (seed * 3) % 4
+        return {
+            'player': {
+                'id': player['id'],
+                'name': player['name'],
+                'firstname': player['name'].split()[0],
+                'lastname': player['name'].split()[-1],
+                'age': player['age'],
+                'birth': {'date': None, 'place': None, 'country': 'Sweden'},
+                'nationality': ['Sweden', 'Norway', 'Denmark', 'Finland', 'Iceland'][seed % 5],
+                'height': f"{170 + seed % 25} cm",
+                'weight': f"{65 + seed % 20} kg",
+                'photo': player['photo'],
+            },
+            'statistics': [{
+                'team': team,
+                'league': {'id': self.league_id, 'name': 'Allsvenskan', 'season': self.season},
+                'games': {
+                    'appearences': 10 + seed % 15,
+                    'minutes': 900 + (seed * 37) % 1200,
+                    'position': player['position'],
+                    'rating': f"{6 + (seed % 20) / 10:.1f}",
+                },
+                'goals': {'total': goals, 'assists': (seed * 5) % 7, 'conceded': 0, 'saves': None},
+                'cards': {'yellow': seed % 5, 'red': int(seed % 17 == 0)},
+            }],
+        }
+
+    def _build_fixtures(self) -> List[Dict[str, Any]]:
+        """Double round robin, played weekly; the first half of the season is finished."""
+        start = datetime.now(timezone.utc).replace(hour=15, minute=0, second=0, microsecond=0)
+        teams = self.teams
+        rounds = []
+        rotation = teams[1:]
+        for _ in range(len(teams) - 1):
+            lineup = [teams[0]] + rotation
+            rounds.append([(lineup[i], lineup[-1 - i]) for i in range(len(lineup) // 2)])
+            rotation = rotation[-1:] + rotation[:-1]
+        rounds += [[(away, home) for home, away in matches] for matches in rounds]
+
+        fixtures = []
+        played_rounds = len(rounds) // 2
+        for round_index, matches in enumerate(rounds):
+            kickoff = start + timedelta(weeks=round_index - played_rounds)
+            finished = round_index < played_rounds
+            for match_index, (home, away) in enumerate(matches):
+                fixture_id = 900000 + round_index * 100 + match_index
+                home_goals = (fixture_id * 7) % 4 if finished else None
+                away_goals = (fixture_id * 3) % 3 if finished else None
+                fixtures.append({
+                    'fixture': {
+                        'id': fixture_id,
+                        'referee': None,
+                        'timezone': 'UTC',
+                        'date': kickoff.isoformat(),
+                        'timestamp': int(kickoff.timestamp()),
+                        'venue': {'id': home['id'], 'name': f"{home['name']} Arena", 'city': None},
+                        'status': {
+                            'long': 'Match Finished' if finished else 'Not Started',
+                            'short': 'FT' if finished else 'NS',
+                            'elapsed': 90 if finished else None,
+                        },
+                    },
+                    'league': {
+                        'id': self.league_id, 'name': 'Allsvenskan', 'country': 'Sweden',
+                        'season': self.season, 'round': f"Regular Season - {round_index + 1}",
+                    },
+                    'teams': {
+                        'home': {**home, 'winner': finished and home_goals > away_goals or None},
+                        'away': {**away, 'winner': finished and away_goals > home_goals or None},
+                    },
+                    'goals': {'home': home_goals, 'away': away_goals},
+                    'score': {'fulltime': {'home': home_goals, 'away': away_goals}},
+                })
+        return fixtures
+
+    def _lineups(self, fixture: Dict[str, Any]) -> List[Dict[str, Any]]:
+        formations = ['4-4-2', '4-3-3', '3-5-2', '4-2-3-1']
+        return [
+            {
+                'team': side,
+                'formation': formations[(fixture['fixture']['id'] + side['id']) % len(formations)],
+                'startXI': [{'player': {'id': p['id'], 'name': p['name'], 'number': p['number'], 'pos': p['position'][0]}}
+                            for p in self._squad(self._team(side['id']))[:11]],
+                'substitutes': [],
+            }
+            for side in (fixture['teams']['home'], fixture['teams']['away'])
+        ]
+
+    # Endpoints
+
+    def _leagues(self, params):
+        return [{
+            'league': {'id': self.league_id, 'name': 'Allsvenskan', 'type': 'League',
+                       'logo': f"https://media.api-sports.io/football/leagues/{self.league_id}.png"},
+            'country': {'name': 'Sweden', 'code': 'SE'},
+            'seasons': [{'year': self.season, 'current': True}],
+        }]
+
+    def _standings(self, params):
+        def record():
+            return {'played': 0, 'win': 0, 'draw': 0, 'lose': 0, 'goals': {'for': 0, 'against': 0}}
+
+        table = {team['id']: {'all': record(), 'home': record(), 'away': record(), 'form': ''} for team in self.teams}
+        for fixture in self.fixtures:
+            if fixture['fixture']['status']['short'] != 'FT':
+                continue
+            home, away = fixture['teams']['home']['id'], fixture['teams']['away']['id']
+            home_goals, away_goals = fixture['goals']['home'], fixture['goals']['away']
+            for team_id, side, scored, conceded in ((home, 'home', home_goals, away_goals),
+                                                    (away, 'away', away_goals, home_goals)):
+                result = 'W' if scored > conceded else 'D' if scored == conceded else 'L'
+                for split in ('all', side):
+                    row = table[team_id][split]
+                    row['played'] += 1
+                    row['goals']['for'] += scored
+                    row['goals']['against'] += conceded
+                    row[{'W': 'win', 'D': 'draw', 'L': 'lose'}[result]] += 1
+                table[team_id]['form'] = (table[team_id]['form'] + result)[-5:]
+
+        def points(team):
+            totals = table[team['id']]['all']
+            return totals['win'] * 3 + totals['draw'], totals['goals']['for'] - totals['goals']['against']
+
+        standings = []
+        for rank, team in enumerate(sorted(self.teams, key=points, reverse=True), start=1):
+            row = table[team['id']]
+            team_points, goals_diff = points(team)
+            standings.append({
+                'rank': rank,
+                'team': team,
+                'points': team_points,
+                'goalsDiff': goals_diff,
+                'group': 'Allsvenskan',
+                'form': row['form'],
+                'status': 'same',
+                'description': None,
+                'all': row['all'],
+                'home': row['home'],
+                'away': row['away'],
+                'update': datetime.now(timezone.utc).isoformat(),
+            })
+        return [{'league': {'id': self.league_id, 'name': 'Allsvenskan', 'country': 'Sweden', 'season': self.season,
+                            'standings': [standings]}}]
+
+    def _fixtures(self, params):
+        if params.get('live'):
+            return []
+        fixtures = self.fixtures
+        if params.get('id'):
+            ids = {int(params['id'])}
+        elif params.get('ids'):
+            ids = {int(fixture_id) for fixture_id in params['ids'].split('-')}
+        else:
+            ids = None
+        if ids is not None:
+            return [{**fixture, 'lineups': self._lineups(fixture)}
+                    for fixture in fixtures if fixture['fixture']['id'] in ids]
+
+        if params.get('team'):
+            team_id = int(params['team'])
+            fixtures = [f for f in fixtures if team_id in (f['teams']['home']['id'], f['teams']['away']['id'])]
+        if params.get('status'):
+            statuses = set(params['status'].split('-'))
+            fixtures = [f for f in fixtures if f['fixture']['status']['short'] in statuses]
+        if params.get('from') and params.get('to'):
+            fixtures = [f for f in fixtures if params['from'] <= f['fixture']['date'][:10] <= params['to']]
+        if params.get('last'):
+            fixtures = [f for f in fixtures if f['fixture']['status']['short'] == 'FT'][-int(params['last']):]
+        if params.get('next'):
+            fixtures = [f for f in fixtures if f['fixture']['status']['short'] == 'NS'][:int(params['next'])]
+        return fixtures
+
+    def _fixtures_lineups(self, params):
+        fixture = next((f for f in self.fixtures if str(f['fixture']['id']) == params.get('fixture')), None)
+        if fixture is None or fixture['fixture']['status']['short'] != 'FT':
+            return []
+        return self._lineups(fixture)
+
+    def _fixtures_headtohead(self, params):
+        pair = {int(team_id) for team_id in params.get('h2h', '').split('-') if team_id}
+        return [f for f in self.fixtures
+                if {f['teams']['home']['id'], f['teams']['away']['id']} == pair][-int(params.get('last', 10)):]
+
+    def _teams(self, params):
+        teams = self.teams
+        if params.get('id'):
+            teams = [self._team(params['id'])]
+        return [
+            {
+                'team': {**team, 'code': team['name'][:3].upper(), 'country': 'Sweden', 'founded': 1900 + team['id'] % 100,
+                         'national': False},
+                'venue': {'id': team['id'], 'name': f"{team['name']} Arena", 'city': 'Sweden',
+                          'capacity': 10000 + (team['id'] * 997) % 25000, 'surface': 'grass',
+                          'address': None, 'image': None},
+            }
+            for team in teams
+        ]
+
+    def _teams_statistics(self, params):
+        team = self._team(params.get('team', self.teams[0]['id']))
+        row = next(r for r in self._standings(params)[0]['league']['standings'][0] if r['team']['id'] == team['id'])
+        totals = row['all']
+        return {
+            'team': team,
+            'league': {'id': self.league_id, 'season': self.season},
+            'form': row['form'],
+            'fixtures': {
+                'played': {'total': totals['played']},
+                'wins': {'total': totals['win']},
+                'draws': {'total': totals['draw']},
+                'loses': {'total': totals['lose']},
+            },
+            'goals': {
+                'for': {'total': {'total': totals['goals']['for']}},
+                'against': {'total': {'total': totals['goals']['against']}},
+            },
+            'clean_sheet': {'total': totals['played'] // 3},
+            'lineups': [{'formation': '4-4-2', 'played': totals['played']}],
+        }
+
+    def _players_squads(self, params):
+        team = self._team(params.get('team', self.teams[0]['id']))
+        return [{'team': team, 'players': self._squad(team)}]
+
+    def _league_player_stats(self) -> List[Dict[str, Any]]:
+        return [self._player_stats(team, player) for team in self.teams for player in self._squad(team)]
+
+    def _players_topscorers(self, params):
+        players = sorted(self._league_player_stats(), key=lambda p: -p['statistics'][0]['goals']['total'])
+        return players[:20]
+
+    def _players_topassists(self, params):
+        players = sorted(self._league_player_stats(), key=lambda p: -p['statistics'][0]['goals']['assists'])
+        return players[:20]
+
+    def _players(self, params):
+        players = self._league_player_stats()
+        if params.get('id'):
+            return [p for p in players if str(p['player']['id']) == params['id']]
+        if params.get('search'):
+            return [p for p in players if params['search'].lower() in p['player']['name'].lower()]
+        page, per_page = int(params.get('page', 1)), 20
+        total = (len(players) + per_page - 1) // per_page
+        return players[(page - 1) * per_page:page * per_page], {'current': page, 'total': total}
+
+    def _transfers(self, params):
+        return []
+
+    def _coachs(self, params):
+        if params.get('id'):
+            team = self.teams[int(params['id']) % len(self.teams)]
+        else:
+            team = self._team(params.get('team', self.teams[0]['id']))
+        return [{
+            'id': team['id'],
+            'name': f"Coach {team['name']}",
+            'age': 50,
+            'nationality': 'Sweden',
+            'photo': None,
+            'team': team,
+            'career': [{'team': team, 'start': f"{self.season - 2}-01-01", 'end': None}],
+        }]
+
+    def _venues(self, params):
+        teams = self._teams({'id': params['id']} if params.get('id') else {})
+        return [team['venue'] for team in teams]
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.stand_in.handle(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """
+    Local HTTP server that replays, captures or synthesizes API-Football responses.
+
+    Example::
+
+        with StandInServer(fixtures_dir='var/api_football', latency=0.05) as server:
+            service.base_url = server.url
+            ...
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 500, capture_url: Optional[str] = None,
+                 capture_headers: Optional[Dict[str, str]] = None, daily_quota: int = 7500,
+                 synthetic: Optional[SyntheticData] = None, seed: Optional[int] = None):
+        """
+        Args:
+            fixtures_dir: Directory of recordings (None to only synthesize)
+            host: Interface to listen on
+            port: Port to listen on (0 for any free port)
+            latency: Seconds added to every response
+            jitter: Maximum random seconds added on top of ``latency``
+            error_rate: Share of requests (0-1) answered with ``error_status``
+            error_status: HTTP status of injected errors
+            capture_url: Upstream base URL; unrecorded requests are forwarded
+                there and recorded (requires ``fixtures_dir``)
+            capture_headers: Headers for upstream requests, e.g. the API key
+            daily_quota: Daily limit reported in the rate-limit headers
+            synthetic: Source of synthetic responses
+            seed: Seed for latency jitter and error injection
+        """
+        if capture_url and not fixtures_dir:
+            raise ValueError("Capture mode needs a fixtures directory to record into")
+        self.store = FixtureStore(fixtures_dir) if fixtures_dir else None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.capture_url = capture_url.rstrip('/') if capture_url else None
+        self.capture_headers = capture_headers or {}
+        self.daily_quota = daily_quota
+        self.synthetic = synthetic or SyntheticData()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'replayed': 0, 'captured': 0, 'synthetic': 0, 'errors': 0}
+        self.connections = set()
+
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StandInServer':
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        """Answer one request."""
+        split = urlsplit(request.path)
+        endpoint = split.path.strip('/')
+        params = dict(parse_qsl(split.query))
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.connections.add(request.client_address)
+            remaining = max(self.daily_quota - self.stats['requests'], 0)
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            inject_error = self.error_rate and self._random.random() < self.error_rate
+
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            with self._lock:
+                self.stats['errors'] += 1
+            status, headers = self.error_status, {}
+            body = {'errors': {'stand_in': 'Injected error'}, 'response': []}
+        else:
+            status, headers, body = self._respond(endpoint, params)
+
+        payload = json.dumps(body).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        request.send_header('x-ratelimit-requests-limit', str(self.daily_quota))
+        request.send_header('x-ratelimit-requests-remaining', str(remaining))
+        for name, value in headers.items():
+            if name.lower() not in ('content-type', 'content-length') and not name.lower().startswith('x-ratelimit'):
+                request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _respond(self, endpoint: str, params: Dict[str, str]):
+        if self.store is not None:
+            recording = self.store.load(endpoint, params)
+            if recording is not None:
+                self._count('replayed')
+                return recording['status'], recording.get('headers', {}), recording['body']
+
+        if self.capture_url:
+            response = requests.get(
+                f"{self.capture_url}/{endpoint}", params=params, headers=self.capture_headers, timeout=30,
+            )
+            headers = {name: value for name, value in response.headers.items() if name.lower() in RECORDED_HEADERS}
+            body = response.json()
+            path = self.store.save(endpoint, params, response.status_code, headers, body)
+            logger.info(f"Captured {endpoint} {params} to {path}")
+            self._count('captured')
+            return response.status_code, headers, body
+
+        self._count('synthetic')
+        return 200, {}, self.synthetic.respond(endpoint, params)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,430 @@
+"""
+Telemetry of the API-Football client in the Prometheus text format.
+
+The client already counts what it does in a ``CounterSet`` (cache reads
+by tier, upstream requests, errors by class, bytes received, ...) and
+times every upstream call in a ``HistogramSet``. This module turns those,
+plus gauges read at scrape time (quota left, circuit breaker states,
+local tier occupancy), into the text exposition format served at
+``/metrics``.
+
+Upstream requests are also attributed to the page that caused them:
+``UpstreamTelemetryMiddleware`` opens a ``page_scope`` per request and
+names it after the resolved URL, so ``api_football_page_upstream_requests_total``
+shows which pages drive upstream traffic. Calls made outside a request,
+e.g. background refreshes and management commands, count as
+``background``.
+
+The scope also keeps the request's own account: upstream calls, cache
+lookups and time spent in the client, per endpoint. The middleware logs a
+warning when a request makes more upstream calls than
+``API_FOOTBALL_REQUEST_BUDGET``, and ``upstream_budget`` lets tests assert
+the same against the stand-in server.
+
+All values are per process. With several workers, each scrape reports
+the worker that served it; scrape every worker, or sum in the query.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metrics import CounterSet
+
+# Page name of the request being handled (see page_scope)
+_page: contextvars.ContextVar = contextvars.ContextVar('api_football_page', default=None)
+
+BACKGROUND = 'background'
+UNRESOLVED = 'unresolved'
+
+PROCESS_STARTED = time.time()
+
+
+# Observers of finished page scopes (see upstream_budget)
+_observers: List[List['PageScope']] = []
+_observers_lock = threading.Lock()
+
+
+class PageScope:
+    """
+    The page a request renders and what its client calls cost.
+
+    Tasks fanned out by the request share the scope, so the account is
+    updated under a lock. Client time is summed over those tasks and can
+    exceed the request's wall time.
+    """
+
+    def __init__(self, name: Optional[str] = None, path: str = ''):
+        self.name = name
+        self.path = path
+        self.counts = CounterSet()
+        self._lock = threading.Lock()
+        self._client_seconds = 0.0
+
+    def count(self, name: str, endpoint: str, amount: int = 1) -> None:
+        """Count a client event ('upstream', 'hit', 'miss', ...) for this request."""
+        self.counts.incr(name, endpoint, amount)
+
+    def add_client_time(self, seconds: float) -> None:
+        """Add time spent in the client."""
+        with self._lock:
+            self._client_seconds += seconds
+
+    @property
+    def client_seconds(self) -> float:
+        with self._lock:
+            return self._client_seconds
+
+    @property
+    def upstream_calls(self) -> int:
+        return self.counts.get('upstream')
+
+    def upstream_by_endpoint(self) -> Dict[str, int]:
+        """Upstream calls per endpoint, most called first."""
+        calls = {endpoint: count for (name, endpoint), count in self.counts.snapshot().items()
+                 if name == 'upstream'}
+        return dict(sorted(calls.items(), key=lambda item: item[1], reverse=True))
+
+    def summary(self) -> str:
+        """One-line account of the request for logging."""
+        hits = sum(self.counts.get(name) for name in LOOKUP_HITS)
+        return (
+            f"{self.upstream_calls} upstream calls, {hits} cache hits, {self.counts.get('miss')} misses, "
+            f"{self.client_seconds * 1000:.0f}ms in the client"
+        )
+
+
+# Lookups answered without going upstream
+LOOKUP_HITS = ('hit', 'stale_hit', 'negative_hit', 'archive_hit')
+
+
+@contextmanager
+def page_scope(name: Optional[str] = None, path: str = '') -> Iterator[PageScope]:
+    """
+    Attribute the client calls made inside the block to a page.
+
+    The name can be set after the block starts, e.g. once the URL has been
+    resolved.
+    """
+    scope = PageScope(name, path)
+    token = _page.set(scope)
+    try:
+        yield scope
+    finally:
+        _page.reset(token)
+        with _observers_lock:
+            for finished in _observers:
+                finished.append(scope)
+
+
+def current_page_scope() -> Optional[PageScope]:
+    """The page scope of the request being handled, if any."""
+    return _page.get()
+
+
+def current_page() -> str:
+    """Name of the page the current upstream call is made for."""
+    scope = _page.get()
+    if scope is None:
+        return BACKGROUND
+    return scope.name or UNRESOLVED
+
+
+def count_for_page(name: str, endpoint: str, amount: int = 1) -> None:
+    """Count a client event against the request being handled, if any."""
+    scope = _page.get()
+    if scope is not None:
+        scope.count(name, endpoint, amount)
+
+
+def accounted(method: Callable) -> Callable:
+    """Add the time spent in a client method, sync or async, to the request's account."""
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                scope = _page.get()
+                if scope is not None:
+                    scope.add_client_time(time.monotonic() - started)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.monotonic()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            scope = _page.get()
+            if scope is not None:
+                scope.add_client_time(time.monotonic() - started)
+    return wrapper
+
+
+@contextmanager
+def upstream_budget(max_calls: int) -> Iterator[List[PageScope]]:
+    """
+    Assert that no request handled inside the block exceeds an upstream budget.
+
+    For tests: render pages with the Django test client while the API
+    client points at a ``StandInServer``, e.g.::
+
+        with StandInServer() as server, upstream_budget(25) as requests:
+            api_football_service.base_url = server.url
+            Client().get('/team/1/')
+        assert requests[0].counts.get('hit') > 0
+
+    Args:
+        max_calls: Upstream calls allowed per request
+
+    Yields:
+        The page scopes of the requests finished so far, in order
+
+    Raises:
+        AssertionError: On leaving the block, if any request went over
+    """
+    finished: List[PageScope] = []
+    with _observers_lock:
+        _observers.append(finished)
+    try:
+        yield finished
+    finally:
+        with _observers_lock:
+            _observers.remove(finished)
+
+    over = [scope for scope in finished if scope.upstream_calls > max_calls]
+    if over:
+        details = '; '.join(
+            f"{scope.path or scope.name}: {scope.upstream_calls} ({scope.upstream_by_endpoint()})" for scope in over
+        )
+        raise AssertionError(f"Upstream budget of {max_calls} calls per request exceeded by {details}")
+
+
+# Counter name: (metric, help, label taking the counter's endpoint, fixed labels)
+COUNTERS: Dict[str, Tuple[str, str, str, Dict[str, str]]] = {
+    'upstream': (
+        'api_football_upstream_requests_total', 'Upstream requests sent', 'endpoint', {},
+    ),
+    'upstream_bytes': (
+        'api_football_upstream_bytes_total', 'Response body bytes received from upstream', 'endpoint', {},
+    ),
+    'page_upstream': (
+        'api_football_page_upstream_requests_total', 'Upstream requests by the page that caused them', 'page', {},
+    ),
+    'local_hit': (
+        'api_football_cache_tier_reads_total', 'Cache reads by tier and result', 'endpoint',
+        {'tier': 'local', 'result': 'hit'},
+    ),
+    'local_miss': (
+        'api_football_cache_tier_reads_total', 'Cache reads by tier and result', 'endpoint',
+        {'tier': 'local', 'result': 'miss'},
+    ),
+    'shared_hit': (
+        'api_football_cache_tier_reads_total', 'Cache reads by tier and result', 'endpoint',
+        {'tier': 'shared', 'result': 'hit'},
+    ),
+    'shared_miss': (
+        'api_football_cache_tier_reads_total', 'Cache reads by tier and result', 'endpoint',
+        {'tier': 'shared', 'result': 'miss'},
+    ),
+    'hit': (
+        'api_football_cache_lookups_total', 'Client lookups by how they were answered', 'endpoint',
+        {'result': 'fresh'},
+    ),
+    'stale_hit': (
+        'api_football_cache_lookups_total', 'Client lookups by how they were answered', 'endpoint',
+        {'result': 'stale'},
+    ),
+    'negative_hit': (
+        'api_football_cache_lookups_total', 'Client lookups by how they were answered', 'endpoint',
+        {'result': 'negative'},
+    ),
+    'miss': (
+        'api_football_cache_lookups_total', 'Client lookups by how they were answered', 'endpoint',
+        {'result': 'miss'},
+    ),
+    'archive_hit': (
+        'api_football_cache_lookups_total', 'Client lookups by how they were answered', 'endpoint',
+        {'result': 'archive'},
+    ),
+    'error_timeout': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'timeout'},
+    ),
+    'error_connection': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'connection'},
+    ),
+    'error_throttled': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'throttled'},
+    ),
+    'error_server': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'server'},
+    ),
+    'error_client': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'client'},
+    ),
+    'error_invalid_json': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'invalid_json'},
+    ),
+    'error_api': (
+        'api_football_upstream_errors_total', 'Failed upstream requests by error class', 'endpoint',
+        {'class': 'api'},
+    ),
+    'negative_store_empty': (
+        'api_football_negative_stores_total', 'Negative cache entries written', 'endpoint', {'kind': 'empty'},
+    ),
+    'negative_store_error': (
+        'api_football_negative_stores_total', 'Negative cache entries written', 'endpoint', {'kind': 'error'},
+    ),
+    'quota_deferred': (
+        'api_football_quota_deferred_total', 'Requests deferred to protect the upstream quota', 'endpoint', {},
+    ),
+    'breaker_rejected': (
+        'api_football_breaker_rejected_total', 'Requests refused by an open circuit breaker', 'endpoint', {},
+    ),
+    'breaker_open': (
+        'api_football_breaker_transitions_total', 'Circuit breaker state changes', 'endpoint', {'state': 'open'},
+    ),
+    'breaker_half_open': (
+        'api_football_breaker_transitions_total', 'Circuit breaker state changes', 'endpoint',
+        {'state': 'half_open'},
+    ),
+    'breaker_closed': (
+        'api_football_breaker_transitions_total', 'Circuit breaker state changes', 'endpoint', {'state': 'closed'},
+    ),
+    'refresh_deferred': (
+        'api_football_refresh_deferred_total', 'Background refreshes deferred by the quota or a breaker', 'endpoint',
+        {},
+    ),
+    'warm_refresh': (
+        'api_football_warm_refreshes_total', 'Entries refreshed ahead of expiry by the cache warmer', 'endpoint', {},
+    ),
+}
+
+# Anything counted but not listed above
+OTHER_COUNTER = ('api_football_events_total', 'Other client events', 'endpoint', {})
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Families:
+    """Samples grouped by metric family, in the order families were first seen."""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def add(self, metric: str, kind: str, help_text: str, labels: Dict[str, Any], value: float,
+            family: str = None) -> None:
+        family = family or metric
+        if family not in self._families:
+            self._families[family] = (kind, help_text, [])
+        self._families[family][2].append(f"{metric}{_labels(labels)} {_number(value)}")
+
+    def render(self) -> str:
+        lines = []
+        for family, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+def render_metrics(clients: Iterable[Tuple[str, Any]]) -> str:
+    """
+    Render the telemetry of API-Football clients in the Prometheus text format.
+
+    Args:
+        clients: (name, APIFootballService) pairs; samples are labelled
+            with the client name
+
+    Returns:
+        Exposition text (version 0.0.4); the quota and transport are read
+        from the first client
+    """
+    clients = list(clients)
+    families = _Families()
+
+    for client, service in clients:
+        for (name, endpoint), value in sorted(service.cache_stats.snapshot().items()):
+            metric, help_text, label, fixed = COUNTERS.get(name, OTHER_COUNTER)
+            labels = {'client': client, **fixed}
+            if name not in COUNTERS:
+                labels['event'] = name
+            if endpoint:
+                labels[label] = endpoint
+            families.add(metric, 'counter', help_text, labels, value)
+
+    for client, service in clients:
+        buckets = service.latency.buckets
+        for (name, endpoint), (cumulative, total, count) in sorted(service.latency.snapshot().items()):
+            family = f"api_football_{name}_latency_seconds"
+            help_text = f"Latency of {name} calls in seconds"
+            labels = {'client': client, 'endpoint': endpoint}
+            for bound, bucket_count in zip([*buckets, float('inf')], cumulative):
+                families.add(f"{family}_bucket", 'histogram', help_text,
+                             {**labels, 'le': _number(bound)}, bucket_count, family=family)
+            families.add(f"{family}_sum", 'histogram', help_text, labels, total, family=family)
+            families.add(f"{family}_count", 'histogram', help_text, labels, count, family=family)
+
+    # Clients sharing a breaker or local tier (see APIFootballService.PROCESS_STATE) report it once
+    reported = set()
+    for client, service in clients:
+        if id(service.breaker) not in reported:
+            reported.add(id(service.breaker))
+            for endpoint, state in sorted(service.get_breaker_states().items()):
+                families.add('api_football_breaker_open', 'gauge', 'Whether an endpoint\'s circuit breaker is open',
+                             {'client': client, 'endpoint': endpoint}, 1 if state == 'open' else 0)
+        if service.local_tier is not None and id(service.local_tier) not in reported:
+            reported.add(id(service.local_tier))
+            tier = service.local_tier.stats()
+            families.add('api_football_local_tier_entries', 'gauge', 'Entries held in the in-process cache tier',
+                         {'client': client}, tier['entries'])
+            families.add('api_football_local_tier_bytes', 'gauge', 'Encoded bytes held in the in-process cache tier',
+                         {'client': client}, tier['bytes'])
+            families.add('api_football_local_tier_evictions_total', 'counter',
+                         'Entries evicted from the in-process cache tier', {'client': client}, tier['evictions'])
+
+    # The quota is shared by every client and worker
+    if clients:
+        quota = clients[0][1].get_quota_stats()
+        for window in ('minute', 'day'):
+            families.add('api_football_quota_remaining', 'gauge', 'Upstream requests left in the quota window',
+                         {'window': window}, quota[f'{window}_remaining'])
+            families.add('api_football_quota_limit', 'gauge', 'Upstream requests allowed in the quota window',
+                         {'window': window}, quota[f'{window}_limit'])
+
+        # Only the sync client sends through the pooled transport
+        transport = clients[0][1].get_transport_stats()
+        families.add('api_football_transport_requests_total', 'counter',
+                     'Requests sent through the pooled upstream transport', {}, transport['requests'])
+        families.add('api_football_transport_connections_opened_total', 'counter',
+                     'Upstream connections opened by the pooled transport', {}, transport['connections_opened'])
+
+    families.add('api_football_process_start_time_seconds', 'gauge',
+                 'Start time of the process reporting these values', {}, PROCESS_STARTED)
+    return families.render()
@@ -0,0 +1,214 @@
+"""
+Declarative, match-state-aware TTL policy for cached API-Football responses.
+
+A policy is an ordered table of rules. Each rule can match on the endpoint,
+on query parameters and on the payload itself (e.g. "contains an in-play
+fixture"); the first matching rule decides the TTL. The decision carries
+the rule name so callers can log or report why an entry lives as long as
+it does.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cache_keys import normalize_params
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+# Long enough to be effectively permanent without pinning memory forever
+IMMUTABLE = 30 * DAY
+
+# API-Football fixture status codes
+IN_PLAY_STATUSES = {'1H', 'HT', '2H', 'ET', 'BT', 'P', 'SUSP', 'INT', 'LIVE'}
+# Played to a final result; the fixture no longer changes
+COMPLETED_STATUSES = {'FT', 'AET', 'PEN'}
+# Over without a played result: cancelled and abandoned matches are often
+# rescheduled, and awarded results and walkovers are decided after the fact
+SETTLED_STATUSES = {'CANC', 'ABD', 'AWD', 'WO'}
+FINISHED_STATUSES = COMPLETED_STATUSES | SETTLED_STATUSES
+
+# Marker for rules that only require a parameter to be present
+PRESENT = object()
+
+
+def _fixture_statuses(data: Optional[Dict[str, Any]]) -> List[str]:
+    """Get the short status code of every fixture in a payload."""
+    statuses = []
+    for item in (data or {}).get('response') or []:
+        if isinstance(item, dict):
+            status = item.get('fixture', {}).get('status', {}).get('short')
+            if status:
+                statuses.append(status)
+    return statuses
+
+
+def has_in_play_fixture(endpoint: str, params: Dict[str, str],
+                        data: Optional[Dict[str, Any]], context: Dict[str, Any]) -> bool:
+    """Payload contains at least one fixture that is currently being played."""
+    return any(status in IN_PLAY_STATUSES for status in _fixture_statuses(data))
+
+
+def all_fixtures_completed(endpoint: str, params: Dict[str, str],
+                           data: Optional[Dict[str, Any]], context: Dict[str, Any]) -> bool:
+    """Payload only contains fixtures played to a final result."""
+    statuses = _fixture_statuses(data)
+    return bool(statuses) and all(status in COMPLETED_STATUSES for status in statuses)
+
+
+def all_fixtures_finished(endpoint: str, params: Dict[str, str],
+                          data: Optional[Dict[str, Any]], context: Dict[str, Any]) -> bool:
+    """Payload only contains fixtures that are over, played or not."""
+    statuses = _fixture_statuses(data)
+    return bool(statuses) and all(status in FINISHED_STATUSES for status in statuses)
+
+
+def is_past_season(endpoint: str, params: Dict[str, str],
+                   data: Optional[Dict[str, Any]], context: Dict[str, Any]) -> bool:
+    """Request targets a season that has already been completed."""
+    season = params.get('season')
+    current_season = context.get('current_season')
+    if not season or not current_season:
+        return False
+    try:
+        return int(season) < int(current_season)
+    except ValueError:
+        return False
+
+
+class TTLRule:
+    """
+    A single row in the TTL policy table.
+
+    A rule matches when every condition it declares holds: the endpoint is
+    one of ``endpoints``, each entry in ``params`` is present (and equal,
+    unless the value is ``PRESENT``), and ``predicate`` returns True.
+    """
+
+    def __init__(self, name: str, ttl: int, endpoints: Iterable[str] = None,
+                 params: Dict[str, Any] = None,
+                 predicate: Callable[..., bool] = None,
+                 stale_grace: int = None):
+        """
+        Args:
+            name: Identifier reported with every decision made by this rule
+            ttl: Seconds until entries matched by this rule become stale
+            endpoints: Endpoints this rule applies to (all when omitted)
+            params: Required query parameters
+            predicate: Extra check called with (endpoint, params, data, context)
+            stale_grace: Stale-while-revalidate grace override for this rule
+        """
+        self.name = name
+        self.ttl = ttl
+        self.endpoints = set(endpoints) if endpoints else None
+        self.params = params or {}
+        self.predicate = predicate
+        self.stale_grace = stale_grace
+
+    def matches(self, endpoint: str, params: Dict[str, str],
+                data: Optional[Dict[str, Any]], context: Dict[str, Any]) -> bool:
+        """Check whether this rule applies to a request and its payload."""
+        if self.endpoints is not None and endpoint not in self.endpoints:
+            return False
+        for key, expected in self.params.items():
+            if key not in params:
+                return False
+            if expected is not PRESENT and params[key] != str(expected):
+                return False
+        if self.predicate is not None and not self.predicate(endpoint, params, data, context):
+            return False
+        return True
+
+    def __repr__(self):
+        return f"TTLRule({self.name!r}, ttl={self.ttl})"
+
+
+class TTLDecision:
+    """The TTL chosen for a response and the rule that chose it."""
+
+    def __init__(self, ttl: int, rule: str, stale_grace: int = None):
+        self.ttl = ttl
+        self.rule = rule
+        self.stale_grace = stale_grace
+
+    def __repr__(self):
+        return f"TTLDecision(ttl={self.ttl}, rule={self.rule!r})"
+
+
+class TTLPolicy:
+    """Ordered rule table; the first matching rule wins."""
+
+    def __init__(self, rules: List[TTLRule], default_ttl: int = 30 * MINUTE):
+        self.rules = list(rules)
+        self.default_ttl = default_ttl
+
+    def resolve(self, endpoint: str, params: Dict[str, Any] = None,
+                data: Optional[Dict[str, Any]] = None,
+                context: Dict[str, Any] = None) -> TTLDecision:
+        """
+        Choose the TTL for an upstream response.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters of the request
+            data: Parsed response payload
+            context: Extra facts for predicates, e.g. ``current_season``
+
+        Returns:
+            TTLDecision with the TTL in seconds and the matching rule name
+        """
+        endpoint = endpoint.strip('/')
+        normalized = normalize_params(params)
+        context = context or {}
+        for rule in self.rules:
+            if rule.matches(endpoint, normalized, data, context):
+                return TTLDecision(rule.ttl, rule.name, rule.stale_grace)
+        return TTLDecision(self.default_ttl, 'default')
+
+    def explain(self, endpoint: str, params: Dict[str, Any] = None,
+                data: Optional[Dict[str, Any]] = None,
+                context: Dict[str, Any] = None) -> List[Tuple[str, bool]]:
+        """Evaluate every rule and report which ones match, in table order."""
+        endpoint = endpoint.strip('/')
+        normalized = normalize_params(params)
+        context = context or {}
+        return [(rule.name, rule.matches(endpoint, normalized, data, context)) for rule in self.rules]
+
+
+DEFAULT_TTL_RULES = [
+    # Live data first: anything in play must refresh within seconds
+    TTLRule('live-fixtures', 15, endpoints=['fixtures'], params={'live': PRESENT}, stale_grace=15),
+    TTLRule('in-play-fixtures', 30, endpoints=['fixtures', 'fixtures/lineups'],
+            predicate=has_in_play_fixture, stale_grace=15),
+
+    # Data that can no longer change
+    TTLRule('past-season', IMMUTABLE, predicate=is_past_season),
+    TTLRule('finished-fixture', IMMUTABLE, endpoints=['fixtures'], params={'id': PRESENT},
+            predicate=all_fixtures_completed),
+    TTLRule('finished-fixtures-batch', IMMUTABLE, endpoints=['fixtures'], params={'ids': PRESENT},
+            predicate=all_fixtures_completed),
+    # Cancelled, abandoned or awarded fixtures can still be rescheduled or decided
+    TTLRule('settled-fixture', HOUR, endpoints=['fixtures'], params={'id': PRESENT},
+            predicate=all_fixtures_finished),
+    TTLRule('settled-fixtures-batch', HOUR, endpoints=['fixtures'], params={'ids': PRESENT},
+            predicate=all_fixtures_finished),
+    TTLRule('fixture-lineups', DAY, endpoints=['fixtures/lineups']),
+
+    # Slow-moving reference data
+    TTLRule('squads', DAY, endpoints=['players/squads']),
+    TTLRule('coaches', 3 * DAY, endpoints=['coachs']),
+    TTLRule('venues', 7 * DAY, endpoints=['venues']),
+    TTLRule('teams', DAY, endpoints=['teams']),
+    TTLRule('league-info', DAY, endpoints=['leagues']),
+    TTLRule('transfers', DAY, endpoints=['transfers']),
+    TTLRule('head-to-head', 6 * HOUR, endpoints=['fixtures/headtohead']),
+
+    # Derived datasets built from the responses above
+    TTLRule('league-roster', HOUR, endpoints=['league/roster']),
+    TTLRule('league-leaderboards', HOUR, endpoints=['league/leaderboards']),
+
+    # Current-season aggregates move when matches finish
+    TTLRule('standings', 15 * MINUTE, endpoints=['standings']),
+    TTLRule('fixtures', 15 * MINUTE, endpoints=['fixtures']),
+]
+
+default_ttl_policy = TTLPolicy(DEFAULT_TTL_RULES)
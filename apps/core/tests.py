@@ -1 +1,533 @@
-# Create your tests here.
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase
+from django.utils import timezone
+from django.urls import reverse
+
+from apps.core.services.api_football import APIFootballError, api_football_service
+from apps.core.services.cache_keys import make_cache_key
+from apps.core.services.fanout import FanOut
+from apps.core.models import SyncState
+from apps.core.services.leaderboards import count_clean_sheets, merge_player_statistics
+from apps.core.services.league_roster import (
+    ROSTER_FORMAT,
+    build_league_roster,
+    roster_slug_index,
+    roster_slug_record,
+)
+from apps.core.services.local_store import LocalFootballStore
+from apps.core.services.projection import project_response
+from apps.core.services.stand_in import StandInServer
+from apps.core.services.telemetry import upstream_budget
+from apps.core.services.ttl_policy import (
+    DAY,
+    HOUR,
+    IMMUTABLE,
+    MINUTE,
+    PRESENT,
+    TTLRule,
+    all_fixtures_completed,
+    default_ttl_policy,
+)
+
+FIXTURES_PARAMS = {"league": 113, "season": 2025, "status": "FT-AET", "team": None}
+
+
+def _run_in_process(code, hash_seed):
+    """Run Python code in a fresh interpreter with the given hash seed and return its output."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "PYTHONHASHSEED": str(hash_seed)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+class CacheKeyTests(SimpleTestCase):
+    """Every worker process computes the same cache key for the same request"""
+
+    def test_processes_with_different_hash_seeds_share_keys(self):
+        code = (
+            "from apps.core.services.cache_keys import make_cache_key; "
+            f"print(make_cache_key('fixtures', {FIXTURES_PARAMS!r}))"
+        )
+        first = _run_in_process(code, 1)
+        second = _run_in_process(code, 2)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, make_cache_key("fixtures", FIXTURES_PARAMS))
+
+    def test_processes_are_salted_differently(self):
+        # Guards the test above: keys built from hash() would differ between these processes
+        code = "print(hash('api_football_fixtures'))"
+        self.assertNotEqual(_run_in_process(code, 1), _run_in_process(code, 2))
+
+    def test_parameter_order_and_types_do_not_change_the_key(self):
+        self.assertEqual(
+            make_cache_key("standings", {"league": 113, "season": 2025}),
+            make_cache_key("standings", {"season": "2025", "league": "113"}),
+        )
+        self.assertEqual(
+            make_cache_key("fixtures", {"league": 113, "team": None}),
+            make_cache_key("/fixtures", {"league": 113}),
+        )
+        self.assertNotEqual(
+            make_cache_key("fixtures", {"league": 113, "season": 2025}),
+            make_cache_key("fixtures", {"league": 113, "season": 2024}),
+        )
+
+
+class FanOutTests(SimpleTestCase):
+    """A fan-out run keeps its share of the pool and its tasks' dependencies"""
+
+    def test_run_keeps_at_most_its_limit_of_tasks_in_the_pool(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def task(value):
+            with lock:
+                in_flight.append(value)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(value)
+            return value
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            fanout = FanOut(deadline=5, executor=executor, max_concurrency=2)
+            for value in range(6):
+                fanout.add(str(value), task, value)
+            fanout.add("total", lambda *values: sum(values), depends_on=[str(value) for value in range(6)])
+            result = fanout.run()
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(result["total"], 15)
+        self.assertEqual(result.timed_out, [])
+
+    def test_queued_tasks_count_against_the_deadline(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            fanout = FanOut(deadline=0.15, executor=executor, max_concurrency=1)
+            for name in ("first", "second", "third"):
+                fanout.add(name, time.sleep, 0.1, default="late")
+            result = fanout.run()
+
+        self.assertTrue(result.ok("first"))
+        self.assertEqual(result.get("third"), "late")
+        self.assertIn("third", result.timed_out)
+
+
+class LeaderboardTotalsTests(SimpleTestCase):
+    """League totals count the league's own entries and the matches played to a result"""
+
+    def _entry(self, league_id, team_id, minutes, goals):
+        return {
+            "team": {"id": team_id, "name": f"Team {team_id}"},
+            "league": {"id": league_id, "name": "Competition", "season": 2025},
+            "games": {"appearences": 1, "minutes": minutes},
+            "goals": {"total": goals, "assists": 0},
+            "cards": {"yellow": 0, "red": 0},
+        }
+
+    def test_cup_entries_are_left_out_after_projection(self):
+        payload = {
+            "response": [{
+                "player": {"id": 7, "name": "A. Player"},
+                "statistics": [
+                    self._entry(113, 1, 900, 4),
+                    self._entry(114, 1, 270, 3),
+                    self._entry(113, 2, 450, 2),
+                ],
+            }],
+        }
+        items = project_response("players", payload)["response"]
+        self.assertEqual(items[0]["statistics"][1]["league"], {"id": 114})
+
+        (player,) = merge_player_statistics(items, 113)
+        statistics = player["statistics"][0]
+        self.assertEqual(statistics["goals"]["total"], 6)
+        self.assertEqual(statistics["games"]["minutes"], 1350)
+        self.assertEqual(statistics["team"]["id"], 1)
+
+    def test_clean_sheets_only_count_matches_played_to_a_result(self):
+        keeper = {
+            "player": {"id": 1, "name": "A. Keeper"},
+            "statistics": [{"team": {"id": 10}, "games": {"position": "Goalkeeper", "minutes": 900}}],
+        }
+
+        def fixture(status, home_goals, away_goals):
+            return {
+                "fixture": {"status": {"short": status}},
+                "teams": {"home": {"id": 10}, "away": {"id": 20}},
+                "goals": {"home": home_goals, "away": away_goals},
+            }
+
+        fixtures = [
+            fixture("FT", 1, 0),
+            fixture("AET", 0, 0),
+            fixture("PEN", 2, 0),
+            fixture("ABD", 0, 0),
+            fixture("AWD", 3, 0),
+            fixture("WO", 3, 0),
+            fixture("CANC", 0, 0),
+            fixture("FT", 0, 1),
+        ]
+        self.assertEqual(count_clean_sheets(fixtures, [keeper]), {1: 3})
+
+
+class LocalStoreSyncStateTests(TestCase):
+    """The local store reads the sync state once per state_ttl, not once per query"""
+
+    def test_sync_state_is_reused_between_queries(self):
+        store = LocalFootballStore(113, state_ttl=60)
+        with self.assertNumQueries(1):
+            self.assertFalse(store.is_fresh("teams", 2025))
+            self.assertFalse(store.is_fresh("standings", 2025))
+            self.assertFalse(store.is_fresh("teams", 2025))
+
+        SyncState.objects.create(dataset="teams", league_id=113, season=2025, last_success_at=timezone.now())
+        self.assertFalse(store.is_fresh("teams", 2025))
+
+        store.forget_sync_state()
+        with self.assertNumQueries(1):
+            self.assertTrue(store.is_fresh("teams", 2025))
+            self.assertFalse(store.is_fresh("teams", 2024))
+
+    def test_sync_state_expires(self):
+        store = LocalFootballStore(113, state_ttl=0)
+        with self.assertNumQueries(2):
+            store.is_fresh("teams", 2025)
+            store.is_fresh("teams", 2025)
+
+
+def _player(player_id, name, team):
+    """A formatted league player (see APIFootballService._format_league_player)."""
+    return {
+        "player": {"id": player_id, "name": name},
+        "statistics": [{"team": {"name": team}, "games": {"position": "Midfielder"}}],
+    }
+
+
+class RosterSlugTests(SimpleTestCase):
+    """Every roster player gets a unique slug and bare names keep resolving"""
+
+    def _roster(self, *players):
+        roster = build_league_roster(list(players), 2025, now=0)
+        # Every slug is unique and leads back to its own player
+        self.assertEqual(len(set(roster["slugs"])), len(players))
+        for player, slug in zip(players, roster["slugs"]):
+            self.assertIs(roster_slug_record(roster, slug)["player"], player)
+        return roster
+
+    def test_same_name_at_different_clubs_is_qualified_with_the_club(self):
+        roster = self._roster(
+            _player(1, "Erik Andersson", "AIK"),
+            _player(2, "Erik Andersson", "Hammarby FF"),
+            _player(3, "Oscar Berg", "AIK"),
+        )
+        self.assertEqual(roster["slugs"], ["erik-andersson-aik", "erik-andersson-hammarby-ff", "oscar-berg"])
+
+        # The bare name resolves to the first of them and lists the other
+        record = roster_slug_record(roster, "erik-andersson")
+        self.assertEqual(record["slug"], "erik-andersson-aik")
+        self.assertEqual(
+            record["same_name"],
+            [{"slug": "erik-andersson-hammarby-ff", "name": "Erik Andersson", "team": "Hammarby FF"}],
+        )
+        self.assertEqual(roster_slug_record(roster, "oscar-berg")["same_name"], [])
+
+    def test_same_name_at_the_same_club_falls_back_to_the_player_id(self):
+        roster = self._roster(
+            _player(21, "Johan Larsson", "Malmö FF"),
+            _player(22, "Johan Larsson", "Malmö FF"),
+        )
+        self.assertEqual(roster["slugs"], ["johan-larsson-malmo-ff-21", "johan-larsson-malmo-ff-22"])
+        self.assertEqual(roster_slug_record(roster, "johan-larsson")["slug"], "johan-larsson-malmo-ff-21")
+
+    def test_qualified_slug_colliding_with_another_name_takes_the_player_id(self):
+        roster = self._roster(
+            _player(1, "Erik Andersson", "AIK"),
+            _player(2, "Erik Andersson", "Hammarby FF"),
+            _player(3, "Erik Andersson Aik", "IFK Göteborg"),
+        )
+        self.assertEqual(
+            roster["slugs"], ["erik-andersson-aik-1", "erik-andersson-hammarby-ff", "erik-andersson-aik-3"]
+        )
+        # Both bare slugs resolve to the player whose name they are
+        self.assertEqual(roster_slug_record(roster, "erik-andersson")["slug"], "erik-andersson-aik-1")
+        self.assertEqual(roster_slug_record(roster, "erik-andersson-aik")["slug"], "erik-andersson-aik-3")
+
+    def test_slug_index_holds_every_resolving_slug(self):
+        roster = self._roster(
+            _player(1, "Erik Andersson", "AIK"),
+            _player(2, "Erik Andersson", "Hammarby FF"),
+        )
+        index = roster_slug_index(roster)
+        self.assertEqual(set(index), {"erik-andersson", "erik-andersson-aik", "erik-andersson-hammarby-ff"})
+        self.assertIsNone(roster_slug_record(roster, "erik-andersson-djurgarden"))
+
+
+def _fixtures(*statuses):
+    """A fixtures payload with one fixture per status code."""
+    return {
+        "response": [{"fixture": {"id": index, "status": {"short": status}}} for index, status in enumerate(statuses)]
+    }
+
+
+class TTLPolicyTests(SimpleTestCase):
+    """The default policy picks the TTL class a response belongs to"""
+
+    CONTEXT = {"current_season": 2025}
+
+    # (endpoint, params, payload, expected rule, expected TTL)
+    CASES = [
+        # Live
+        ("fixtures", {"league": 113, "live": "all"}, _fixtures("1H"), "live-fixtures", 15),
+        ("fixtures", {"league": 113, "live": "all"}, _fixtures(), "live-fixtures", 15),
+        ("fixtures", {"id": 1}, _fixtures("HT"), "in-play-fixtures", 30),
+        ("fixtures", {"ids": "1-2"}, _fixtures("FT", "2H"), "in-play-fixtures", 30),
+        ("fixtures/lineups", {"fixture": 1}, _fixtures("ET"), "in-play-fixtures", 30),
+        # Scheduled
+        ("fixtures", {"id": 1}, _fixtures("NS"), "fixtures", 15 * MINUTE),
+        ("fixtures", {"id": 1}, _fixtures("PST"), "fixtures", 15 * MINUTE),
+        ("fixtures", {"ids": "1-2"}, _fixtures("FT", "NS"), "fixtures", 15 * MINUTE),
+        ("fixtures", {"league": 113, "season": 2025}, _fixtures("FT", "NS"), "fixtures", 15 * MINUTE),
+        ("fixtures", {"id": 1}, _fixtures(), "fixtures", 15 * MINUTE),
+        # Finished: played to a result
+        ("fixtures", {"id": 1}, _fixtures("FT"), "finished-fixture", IMMUTABLE),
+        ("fixtures", {"id": 1}, _fixtures("PEN"), "finished-fixture", IMMUTABLE),
+        ("fixtures", {"ids": "1-2-3"}, _fixtures("FT", "AET", "PEN"), "finished-fixtures-batch", IMMUTABLE),
+        # Finished without a played result
+        ("fixtures", {"id": 1}, _fixtures("CANC"), "settled-fixture", HOUR),
+        ("fixtures", {"id": 1}, _fixtures("ABD"), "settled-fixture", HOUR),
+        ("fixtures", {"ids": "1-2"}, _fixtures("FT", "AWD"), "settled-fixtures-batch", HOUR),
+        ("fixtures", {"ids": "1-2"}, _fixtures("WO", "PEN"), "settled-fixtures-batch", HOUR),
+        # Past seasons
+        ("standings", {"league": 113, "season": 2024}, None, "past-season", IMMUTABLE),
+        ("fixtures", {"league": 113, "season": 2024}, _fixtures("CANC"), "past-season", IMMUTABLE),
+        ("players/topscorers", {"league": 113, "season": 2024}, None, "past-season", IMMUTABLE),
+        ("standings", {"league": 113, "season": 2025}, None, "standings", 15 * MINUTE),
+        ("standings", {"league": 113, "season": 2026}, None, "standings", 15 * MINUTE),
+        # Reference data and the rest
+        ("/players/squads", {"team": 1}, None, "squads", DAY),
+        ("league/leaderboards", {"league": 113, "season": 2025}, None, "league-leaderboards", HOUR),
+        ("players/topscorers", {"league": 113, "season": 2025}, None, "default", 30 * MINUTE),
+    ]
+
+    def test_ttl_for_responses(self):
+        for endpoint, params, data, rule, ttl in self.CASES:
+            with self.subTest(endpoint=endpoint, params=params, data=data):
+                decision = default_ttl_policy.resolve(endpoint, params, data, self.CONTEXT)
+                self.assertEqual((decision.rule, decision.ttl), (rule, ttl))
+
+    def test_past_season_needs_the_current_season(self):
+        decision = default_ttl_policy.resolve("standings", {"league": 113, "season": 2024})
+        self.assertEqual(decision.rule, "standings")
+
+    def test_rule_matching(self):
+        rule = TTLRule(
+            "finished", IMMUTABLE, endpoints=["fixtures"], params={"id": PRESENT, "league": 113},
+            predicate=all_fixtures_completed,
+        )
+        # (endpoint, normalized params, payload, matches)
+        cases = [
+            ("fixtures", {"id": "1", "league": "113"}, _fixtures("FT"), True),
+            ("fixtures", {"id": "1", "league": "113", "season": "2025"}, _fixtures("AET"), True),
+            ("fixtures", {"id": "1", "league": "113"}, _fixtures("ABD"), False),
+            ("fixtures", {"id": "1", "league": "113"}, _fixtures("FT", "NS"), False),
+            ("fixtures", {"id": "1", "league": "113"}, None, False),
+            ("fixtures", {"id": "1", "league": "114"}, _fixtures("FT"), False),
+            ("fixtures", {"league": "113"}, _fixtures("FT"), False),
+            ("fixtures/lineups", {"id": "1", "league": "113"}, _fixtures("FT"), False),
+        ]
+        for endpoint, params, data, matches in cases:
+            with self.subTest(endpoint=endpoint, params=params, data=data):
+                self.assertIs(rule.matches(endpoint, params, data, {}), matches)
+
+    def test_rule_without_conditions_matches_everything(self):
+        rule = TTLRule("catch-all", HOUR)
+        self.assertTrue(rule.matches("standings", {}, None, {}))
+        self.assertTrue(rule.matches("fixtures", {"id": "1"}, _fixtures("NS"), {}))
+
+    def test_explain_reports_every_matching_rule(self):
+        explained = dict(default_ttl_policy.explain("fixtures", {"id": 1}, _fixtures("CANC"), self.CONTEXT))
+        self.assertFalse(explained["finished-fixture"])
+        self.assertTrue(explained["settled-fixture"])
+        self.assertTrue(explained["fixtures"])
+
+
+class EmptyResponseCacheTests(SimpleTestCase):
+    """Empty results are cached no longer than the policy keeps the same request"""
+
+    def _store_empty(self, endpoint, params):
+        stored = []
+        api_football_service._handle_response(
+            endpoint, params, 200, "OK", lambda: {"errors": [], "results": 0, "response": []},
+            lambda entry, timeout: stored.append((entry, timeout)),
+        )
+        (entry, timeout), = stored
+        return entry, timeout
+
+    def test_empty_live_fixtures_expire_within_the_live_ttl(self):
+        started = time.time()
+        entry, timeout = self._store_empty("fixtures", {"league": 113, "live": "all"})
+        live_ttl = default_ttl_policy.resolve("fixtures", {"league": 113, "live": "all"}).ttl
+
+        self.assertEqual(timeout, live_ttl)
+        self.assertLessEqual(entry["hard_expires"], time.time() + live_ttl)
+        self.assertGreaterEqual(entry["soft_expires"], started)
+
+    def test_other_empty_results_use_the_negative_ttl(self):
+        _, timeout = self._store_empty("coachs", {"team": 1})
+        self.assertEqual(timeout, api_football_service.negative_ttl)
+
+
+class StandInTestCase(SimpleTestCase):
+    """Points the API client at a stand-in server and starts every test with empty caches"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StandInServer().start()
+        cls.addClassCleanup(cls.server.stop)
+        cls.enterClassContext(patch.object(api_football_service, "base_url", cls.server.url))
+        # Read the API through the stand-in, not the synced tables
+        cls.enterClassContext(patch.object(api_football_service, "local_store", None))
+
+    def setUp(self):
+        self._reset()
+        self.addCleanup(self._reset)
+
+    def _wait_for_refreshes(self):
+        """Wait for the background refreshes and builds scheduled so far."""
+        deadline = time.monotonic() + 30
+        while api_football_service._refreshing and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _reset(self):
+        """Forget everything the client cached, in the shared cache and in process."""
+        self._wait_for_refreshes()
+        cache.clear()
+        if api_football_service.local_tier is not None:
+            api_football_service.local_tier.clear()
+        api_football_service.leaderboard_memo.clear()
+        api_football_service.player_slug_memo.clear()
+        api_football_service.player_index_memo.clear()
+
+
+class LeagueRosterLoadTests(StandInTestCase):
+    """A roster missing a squad is cached briefly, so the next build can complete it"""
+
+    def test_failed_squad_marks_the_roster_incomplete(self):
+        teams = api_football_service.get_teams()
+        failing_team = teams[0]["team"]["id"]
+        make_request = api_football_service._make_request
+
+        def failing_squad(endpoint, params=None, *args, **kwargs):
+            if endpoint == "players/squads" and params.get("team") == failing_team:
+                raise APIFootballError("Request failed: 500 Internal Server Error")
+            return make_request(endpoint, params, *args, **kwargs)
+
+        with patch.object(api_football_service, "_make_request", side_effect=failing_squad):
+            roster = api_football_service.get_league_roster()
+
+        self.assertFalse(roster["complete"])
+        self.assertTrue(roster["players"])
+        params = {"league": api_football_service.league_id, "season": roster["season"], "format": ROSTER_FORMAT}
+        entry = cache.get(make_cache_key("league/roster", params))
+        self.assertAlmostEqual(entry["soft_expires"] - roster["built_at"], api_football_service.error_ttl, delta=1)
+
+
+class TeamDetailSectionTests(StandInTestCase):
+    """A team page section that cannot be loaded is flagged on its tab"""
+
+    def test_failed_section_shows_a_notice_on_its_tab(self):
+        with patch.object(api_football_service, "get_team_squad", side_effect=APIFootballError("Request failed")):
+            response = Client(HTTP_HOST="localhost").get(reverse("team-detail", args=["malmo-ff"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["unavailable_tabs"], {"players": True})
+        self.assertContains(response, 'role="status"', count=1)
+
+    def test_complete_page_shows_no_notice(self):
+        response = Client(HTTP_HOST="localhost").get(reverse("team-detail", args=["malmo-ff"]))
+
+        self.assertEqual(response.context["unavailable_tabs"], {})
+        self.assertNotContains(response, 'role="status"')
+
+
+class FootballPageBudgetTests(StandInTestCase):
+    """Every football page stays within the upstream budget against the stand-in server"""
+
+    # Default of API_FOOTBALL_REQUEST_BUDGET (see UpstreamTelemetryMiddleware)
+    REQUEST_BUDGET = 20
+
+    PAGES = [
+        "home",
+        "teams",
+        "fixtures",
+        "table",
+        "standings",
+        "players",
+        "top-scorers",
+        "assists",
+        "clean-sheets",
+        "live",
+        "api-live-data",
+        "api-standings",
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client(HTTP_HOST="localhost")
+
+    def _render(self, path, max_calls, query=None):
+        with upstream_budget(max_calls) as requests:
+            response = self.client.get(path, query)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([scope.path for scope in requests], [path])
+        return response
+
+    def _assert_within_budget(self, path):
+        """A cold render stays within the request budget and repeat renders call nothing."""
+        response = self._render(path, self.REQUEST_BUDGET)
+        self._render(path, 0)
+        # Aggregates built in the background since are read from the cache too
+        self._wait_for_refreshes()
+        self._render(path, 0)
+        return response
+
+    def test_pages(self):
+        for name in self.PAGES:
+            with self.subTest(page=name):
+                self._reset()
+                self._assert_within_budget(reverse(name))
+
+    def test_team_detail(self):
+        self._assert_within_budget(reverse("team-detail", args=["malmo-ff"]))
+
+    def test_player_detail(self):
+        response = self._render(reverse("players"), self.REQUEST_BUDGET)
+        slug = response.context["players"][0]["slug"]
+
+        self._assert_within_budget(reverse("player-detail", args=[slug]))
+        # Unknown slugs are answered from the slug index as well
+        self._render(reverse("player-detail", args=["no-such-player"]), 0)
+        self._render(reverse("player-detail", args=["no-such-player"]), 0)
+
+    def test_players_pages_fit_the_default_cache(self):
+        # The test cache is LocMem with its default 300 entries, as in development
+        self._render(reverse("players"), self.REQUEST_BUDGET)
+        for page in range(2, 5):
+            self._render(reverse("players"), 0, {"page": page, "sort": "name"})
@@ -1,14 +1,22 @@
 import logging
 import json
 import os
+import hmac
+from decouple import config
 from django.shortcuts import redirect
 from django.views.generic import TemplateView, View
 from django.contrib import messages
 from django.utils.translation import gettext as _
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
 from django.conf import settings
+from django.core.paginator import Paginator
 from django.core.mail import send_mail
 from .services.api_football import api_football_service, APIFootballError
+from .services.api_football_async import async_api_football_service
+from .services.fanout import FanOut
+from .services.player_index import DEFAULT_SORT, FACETS, SORTS, PlayerIndex, player_rows
+from .services.telemetry import render_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -37,15 +45,9 @@ class HomeView(TemplateView):
                 logger.warning(f"Could not load top assists: {e}")
                 context["top_assists"] = []
 
-            # Get goalkeeper clean sheets data (from top scorers but filter goalkeepers)
+            # Goalkeepers by clean sheets, from the precomputed leaderboards once they are built
             try:
-                all_players = api_football_service.get_top_scorers(limit=50)
-                clean_sheets_data = []
-                for player in all_players:
-                    position = player.get('statistics', [{}])[0].get('games', {}).get('position', '')
-                    if position and 'keeper' in position.lower():
-                        clean_sheets_data.append(player)
-                context["clean_sheets"] = clean_sheets_data[:5]
+                context["clean_sheets"] = api_football_service.get_leaderboard("clean_sheets", limit=5, wait=False)
             except Exception as e:
                 logger.warning(f"Could not load clean sheets data: {e}")
                 context["clean_sheets"] = []
@@ -487,7 +489,7 @@ class StandingsView(TemplateView):
                 context["top_assists"] = []
 
             try:
-                context["clean_sheets"] = api_football_service.get_clean_sheets(limit=5)
+                context["clean_sheets"] = api_football_service.get_leaderboard("clean_sheets", limit=5, wait=False)
             except Exception as e:
                 logger.warning(f"Could not load clean sheets: {e}")
                 context["clean_sheets"] = []
@@ -692,143 +694,95 @@ class TableView(StandingsView):
 
 
 class PlayersView(TemplateView):
-    """Allsvenskan players with position filtering"""
+    """Allsvenskan players with position, team and nationality filtering"""
 
     template_name = "pages/players.html"
+    paginate_by = 30
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["page_title"] = "ALLSVENSKAN Insikter - Players"
 
         # Get filters from request
-        position_filter = self.request.GET.get('position', '')
-        team_filter = self.request.GET.get('team', '')
-        context["selected_position"] = position_filter
-        context["selected_team"] = team_filter
+        filters = {facet: self.request.GET.get(facet, '') for facet in FACETS}
+        sort = self.request.GET.get('sort', DEFAULT_SORT)
+        if sort not in SORTS:
+            sort = DEFAULT_SORT
+        context["selected_sort"] = sort
+        context["sort_options"] = [
+            ("goals", _("Goals")),
+            ("assists", _("Assists")),
+            ("age", _("Age")),
+            ("name", _("Name")),
+        ]
 
         try:
-            # Get all players from all teams in the league
-            all_players = api_football_service.get_all_league_players()
-
-            # Also get top scorers and assists data to enhance player stats
-            try:
-                top_scorers = api_football_service.get_top_scorers(limit=50)
-                top_assists = api_football_service.get_top_assists(limit=50)
-
-                # Create lookup dictionaries for stats
-                scorer_stats = {p.get('player', {}).get('id'): p for p in top_scorers}
-                assist_stats = {p.get('player', {}).get('id'): p for p in top_assists}
-
-                # Enhance player stats with top scorer/assist data
-                for player in all_players:
-                    player_id = player.get('player', {}).get('id')
-                    if player_id:
-                        # Update with scorer stats if available
-                        if player_id in scorer_stats:
-                            scorer_data = scorer_stats[player_id]
-                            if scorer_data.get('statistics'):
-                                player['statistics'] = scorer_data['statistics']
+            # Faceted index over the roster, with every player's league totals
+            index = api_football_service.get_player_index()
 
-                        # Update with assist stats if available
-                        elif player_id in assist_stats:
-                            assist_data = assist_stats[player_id]
-                            if assist_data.get('statistics'):
-                                player['statistics'] = assist_data['statistics']
-
-                logger.info(f"Enhanced {len(all_players)} players with top scorer/assist data")
-
-            except Exception as e:
-                logger.warning(f"Could not enhance player data with top stats: {e}")
-
-            if not all_players:
+            if not len(index):
                 # Fallback: try to get some data from top scorers/assists only
-                logger.warning("No players from get_all_league_players, trying fallback methods")
-                top_scorers = api_football_service.get_top_scorers(limit=50)
-                top_assists = api_football_service.get_top_assists(limit=50)
-
-                # Combine and deduplicate players
-                all_players_dict = {}
-
-                # Add top scorers
-                for player in top_scorers:
+                logger.warning("No players in the league roster, trying fallback methods")
+                fallback = {}
+                for player in api_football_service.get_top_scorers(limit=50) + api_football_service.get_top_assists(limit=50):
                     player_id = player.get('player', {}).get('id')
                     if player_id:
-                        all_players_dict[player_id] = player
-
-                # Add top assists (merge if already exists)
-                for player in top_assists:
-                    player_id = player.get('player', {}).get('id')
-                    if player_id:
-                        if player_id in all_players_dict:
-                            # Merge assist data
-                            existing = all_players_dict[player_id]
-                            existing.setdefault('assists', player.get('statistics', [{}])[0].get('goals', {}).get('assists', 0))
-                        else:
-                            all_players_dict[player_id] = player
-
-                all_players = list(all_players_dict.values())
-
-            # Apply filters
-            filtered_players = all_players
-
-            # Filter by position if specified
-            if position_filter:
-                temp_filtered = []
-                for player in filtered_players:
-                    player_position = player.get('statistics', [{}])[0].get('games', {}).get('position', '')
-                    if player_position and position_filter.lower() in player_position.lower():
-                        temp_filtered.append(player)
-                filtered_players = temp_filtered
-
-            # Filter by team if specified
-            if team_filter:
-                temp_filtered = []
-                for player in filtered_players:
-                    team_name = player.get('statistics', [{}])[0].get('team', {}).get('name', '')
-                    if team_name and team_filter.lower() in team_name.lower():
-                        temp_filtered.append(player)
-                filtered_players = temp_filtered
-
-            context["players"] = filtered_players
-
-            # Get unique positions for filter options
-            positions = set()
-            teams = set()
-            for player in all_players:
-                stats = player.get('statistics', [{}])[0] if player.get('statistics') else {}
-
-                position = stats.get('games', {}).get('position', '')
-                if position:
-                    positions.add(position)
-
-                team_name = stats.get('team', {}).get('name', '')
-                if team_name:
-                    teams.add(team_name)
-
-            context["available_positions"] = sorted(list(positions))
-            context["available_teams"] = sorted(list(teams))
+                        fallback.setdefault(player_id, player)
+                index = PlayerIndex(player_rows({'players': list(fallback.values())}))
+
+            # Filter values as the index spells them, so links and highlights match
+            filters = {facet: index.resolve(facet, value) or value for facet, value in filters.items()}
+            results = index.query(filters, sort)
+            paginator = Paginator(results, self.paginate_by)
+            page_obj = paginator.get_page(self.request.GET.get('page'))
+
+            context["players"] = page_obj.object_list
+            context["page_obj"] = page_obj
+            context["paginator"] = paginator
+            context["is_paginated"] = page_obj.has_other_pages()
+            context["players_found"] = paginator.count
+            context["league_players"] = len(index)
+            context["top_scorer"] = index.query(filters, "goals")[:1]
+
+            # Counts per facet value under the other facets' filters; the selected value always shows
+            for facet in FACETS:
+                context[f"{facet}_facets"] = [
+                    {"value": value, "count": count}
+                    for value, count in index.facet_counts(facet, filters)
+                    if count or value == filters[facet]
+                ]
+            context["team_count"] = len(index.values['team'])
 
             context["players_available"] = True
-            logger.info(f"Successfully loaded {len(context['players'])} players (filter: {position_filter or 'all'})")
+            logger.info(
+                f"Loaded page {page_obj.number} of {paginator.count} players "
+                f"(filters: {', '.join(value for value in filters.values() if value) or 'none'}, sort: {sort})"
+            )
 
         except APIFootballError as e:
             logger.error(f"Failed to load player data: {e}")
             messages.error(self.request, _("Unable to load player statistics. Please try again later."))
-            context["players"] = []
-            context["players_available"] = False
-            context["available_positions"] = []
-            context["available_teams"] = []
+            self._empty_context(context)
 
         except Exception as e:
             logger.error(f"Unexpected error loading players: {e}")
             messages.error(self.request, _("An unexpected error occurred loading player data."))
-            context["players"] = []
-            context["players_available"] = False
-            context["available_positions"] = []
-            context["available_teams"] = []
+            self._empty_context(context)
 
+        context["selected_position"] = filters['position']
+        context["selected_team"] = filters['team']
+        context["selected_nationality"] = filters['nationality']
         return context
 
+    @staticmethod
+    def _empty_context(context):
+        context["players"] = []
+        context["players_available"] = False
+        context["players_found"] = 0
+        context["is_paginated"] = False
+        for facet in FACETS:
+            context[f"{facet}_facets"] = []
+
 
 class TopScorersView(TemplateView):
     """Dedicated top scorers page"""
@@ -840,8 +794,11 @@ class TopScorersView(TemplateView):
         context["page_title"] = "ALLSVENSKAN Insikter - Top Scorers"
 
         try:
-            # Get top scorers
-            top_scorers = api_football_service.get_top_scorers(limit=30)
+            # The topscorers endpoint stops at 20; the leaderboard ranks every player once it is built
+            top_scorers = (
+                api_football_service.get_leaderboard("goals", limit=30, wait=False)
+                or api_football_service.get_top_scorers(limit=20)
+            )
             context["top_scorers"] = top_scorers
             context["players_available"] = True
             logger.info(f"Successfully loaded {len(top_scorers)} top scorers")
@@ -871,20 +828,13 @@ class AssistsLeadersView(TemplateView):
         context["page_title"] = "ALLSVENSKAN Insikter - Assists Leaders"
 
         try:
-            # Get players and sort by assists
-            all_players = api_football_service.get_top_scorers(limit=50)
+            # Every player with an assist, already ranked; the topassists endpoint until the leaderboards are built
+            assists_leaders = (
+                api_football_service.get_leaderboard("assists", limit=25, wait=False)
+                or api_football_service.get_top_assists(limit=20)
+            )
 
-            # Sort by assists (highest first)
-            assists_leaders = []
-            for player in all_players:
-                assists = player.get('statistics', [{}])[0].get('goals', {}).get('assists', 0)
-                if assists and assists > 0:
-                    assists_leaders.append(player)
-
-            # Sort by assists count
-            assists_leaders.sort(key=lambda x: x.get('statistics', [{}])[0].get('goals', {}).get('assists', 0), reverse=True)
-
-            context["assists_leaders"] = assists_leaders[:25]
+            context["assists_leaders"] = assists_leaders
             context["players_available"] = True
             logger.info(f"Successfully loaded {len(assists_leaders)} assists leaders")
 
@@ -913,15 +863,8 @@ class CleanSheetsView(TemplateView):
         context["page_title"] = "ALLSVENSKAN Insikter - Clean Sheets"
 
         try:
-            # Get players and filter goalkeepers
-            all_players = api_football_service.get_top_scorers(limit=50)
-
-            # Filter goalkeepers and sort by clean sheets or saves
-            goalkeepers = []
-            for player in all_players:
-                position = player.get('statistics', [{}])[0].get('games', {}).get('position', '')
-                if position and 'keeper' in position.lower():
-                    goalkeepers.append(player)
+            # Goalkeepers ranked by clean sheets; empty until the leaderboards are built
+            goalkeepers = api_football_service.get_leaderboard("clean_sheets", limit=25, wait=False)
 
             context["goalkeepers"] = goalkeepers
             context["players_available"] = True
@@ -942,6 +885,20 @@ class CleanSheetsView(TemplateView):
         return context
 
 
+# Tab of the team page that shows each fanned-out section
+TEAM_SECTION_TABS = {
+    "venue_details": "venue",
+    "team_stats": "overview",
+    "team_formations": "overview",
+    "standings": "overview",
+    "recent_fixtures": "fixtures",
+    "upcoming_fixtures": "fixtures",
+    "all_fixtures": "fixtures",
+    "team_squad": "players",
+    "team_coaches": "overview",
+}
+
+
 class TeamDetailView(TemplateView):
     """Team profile page with detailed statistics"""
 
@@ -977,52 +934,43 @@ class TeamDetailView(TemplateView):
             context["team"] = team_data.get('team')
             context["venue"] = team_data.get('venue')
 
-            # Get detailed venue information if venue ID is available
+            # Everything below only depends on the team; fetch it concurrently
+            # under one page deadline so a slow section can't stall the page
             venue_basic = team_data.get('venue', {})
+            fanout = FanOut()
             if venue_basic and venue_basic.get('id'):
-                try:
-                    venue_details = api_football_service.get_venue_details(venue_basic.get('id'))
-                    if venue_details:
-                        # Merge basic venue info with detailed info
-                        context["venue_details"] = venue_details
-                    else:
-                        context["venue_details"] = venue_basic
-                except Exception as e:
-                    logger.warning(f"Failed to get detailed venue info: {e}")
-                    context["venue_details"] = venue_basic
-            else:
-                context["venue_details"] = venue_basic
+                fanout.add('venue_details', api_football_service.get_venue_details, venue_basic.get('id'), default={})
+            fanout.add('team_stats', api_football_service.get_team_statistics, team_id, default={})
+            fanout.add('team_formations', api_football_service.get_team_lineups, team_id, default=[])
+            fanout.add('standings', api_football_service.get_standings, default=[])
+            fanout.add('recent_fixtures', api_football_service.get_fixtures, team_id=team_id, last=5, default=[])
+            fanout.add('upcoming_fixtures', api_football_service.get_fixtures, team_id=team_id, next=5, default=[])
+            fanout.add('all_fixtures', api_football_service.get_fixtures, team_id=team_id, default=[])
+            fanout.add('team_squad', api_football_service.get_team_squad, team_id, default=[])
+            fanout.add('team_coaches', api_football_service.get_team_coaches, team_id, default=[])
+            sections = fanout.run()
+            # Tabs showing a section that failed or missed the deadline get a notice
+            context["unavailable_tabs"] = {
+                TEAM_SECTION_TABS[name]: True for name in set(sections.errors) | set(sections.timed_out)
+            }
 
-            # Get team statistics
-            team_stats = api_football_service.get_team_statistics(team_id)
-            context["team_stats"] = team_stats
+            # Use detailed venue information when available, basic info otherwise
+            context["venue_details"] = sections.get('venue_details') or venue_basic
 
-            # Get team formations
-            team_formations = api_football_service.get_team_lineups(team_id)
-            context["team_formations"] = team_formations
+            context["team_stats"] = sections['team_stats']
+            context["team_formations"] = sections['team_formations']
 
             # Get team's standings position
-            standings = api_football_service.get_standings()
-            for position, standing in enumerate(standings, 1):
+            for position, standing in enumerate(sections['standings'], 1):
                 if standing.get('team', {}).get('id') == team_id:
                     context["team_standing"] = standing
                     context["league_position"] = position
                     break
 
-            # Get team's recent fixtures
-            recent_fixtures = api_football_service.get_fixtures(team_id=team_id, last=5)
-            context["recent_fixtures"] = recent_fixtures
-
-            # Get team's upcoming fixtures
-            upcoming_fixtures = api_football_service.get_fixtures(team_id=team_id, next=5)
-            context["upcoming_fixtures"] = upcoming_fixtures
-
-            # Get all fixtures for the team (for fixtures tab)
-            all_fixtures = api_football_service.get_fixtures(team_id=team_id)
-            context["all_fixtures"] = all_fixtures
-
-            # Get team squad (all players) using the correct endpoint
-            team_squad = api_football_service.get_team_squad(team_id)
+            context["recent_fixtures"] = sections['recent_fixtures']
+            context["upcoming_fixtures"] = sections['upcoming_fixtures']
+            context["all_fixtures"] = sections['all_fixtures']
+            team_squad = sections['team_squad']
 
             # Process squad data - use squad info directly as it contains position info
             team_players = []
@@ -1062,7 +1010,7 @@ class TeamDetailView(TemplateView):
 
             # Get team coaching staff
             try:
-                team_coaches = api_football_service.get_team_coaches(team_id)
+                team_coaches = sections['team_coaches']
                 context["team_coaches"] = team_coaches
 
                 # Get head coach (usually the first one or specifically marked)
@@ -1107,14 +1055,33 @@ class TeamDetailView(TemplateView):
         return context
 
 
+def _not_modified(request, etag):
+    """Return a 304 response when the client already has the version tagged ``etag``, else None."""
+    if etag is None:
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response["ETag"] = etag
+    return response
+
+
 # AJAX API Endpoints for live data updates
 class LiveDataAPIView(View):
     """AJAX endpoint for live match data updates"""
 
+    # Part of the ETag: bump when the JSON built below changes shape
+    response_format = 1
+
     def get(self, request, *args, **kwargs):
         """Return live match data as JSON for AJAX updates"""
         try:
-            live_matches = api_football_service.get_live_fixtures()
+            # Polls get a 304 until the upstream content actually changes
+            with api_football_service.tracking_versions() as versions:
+                live_matches = api_football_service.get_live_fixtures()
+            etag = versions.etag(self.response_format)
+            not_modified = _not_modified(request, etag)
+            if not_modified is not None:
+                return not_modified
 
             # Format data for frontend consumption
             formatted_matches = []
@@ -1131,11 +1098,14 @@ class LiveDataAPIView(View):
                 }
                 formatted_matches.append(formatted_match)
 
-            return JsonResponse({
+            response = JsonResponse({
                 'success': True,
                 'matches': formatted_matches,
                 'count': len(formatted_matches)
             })
+            if etag:
+                response["ETag"] = etag
+            return response
 
         except APIFootballError as e:
             logger.error(f"API error in live data endpoint: {e}")
@@ -1152,6 +1122,30 @@ class LiveDataAPIView(View):
             }, status=500)
 
 
+class MetricsView(View):
+    """Prometheus scrape endpoint for the API-Football client's telemetry"""
+
+    # Scrapers send "Authorization: Bearer <token>"; without a token the
+    # endpoint only exists in DEBUG
+    token = config("API_FOOTBALL_METRICS_TOKEN", default="")
+
+    def get(self, request, *args, **kwargs):
+        if self.token:
+            authorization = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(authorization.encode(), f"Bearer {self.token}".encode()):
+                return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+        elif not settings.DEBUG:
+            raise Http404
+
+        body = render_metrics([
+            ("sync", api_football_service),
+            ("async", async_api_football_service),
+        ])
+        response = HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
+        response["Cache-Control"] = "no-store"
+        return response
+
+
 class PlayerDetailView(TemplateView):
     """Individual player profile page with detailed statistics"""
 
@@ -1169,23 +1163,16 @@ class PlayerDetailView(TemplateView):
                 context["player"] = None
                 return context
 
-            # Get all players from all teams in the league (same as PlayersView)
-            all_players = api_football_service.get_all_league_players()
-
-            # Find the matching player from the list by comparing slugified names
-            matching_player = None
-            from django.utils.text import slugify
-
-            for player in all_players:
-                player_name = player.get('player', {}).get('name', '')
-                if slugify(player_name) == player_slug:
-                    matching_player = player
-                    break
+            # One read from the slug index written with the league roster
+            record = api_football_service.get_player_by_slug(player_slug)
+            matching_player = record["player"] if record else None
 
             if matching_player:
                 # This maintains the expected structure: player.player.name, player.statistics.0.goals.total, etc.
                 context["player"] = matching_player
                 context["player_available"] = True
+                # Other players with the same name, linked by their unique slugs
+                context["same_name_players"] = record["same_name"]
 
                 # Update page title with player name
                 player_name_title = matching_player.get('player', {}).get('name', '')
@@ -1196,7 +1183,7 @@ class PlayerDetailView(TemplateView):
 
             else:
                 context["player"] = None
-                logger.warning(f"Player not found for slug: {player_slug}. Searched through {len(all_players)} players.")
+                logger.warning(f"Player not found for slug: {player_slug}")
 
         except APIFootballError as e:
             logger.error(f"Failed to load player data: {e}")
@@ -1214,10 +1201,18 @@ class PlayerDetailView(TemplateView):
 class StandingsAPIView(View):
     """AJAX endpoint for standings data updates"""
 
+    # Part of the ETag: bump when the JSON built below changes shape
+    response_format = 1
+
     def get(self, request, *args, **kwargs):
         """Return standings data as JSON for AJAX updates"""
         try:
-            standings = api_football_service.get_standings()
+            with api_football_service.tracking_versions() as versions:
+                standings = api_football_service.get_standings()
+            etag = versions.etag(self.response_format)
+            not_modified = _not_modified(request, etag)
+            if not_modified is not None:
+                return not_modified
 
             # Format data for frontend consumption
             formatted_standings = []
@@ -1238,11 +1233,14 @@ class StandingsAPIView(View):
                 }
                 formatted_standings.append(formatted_team)
 
-            return JsonResponse({
+            response = JsonResponse({
                 'success': True,
                 'standings': formatted_standings,
                 'count': len(formatted_standings)
             })
+            if etag:
+                response["ETag"] = etag
+            return response
 
         except APIFootballError as e:
             logger.error(f"API error in standings endpoint: {e}")
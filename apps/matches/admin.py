@@ -1 +1,10 @@
-# Register your models here.
+from django.contrib import admin
+from .models import Fixture
+
+
+@admin.register(Fixture)
+class FixtureAdmin(admin.ModelAdmin):
+    list_display = ['date', 'home_team', 'away_team', 'home_goals', 'away_goals', 'status_short', 'round']
+    list_filter = ['league_id', 'season', 'status_short']
+    search_fields = ['home_team__name', 'away_team__name']
+    readonly_fields = ['raw', 'payload_hash', 'updated_at']
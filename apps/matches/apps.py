@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class MatchesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "matches"
+    name = "apps.matches"
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Fixture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('api_id', models.PositiveIntegerField(unique=True)),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('round', models.CharField(blank=True, max_length=60)),
+                ('date', models.DateTimeField(db_index=True)),
+                ('status_short', models.CharField(db_index=True, max_length=5)),
+                ('status_long', models.CharField(blank=True, max_length=50)),
+                ('elapsed', models.PositiveIntegerField(blank=True, null=True)),
+                ('venue_name', models.CharField(blank=True, max_length=150)),
+                ('home_goals', models.PositiveIntegerField(blank=True, null=True)),
+                ('away_goals', models.PositiveIntegerField(blank=True, null=True)),
+                ('raw', models.JSONField(blank=True, default=dict)),
+                ('payload_hash', models.CharField(blank=True, max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('away_team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='away_fixtures', to='teams.team')),
+                ('home_team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='home_fixtures', to='teams.team')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['league_id', 'season', 'date'], name='matches_fix_league__ac08be_idx'), models.Index(fields=['league_id', 'season', 'status_short'], name='matches_fix_league__d190aa_idx')],
+            },
+        ),
+    ]
@@ -1 +1,37 @@
-# Create your models here.
+from django.db import models
+
+from apps.teams.models import Team
+
+
+class Fixture(models.Model):
+    """A league fixture, synced from API-Football's fixtures endpoint"""
+    api_id = models.PositiveIntegerField(unique=True)
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+    round = models.CharField(max_length=60, blank=True)
+    date = models.DateTimeField(db_index=True)
+
+    status_short = models.CharField(max_length=5, db_index=True)
+    status_long = models.CharField(max_length=50, blank=True)
+    elapsed = models.PositiveIntegerField(null=True, blank=True)
+    venue_name = models.CharField(max_length=150, blank=True)
+
+    home_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='home_fixtures')
+    away_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='away_fixtures')
+    home_goals = models.PositiveIntegerField(null=True, blank=True)
+    away_goals = models.PositiveIntegerField(null=True, blank=True)
+
+    raw = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['league_id', 'season', 'date']),
+            models.Index(fields=['league_id', 'season', 'status_short']),
+        ]
+
+    def __str__(self):
+        return f"{self.home_team} - {self.away_team} ({self.date:%Y-%m-%d})"
@@ -1 +1,17 @@
-# Register your models here.
+from django.contrib import admin
+from .models import Player, PlayerSeason
+
+
+@admin.register(Player)
+class PlayerAdmin(admin.ModelAdmin):
+    list_display = ['name', 'api_id', 'nationality', 'age', 'updated_at']
+    search_fields = ['name', 'slug']
+    list_filter = ['nationality']
+
+
+@admin.register(PlayerSeason)
+class PlayerSeasonAdmin(admin.ModelAdmin):
+    list_display = ['player', 'team', 'season', 'position', 'appearances', 'goals', 'assists']
+    list_filter = ['league_id', 'season', 'position']
+    search_fields = ['player__name', 'team__name']
+    readonly_fields = ['squad_raw', 'stats_raw', 'squad_hash', 'stats_hash', 'updated_at']
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class PlayersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "players"
+    name = "apps.players"
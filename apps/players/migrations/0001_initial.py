@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Player',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('api_id', models.PositiveIntegerField(unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(blank=True, max_length=120)),
+                ('firstname', models.CharField(blank=True, max_length=100)),
+                ('lastname', models.CharField(blank=True, max_length=100)),
+                ('age', models.PositiveIntegerField(blank=True, null=True)),
+                ('nationality', models.CharField(blank=True, db_index=True, max_length=60)),
+                ('photo', models.URLField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayerSeason',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('position', models.CharField(blank=True, db_index=True, max_length=30)),
+                ('number', models.PositiveIntegerField(blank=True, null=True)),
+                ('appearances', models.PositiveIntegerField(default=0)),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('goals', models.PositiveIntegerField(default=0)),
+                ('assists', models.PositiveIntegerField(default=0)),
+                ('yellow_cards', models.PositiveIntegerField(default=0)),
+                ('red_cards', models.PositiveIntegerField(default=0)),
+                ('rating', models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True)),
+                ('squad_raw', models.JSONField(blank=True, null=True)),
+                ('stats_raw', models.JSONField(blank=True, null=True)),
+                ('squad_hash', models.CharField(blank=True, max_length=64)),
+                ('stats_hash', models.CharField(blank=True, max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='players.player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_seasons', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['league_id', 'season', '-goals'], name='players_pla_league__bd87c9_idx'), models.Index(fields=['league_id', 'season', '-assists'], name='players_pla_league__30f76c_idx'), models.Index(fields=['team', 'season'], name='players_pla_team_id_9e16bb_idx')],
+                'unique_together': {('player', 'team', 'league_id', 'season')},
+            },
+        ),
+    ]
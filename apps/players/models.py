@@ -1 +1,62 @@
-# Create your models here.
+from django.db import models
+
+from apps.teams.models import Team
+
+
+class Player(models.Model):
+    """A player, synced from API-Football's squads and players endpoints"""
+    api_id = models.PositiveIntegerField(unique=True)
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=120, blank=True, db_index=True)
+    firstname = models.CharField(max_length=100, blank=True)
+    lastname = models.CharField(max_length=100, blank=True)
+    age = models.PositiveIntegerField(null=True, blank=True)
+    nationality = models.CharField(max_length=60, blank=True, db_index=True)
+    photo = models.URLField(blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class PlayerSeason(models.Model):
+    """A player's squad membership and statistics for one team and season"""
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='seasons')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='player_seasons')
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+
+    position = models.CharField(max_length=30, blank=True, db_index=True)
+    number = models.PositiveIntegerField(null=True, blank=True)
+
+    # League statistics
+    appearances = models.PositiveIntegerField(default=0)
+    minutes = models.PositiveIntegerField(default=0)
+    goals = models.PositiveIntegerField(default=0)
+    assists = models.PositiveIntegerField(default=0)
+    yellow_cards = models.PositiveIntegerField(default=0)
+    red_cards = models.PositiveIntegerField(default=0)
+    rating = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+
+    # Upstream payloads in the shape the API returns them
+    squad_raw = models.JSONField(null=True, blank=True)
+    stats_raw = models.JSONField(null=True, blank=True)
+    squad_hash = models.CharField(max_length=64, blank=True)
+    stats_hash = models.CharField(max_length=64, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('player', 'team', 'league_id', 'season')
+        indexes = [
+            models.Index(fields=['league_id', 'season', '-goals']),
+            models.Index(fields=['league_id', 'season', '-assists']),
+            models.Index(fields=['team', 'season']),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - {self.team} ({self.season})"
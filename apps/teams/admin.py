@@ -1 +1,22 @@
-# Register your models here.
+from django.contrib import admin
+from .models import Standing, Team, TeamSeason
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ['name', 'api_id', 'code', 'venue_name', 'updated_at']
+    search_fields = ['name', 'code', 'venue_name']
+    readonly_fields = ['raw', 'payload_hash', 'updated_at']
+
+
+@admin.register(TeamSeason)
+class TeamSeasonAdmin(admin.ModelAdmin):
+    list_display = ['team', 'league_id', 'season']
+    list_filter = ['league_id', 'season']
+
+
+@admin.register(Standing)
+class StandingAdmin(admin.ModelAdmin):
+    list_display = ['rank', 'team', 'points', 'played', 'goals_diff', 'season', 'updated_at']
+    list_filter = ['league_id', 'season']
+    readonly_fields = ['raw', 'payload_hash', 'updated_at']
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class TeamsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "teams"
+    name = "apps.teams"
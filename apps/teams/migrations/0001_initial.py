@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('api_id', models.PositiveIntegerField(unique=True)),
+                ('name', models.CharField(db_index=True, max_length=100)),
+                ('code', models.CharField(blank=True, max_length=10)),
+                ('country', models.CharField(blank=True, max_length=60)),
+                ('founded', models.PositiveIntegerField(blank=True, null=True)),
+                ('logo', models.URLField(blank=True)),
+                ('venue_api_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('venue_name', models.CharField(blank=True, max_length=150)),
+                ('venue_city', models.CharField(blank=True, max_length=100)),
+                ('venue_capacity', models.PositiveIntegerField(blank=True, null=True)),
+                ('raw', models.JSONField(blank=True, default=dict)),
+                ('payload_hash', models.CharField(blank=True, max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('rank', models.PositiveIntegerField()),
+                ('points', models.IntegerField(default=0)),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('win', models.PositiveIntegerField(default=0)),
+                ('draw', models.PositiveIntegerField(default=0)),
+                ('lose', models.PositiveIntegerField(default=0)),
+                ('goals_for', models.PositiveIntegerField(default=0)),
+                ('goals_against', models.PositiveIntegerField(default=0)),
+                ('goals_diff', models.IntegerField(default=0)),
+                ('form', models.CharField(blank=True, max_length=10)),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('raw', models.JSONField(blank=True, default=dict)),
+                ('payload_hash', models.CharField(blank=True, max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='teams.team')),
+            ],
+            options={
+                'ordering': ['league_id', 'season', 'rank'],
+                'indexes': [models.Index(fields=['league_id', 'season', 'rank'], name='teams_stand_league__b6172b_idx')],
+                'unique_together': {('team', 'league_id', 'season')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamSeason',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('league_id', models.PositiveIntegerField()),
+                ('season', models.PositiveIntegerField()),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seasons', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['league_id', 'season'], name='teams_teams_league__abc4be_idx')],
+                'unique_together': {('team', 'league_id', 'season')},
+            },
+        ),
+    ]
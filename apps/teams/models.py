@@ -1 +1,75 @@
-# Create your models here.
+from django.db import models
+
+
+class Team(models.Model):
+    """A club, synced from API-Football's teams endpoint"""
+    api_id = models.PositiveIntegerField(unique=True)
+    name = models.CharField(max_length=100, db_index=True)
+    code = models.CharField(max_length=10, blank=True)
+    country = models.CharField(max_length=60, blank=True)
+    founded = models.PositiveIntegerField(null=True, blank=True)
+    logo = models.URLField(blank=True)
+
+    # Home venue
+    venue_api_id = models.PositiveIntegerField(null=True, blank=True)
+    venue_name = models.CharField(max_length=150, blank=True)
+    venue_city = models.CharField(max_length=100, blank=True)
+    venue_capacity = models.PositiveIntegerField(null=True, blank=True)
+
+    # Upstream payload in the shape the API returns it, and its digest for change detection
+    raw = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class TeamSeason(models.Model):
+    """A team's participation in a league season"""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='seasons')
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('team', 'league_id', 'season')
+        indexes = [models.Index(fields=['league_id', 'season'])]
+
+    def __str__(self):
+        return f"{self.team} ({self.season})"
+
+
+class Standing(models.Model):
+    """A team's row in a league table"""
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='standings')
+    league_id = models.PositiveIntegerField()
+    season = models.PositiveIntegerField()
+
+    rank = models.PositiveIntegerField()
+    points = models.IntegerField(default=0)
+    played = models.PositiveIntegerField(default=0)
+    win = models.PositiveIntegerField(default=0)
+    draw = models.PositiveIntegerField(default=0)
+    lose = models.PositiveIntegerField(default=0)
+    goals_for = models.PositiveIntegerField(default=0)
+    goals_against = models.PositiveIntegerField(default=0)
+    goals_diff = models.IntegerField(default=0)
+    form = models.CharField(max_length=10, blank=True)
+    description = models.CharField(max_length=200, blank=True)
+
+    raw = models.JSONField(default=dict, blank=True)
+    payload_hash = models.CharField(max_length=64, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['league_id', 'season', 'rank']
+        unique_together = ('team', 'league_id', 'season')
+        indexes = [models.Index(fields=['league_id', 'season', 'rank'])]
+
+    def __str__(self):
+        return f"{self.rank}. {self.team} ({self.season})"
@@ -2,11 +2,17 @@
 Security middleware for modern web standards
 """
 
+import logging
 import re
 
+from decouple import config
 from django.utils import translation
 from django.utils.cache import patch_cache_control
 
+from apps.core.services.telemetry import UNRESOLVED, current_page_scope, page_scope
+
+logger = logging.getLogger(__name__)
+
 
 class SecurityHeadersMiddleware:
     """Add security headers to responses"""
@@ -63,6 +69,36 @@ class LanguageFromURLMiddleware:
         return response
 
 
+class UpstreamTelemetryMiddleware:
+    """Attribute the API-Football calls made while handling a request to its page and account for them"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Upstream calls one request may make before it is logged as over budget (0 disables)
+        self.budget = config("API_FOOTBALL_REQUEST_BUDGET", default=20, cast=int)
+
+    def __call__(self, request):
+        with page_scope(path=request.path) as scope:
+            response = self.get_response(request)
+
+        if scope.counts.snapshot():
+            logger.debug(f"{request.path} ({scope.name}): {scope.summary()}")
+        if self.budget and scope.upstream_calls > self.budget:
+            logger.warning(
+                f"{request.path} ({scope.name}) went over its upstream budget of {self.budget}: "
+                f"{scope.summary()}; by endpoint {scope.upstream_by_endpoint()}"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        scope = current_page_scope()
+        match = request.resolver_match
+        if scope is not None and match is not None:
+            # URL names are few and fixed, unlike paths, so they make good labels
+            scope.name = match.view_name or UNRESOLVED
+        return None
+
+
 class CacheControlMiddleware:
     """Add cache control headers for static assets"""
 
@@ -41,6 +41,9 @@ LOCAL_APPS = [
     "apps.core",
     "apps.cart",
     "apps.shop",
+    "apps.teams",
+    "apps.players",
+    "apps.matches",
     # 'apps.users',
     # 'apps.theme',
 ]
@@ -62,6 +65,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.middleware.UpstreamTelemetryMiddleware",  # Upstream calls per page (/metrics)
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -9,10 +9,13 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import RedirectView
 
+from apps.core import views as core_views
+
 # Non-internationalized URLs
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("i18n/", include("django.conf.urls.i18n")),  # Language switching
+    path("metrics", core_views.MetricsView.as_view(), name="metrics"),  # Prometheus scrape
 ]
 
 # Internationalized URLs